@@ -0,0 +1,268 @@
+"""
+Process-wide in-memory cache of the Supabase destinations table.
+
+The catalog changes rarely (typically once a day), so the whole table is
+loaded once into an immutable snapshot with a spatial index and a category
+index, and trip planning queries it without touching the network. A daemon
+thread checks the table version (row count and latest updated_at) every
+CATALOG_CHECK_SECONDS and reloads when it changed or the snapshot is older
+than CATALOG_TTL_SECONDS. A reload builds a new snapshot on the side and
+swaps it in with a single reference assignment, so requests never wait on
+the database and never see a half-built catalog.
+"""
+import itertools
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from app.models.schemas import PlaceModel, PreferenceEnum
+from app.integrations.supabase_service import get_supabase_client, row_to_place
+from app.utils.logger import get_logger
+from app.utils.spatial_index import SpatialIndex
+
+logger = get_logger(__name__)
+
+CATALOG_TTL_SECONDS = int(os.getenv("CATALOG_TTL_SECONDS", 6 * 60 * 60))  # Reload at least this often
+CATALOG_CHECK_SECONDS = int(os.getenv("CATALOG_CHECK_SECONDS", 5 * 60))  # Version check interval
+CATALOG_PAGE_SIZE = 1000  # Rows per PostgREST page while loading
+
+# Only the columns row_to_place reads (see CREATE_DESTINATIONS_TABLE.sql)
+CATALOG_COLUMNS = (
+    "id,name,categories,latitude,longitude,rating,cost_per_day,"
+    "description,city,state,photos,opening_hours,updated_at"
+)
+
+
+class CatalogSnapshot:
+    """
+    Immutable copy of the destinations table, indexed for trip planning.
+    
+    Rows are converted to PlaceModels (opening hours parsed) once per load
+    and keep the order the database paged them in (order('id'), in the
+    database's collation), so a query returns the same places as the paged
+    Supabase query would. The spatial and (lowercased) category indexes
+    are built once per load and shared by every request until the next
+    snapshot replaces it.
+    """
+    
+    def __init__(self, rows: List[dict], version: Tuple):
+        """
+        Convert and index rows.
+        
+        Args:
+            rows: Destination rows (CATALOG_COLUMNS) in id order
+            version: Table version the rows were loaded at
+        """
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.places: List[PlaceModel] = []
+        
+        # Valid PreferenceEnum categories per place, in row order (see row_to_place)
+        self._categories: List[List[PreferenceEnum]] = []
+        self._index = SpatialIndex()
+        self._by_category: Dict[str, List[int]] = {}
+        for row in rows:
+            try:
+                place = row_to_place(row)
+            except Exception as e:
+                logger.warning(f"Error parsing destination {row.get('id')}: {str(e)}")
+                continue
+            position = len(self.places)
+            self.places.append(place)
+            
+            categories = row.get('categories') or []
+            if not isinstance(categories, list):
+                categories = [categories]
+            self._categories.append(_preference_categories(categories))
+            for category in {str(category).lower() for category in categories}:
+                self._by_category.setdefault(category, []).append(position)
+            try:
+                self._index.insert(float(row['latitude']), float(row['longitude']), position)
+            except (KeyError, TypeError, ValueError):
+                pass  # Never inside a radius, like rows without coordinates in the database
+    
+    def __len__(self) -> int:
+        return len(self.places)
+    
+    def query(
+        self,
+        preferences: Optional[List[str]],
+        limit: int,
+        center_lat: Optional[float],
+        center_lon: Optional[float],
+        radius_km: float
+    ) -> List[PlaceModel]:
+        """
+        Places within the radius whose categories overlap the preferences.
+        
+        Args:
+            preferences: Preference categories (None or empty for any)
+            limit: Maximum number of places
+            center_lat, center_lon: Search center (None for the whole catalog)
+            radius_km: Search radius in kilometers
+        
+        Returns:
+            Up to `limit` places in id order, with the primary category
+            row_to_place would pick for these preferences
+        """
+        positions = None
+        if center_lat is not None and center_lon is not None:
+            positions = {position for _, position in self._index.within_radius(center_lat, center_lon, radius_km)}
+        
+        wanted = {preference.lower() for preference in preferences or []}
+        if wanted:
+            matching = set()
+            for preference in wanted:
+                matching.update(self._by_category.get(preference, ()))
+            positions = matching if positions is None else positions & matching
+        
+        ordered = range(len(self.places)) if positions is None else sorted(positions)
+        places = []
+        for position in itertools.islice(ordered, limit):
+            place = self.places[position]
+            primary = next((c for c in self._categories[position] if c.value in wanted), place.category)
+            places.append(place if primary == place.category else place.copy(update={'category': primary}))
+        return places
+
+
+def _preference_categories(categories: List) -> List[PreferenceEnum]:
+    """Categories that are valid PreferenceEnum values, in order"""
+    valid = []
+    for category in categories:
+        try:
+            valid.append(PreferenceEnum(str(category).lower()))
+        except ValueError:
+            continue
+    return valid
+
+
+def _fetch_version(client) -> Tuple:
+    """(row count, latest updated_at) of the destinations table"""
+    response = client.table('destinations').select('updated_at', count='exact') \
+        .order('updated_at', desc=True).limit(1).execute()
+    latest = response.data[0].get('updated_at') if response.data else None
+    return getattr(response, 'count', None), latest
+
+
+def _fetch_all_rows(client) -> List[dict]:
+    """Every destinations row, paged by id"""
+    rows = []
+    while True:
+        response = client.table('destinations').select(CATALOG_COLUMNS).order('id') \
+            .range(len(rows), len(rows) + CATALOG_PAGE_SIZE - 1).execute()
+        page = response.data or []
+        rows.extend(page)
+        if len(page) < CATALOG_PAGE_SIZE:
+            return rows
+
+
+class DestinationCatalog:
+    """
+    Holds the current catalog snapshot and keeps it fresh in the background.
+    """
+    
+    def __init__(
+        self,
+        ttl_seconds: float = CATALOG_TTL_SECONDS,
+        check_seconds: float = CATALOG_CHECK_SECONDS
+    ):
+        """Create an empty catalog; call start() to load it."""
+        self.ttl_seconds = ttl_seconds
+        self.check_seconds = check_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._refresh_lock = threading.Lock()  # Serializes reloads; readers never take it
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        """Current snapshot, or None until the first load finished"""
+        return self._snapshot
+    
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the table if its version changed or the snapshot expired.
+        
+        Args:
+            force: Reload even if the snapshot is current
+        
+        Returns:
+            True if a new snapshot was swapped in
+        """
+        with self._refresh_lock:
+            client = get_supabase_client()
+            if not client:
+                return False
+            
+            current = self._snapshot
+            version = _fetch_version(client)
+            if (
+                not force and current is not None and version == current.version
+                and time.monotonic() - current.loaded_at < self.ttl_seconds
+            ):
+                return False
+            
+            started = time.perf_counter()
+            snapshot = CatalogSnapshot(_fetch_all_rows(client), version)
+            self._snapshot = snapshot
+            logger.info(
+                f"Loaded destination catalog: {len(snapshot)} rows, version {version} "
+                f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+            return True
+    
+    def start(self):
+        """Load the catalog and keep refreshing it on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="destination-catalog", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the background refresh."""
+        self._stop.set()
+    
+    def _run(self):
+        """Refresh loop of the background thread."""
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Destination catalog refresh failed: {str(e)}")
+            self._stop.wait(self.check_seconds)
+    
+    def fetch_places(
+        self,
+        preferences: Optional[List[str]] = None,
+        limit: int = 50,
+        center_lat: Optional[float] = None,
+        center_lon: Optional[float] = None,
+        radius_km: float = 500
+    ) -> Optional[List[PlaceModel]]:
+        """
+        Same result as fetch_destinations_from_supabase, from memory.
+        
+        If no nearby place matches the preferences, nearby places of any
+        category are returned instead.
+        
+        Returns:
+            List of PlaceModel instances, or None while no snapshot is loaded
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        
+        places = snapshot.query(preferences, limit, center_lat, center_lon, radius_km)
+        if not places and preferences:
+            places = snapshot.query(None, limit, center_lat, center_lon, radius_km)
+        logger.info(f"Catalog returned {len(places)} destinations (snapshot of {len(snapshot)} rows)")
+        return places
+
+
+_catalog = DestinationCatalog()
+
+
+def get_destination_catalog() -> DestinationCatalog:
+    """The process-wide destination catalog"""
+    return _catalog
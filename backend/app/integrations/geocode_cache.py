@@ -0,0 +1,180 @@
+"""
+Two-tier cache for geocoding results: an in-memory LRU in front of SQLite.
+
+Keys are normalized place names (case, whitespace and punctuation folded,
+known aliases such as "bengaluru" -> "bangalore" mapped to one spelling), so
+spelling variants share one entry. Found coordinates are kept for
+GEOCODE_TTL_SECONDS. "Not found" answers are cached too, for the shorter
+GEOCODE_NEGATIVE_TTL_SECONDS, so repeated bad input never reaches the
+rate-limited geocoder. The SQLite file keeps entries across restarts and
+shares them between worker processes.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+GEOCODE_CACHE_PATH = os.getenv(
+    "GEOCODE_CACHE_PATH",
+    os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "geocode_cache.sqlite3"))
+)
+GEOCODE_TTL_SECONDS = 30 * 24 * 60 * 60  # Found coordinates
+GEOCODE_NEGATIVE_TTL_SECONDS = 24 * 60 * 60  # "Not found" answers
+GEOCODE_MEMORY_SIZE = 2048  # Entries kept in memory
+
+# Alternate spellings mapped to one cache key (per comma-separated part)
+PLACE_ALIASES = {
+    'bengaluru': 'bangalore',
+    'bombay': 'mumbai',
+    'madras': 'chennai',
+    'calcutta': 'kolkata',
+    'cochin': 'kochi',
+    'trivandrum': 'thiruvananthapuram',
+    'calicut': 'kozhikode',
+    'pondicherry': 'puducherry',
+    'allahabad': 'prayagraj',
+    'mysuru': 'mysore',
+    'gurgaon': 'gurugram',
+    'benares': 'varanasi',
+    'banaras': 'varanasi',
+    'vizag': 'visakhapatnam',
+}
+
+NOT_CACHED = object()  # get() result when the cache has no live entry
+
+
+def normalize_place_name(name: str) -> str:
+    """
+    Cache key for a place name.
+    
+    Lowercases, drops punctuation other than commas, collapses whitespace
+    and maps known aliases, so " Bengaluru,  Karnataka." and
+    "bangalore, karnataka" share a key.
+    """
+    text = re.sub(r"[^\w\s,]", " ", name.lower())
+    parts = (" ".join(part.split()) for part in text.split(","))
+    return ", ".join(PLACE_ALIASES.get(part, part) for part in parts if part)
+
+
+class GeocodeCache:
+    """
+    Geocoding results by normalized place name, with TTLs.
+    
+    Values are (latitude, longitude) tuples, or None for a cached "not
+    found". Memory hits take a lock but no I/O; memory misses read one
+    SQLite row and promote it. SQLite and file system errors are logged
+    and treated as misses, so a broken cache file never fails a lookup.
+    """
+    
+    def __init__(
+        self,
+        path: str = GEOCODE_CACHE_PATH,
+        memory_size: int = GEOCODE_MEMORY_SIZE,
+        ttl_seconds: float = GEOCODE_TTL_SECONDS,
+        negative_ttl_seconds: float = GEOCODE_NEGATIVE_TTL_SECONDS
+    ):
+        """Create a cache backed by the SQLite file at `path` (opened on first use)."""
+        self.path = path
+        self.memory_size = memory_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[Optional[Tuple[float, float]], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()  # One SQLite connection per thread
+    
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's SQLite connection, creating the table on first use."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5)
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS geocode ("
+                    "key TEXT PRIMARY KEY, latitude REAL, longitude REAL, expires_at REAL NOT NULL)"
+                )
+                connection.execute("DELETE FROM geocode WHERE expires_at <= ?", (time.time(),))
+            self._local.connection = connection
+        return connection
+    
+    def _remember(self, key: str, coords: Optional[Tuple[float, float]], expires_at: float):
+        """Put an entry in the memory tier, evicting the least recently used."""
+        with self._lock:
+            self._memory[key] = (coords, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+    
+    def get(self, name: str):
+        """
+        Cached result for a place name.
+        
+        Returns:
+            (latitude, longitude), None for a cached "not found", or
+            NOT_CACHED when there is no live entry
+        """
+        key = normalize_place_name(name)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(key)
+                    return entry[0]
+                del self._memory[key]
+        
+        try:
+            row = self._connection().execute(
+                "SELECT latitude, longitude, expires_at FROM geocode WHERE key = ?", (key,)
+            ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Geocode cache read failed: {str(e)}")
+            return NOT_CACHED
+        if row is None or row[2] <= now:
+            return NOT_CACHED
+        
+        coords = None if row[0] is None else (row[0], row[1])
+        self._remember(key, coords, row[2])
+        return coords
+    
+    def put(self, name: str, coords: Optional[Tuple[float, float]]):
+        """
+        Cache a geocoding result.
+        
+        Args:
+            name: Place name as queried
+            coords: (latitude, longitude), or None if the place was not found
+        """
+        key = normalize_place_name(name)
+        expires_at = time.time() + (self.ttl_seconds if coords is not None else self.negative_ttl_seconds)
+        self._remember(key, coords, expires_at)
+        
+        latitude, longitude = coords if coords is not None else (None, None)
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO geocode (key, latitude, longitude, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, latitude, longitude, expires_at)
+                )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Geocode cache write failed: {str(e)}")
+
+
+_geocode_cache = None
+
+
+def get_geocode_cache() -> GeocodeCache:
+    """The process-wide geocode cache"""
+    global _geocode_cache
+    if _geocode_cache is None:
+        _geocode_cache = GeocodeCache()
+    return _geocode_cache
@@ -6,6 +6,7 @@ Fallback to hardcoded coordinates for common Indian cities.
 import httpx
 import asyncio
 from typing import Optional, Dict, Tuple
+from app.integrations.geocode_cache import NOT_CACHED, get_geocode_cache, normalize_place_name
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -84,13 +85,15 @@ class GeocodingService:
     """
     Converts city names to coordinates using multiple strategies.
     Strategy 1: Hardcoded lookup (fastest, for common Indian cities)
-    Strategy 2: OpenStreetMap Nominatim API (for any location)
+    Strategy 2: OpenStreetMap Nominatim API (for any location), cached
     Strategy 3: Default to center of search radius
     """
     
     NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
     TIMEOUT = 10  # seconds (increased for API reliability)
     
+    _in_flight: Dict[str, "asyncio.Task"] = {}  # Normalized name -> running Nominatim request
+    
     @staticmethod
     async def get_coordinates_by_city(city_name: str) -> Tuple[float, float]:
         """
@@ -160,15 +163,58 @@ class GeocodingService:
     @staticmethod
     async def _lookup_nominatim(city_name: str) -> Optional[Tuple[float, float]]:
         """
-        Lookup city using OpenStreetMap Nominatim API.
+        Lookup city using OpenStreetMap Nominatim API, through the geocode cache.
         
-        Free API, no authentication required.
+        Free API, no authentication required, but rate limited: answers
+        (including "not found") are cached, and concurrent lookups of the
+        same name share one request. Failed requests are not cached.
         
         Args:
             city_name: City name
             
         Returns:
             (latitude, longitude) or None if not found
+        """
+        cached = get_geocode_cache().get(city_name)
+        if cached is not NOT_CACHED:
+            logger.info(f"Geocode cache hit for '{city_name}': {cached}")
+            return cached
+        
+        key = normalize_place_name(city_name)
+        task = GeocodingService._in_flight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(GeocodingService._query_nominatim(city_name))
+            GeocodingService._in_flight[key] = task
+            task.add_done_callback(
+                lambda done: GeocodingService._in_flight.pop(key, None)
+                if GeocodingService._in_flight.get(key) is done else None
+            )
+        
+        try:
+            coords = await asyncio.shield(task)
+        except asyncio.TimeoutError:
+            logger.error(f"Nominatim API timeout for city: {city_name}")
+            return None
+        except Exception as e:
+            logger.error(f"Nominatim API error: {str(e)}")
+            return None
+        
+        get_geocode_cache().put(city_name, coords)
+        return coords
+    
+    @staticmethod
+    async def _query_nominatim(city_name: str) -> Optional[Tuple[float, float]]:
+        """
+        One Nominatim search request.
+        
+        Args:
+            city_name: City name
+            
+        Returns:
+            (latitude, longitude) or None if Nominatim has no result
+            
+        Raises:
+            httpx.HTTPError: On timeouts, connection errors and non-200 responses
             
         Example:
             Request: https://nominatim.openstreetmap.org/search?q=Mumbai&format=json
@@ -182,49 +228,37 @@ class GeocodingService:
                 }
             ]
         """
-        try:
-            async with httpx.AsyncClient(timeout=GeocodingService.TIMEOUT) as client:
-                response = await client.get(
-                    GeocodingService.NOMINATIM_URL,
-                    params={
-                        'q': city_name,
-                        'format': 'json',
-                        'limit': 1,
-                    },
-                    headers={
-                        'User-Agent': 'GoTrip-Travel-Planning-API/1.0'
-                    }
-                )
-                
-                logger.info(f"Nominatim response status: {response.status_code}")
-                
-                if response.status_code == 200:
-                    results = response.json()
-                    
-                    if results and len(results) > 0:
-                        first_result = results[0]
-                        lat = float(first_result['lat'])
-                        lon = float(first_result['lon'])
-                        
-                        logger.info(
-                            f"Nominatim found '{city_name}' at "
-                            f"({lat}, {lon}) - {first_result.get('display_name', '')}"
-                        )
-                        
-                        return (lat, lon)
-                    else:
-                        logger.warning(f"No results from Nominatim for city: {city_name}")
-                        return None
-                else:
-                    logger.error(f"Nominatim API error: {response.status_code}")
-                    return None
-                    
-        except asyncio.TimeoutError:
-            logger.error(f"Nominatim API timeout for city: {city_name}")
-            return None
-        except Exception as e:
-            logger.error(f"Nominatim API error: {str(e)}")
-            return None
+        async with httpx.AsyncClient(timeout=GeocodingService.TIMEOUT) as client:
+            response = await client.get(
+                GeocodingService.NOMINATIM_URL,
+                params={
+                    'q': city_name,
+                    'format': 'json',
+                    'limit': 1,
+                },
+                headers={
+                    'User-Agent': 'GoTrip-Travel-Planning-API/1.0'
+                }
+            )
+            
+            logger.info(f"Nominatim response status: {response.status_code}")
+            response.raise_for_status()
+            
+            results = response.json()
+            if not results:
+                logger.warning(f"No results from Nominatim for city: {city_name}")
+                return None
+            
+            first_result = results[0]
+            lat = float(first_result['lat'])
+            lon = float(first_result['lon'])
+            
+            logger.info(
+                f"Nominatim found '{city_name}' at "
+                f"({lat}, {lon}) - {first_result.get('display_name', '')}"
+            )
+            
+            return (lat, lon)
     
     @staticmethod
     async def validate_city(city_name: str) -> Dict[str, any]:
@@ -304,7 +338,13 @@ def get_city_coordinates(city_name: str) -> Tuple[float, float]:
     except:
         pass
     
-    # If not in hardcoded, raise error (can extend with sync API call if needed)
+    # Then places an earlier Nominatim lookup already found
+    cached = get_geocode_cache().get(city_name)
+    if cached is not NOT_CACHED and cached is not None:
+        logger.info(f"Cached geocode for {city_name}: {cached}")
+        return cached
+    
+    # If not found, raise error (can extend with sync API call if needed)
     raise ValueError(
         f"City '{city_name}' not found. Please check spelling or try another city. "
         f"Common cities: Mumbai, Delhi, Bangalore, Goa, Jaipur, Agra, Varanasi, etc."
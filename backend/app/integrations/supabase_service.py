@@ -2,9 +2,10 @@
 Supabase integration for fetching real destination data.
 """
 import os
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.models.schemas import PlaceModel, PreferenceEnum
 from app.utils.logger import get_logger
+from app.utils.geo import bounding_box, haversine_one_to_many
 
 logger = get_logger(__name__)
 
@@ -23,33 +24,127 @@ def get_supabase_client():
         return None
 
 
-def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+PAGE_SIZE = 200  # Rows per PostgREST page when collecting in-radius candidates
+
+
+def row_to_place(dest: dict, preferences: Optional[List[str]] = None) -> PlaceModel:
     """
-    Calculate distance between two coordinates using Haversine formula.
-    
-    Args:
-        lat1, lon1: Starting coordinates
-        lat2, lon2: Ending coordinates
+    Map a Supabase destinations row to a PlaceModel.
     
-    Returns:
-        Distance in kilometers
+    The primary category is the first category that matches a requested
+    preference, otherwise the first one that is a valid PreferenceEnum.
+    The table's cost_per_day and photos columns become estimated_cost and
+    photo_url (its first photo).
     """
-    from math import radians, sin, cos, sqrt, atan2
+    categories_from_db = dest.get('categories', [])
+    primary_category = PreferenceEnum.NATURE  # Default fallback
     
-    R = 6371  # Earth's radius in km
+    if categories_from_db:
+        if isinstance(categories_from_db, list):
+            wanted = [p.lower() for p in preferences or []]
+            ordered = sorted(categories_from_db, key=lambda cat: str(cat).lower() not in wanted)
+            # Try to find first category that matches PreferenceEnum
+            for cat in ordered:
+                try:
+                    primary_category = PreferenceEnum(cat.lower())
+                    break
+                except ValueError:
+                    continue
+        else:
+            # If it's a string, try to parse it
+            try:
+                primary_category = PreferenceEnum(categories_from_db.lower())
+            except ValueError:
+                pass
     
-    lat1_rad = radians(lat1)
-    lon1_rad = radians(lon1)
-    lat2_rad = radians(lat2)
-    lon2_rad = radians(lon2)
+    photos = dest.get('photos') or []
+    if isinstance(photos, str):
+        photos = [photos]
     
-    dlat = lat2_rad - lat1_rad
-    dlon = lon2_rad - lon1_rad
+    return PlaceModel(
+        id=str(dest.get('id', '')),
+        name=dest.get('name', 'Unknown'),
+        category=primary_category,
+        latitude=float(dest.get('latitude', 0)),
+        longitude=float(dest.get('longitude', 0)),
+        rating=float(dest.get('rating', 4.0)),
+        reviews=int(dest.get('reviews', 0)),
+        estimated_cost=float(dest.get('cost_per_day', dest.get('estimated_cost')) or 0),
+        description=dest.get('description', ''),
+        city=dest.get('city', None),
+        state=dest.get('state', None),
+        photo_url=dest.get('photo_url') or (photos[0] if photos else None),
+        opening_hours=dest.get('opening_hours', None)
+    )
+
+
+def _fetch_in_radius(
+    client,
+    preferences: Optional[List[str]],
+    limit: int,
+    center_lat: Optional[float],
+    center_lon: Optional[float],
+    radius_km: float
+) -> Tuple[int, List[PlaceModel]]:
+    """
+    Page through destinations inside the radius bounding box.
+    
+    The lat/lon range predicates can use idx_destinations_location and the
+    categories overlap predicate can use the GIN idx_destinations_categories
+    index. Pages are fetched until `limit` in-radius places are collected or
+    the table is exhausted.
     
-    a = sin(dlat / 2)**2 + cos(lat1_rad) * cos(lat2_rad) * sin(dlon / 2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    Returns:
+        Tuple of (rows_fetched, in_radius_places)
+    """
+    has_center = center_lat is not None and center_lon is not None
+    page_size = max(limit, PAGE_SIZE)
+    rows_fetched = 0
+    places = []
     
-    return R * c
+    while len(places) < limit:
+        query = client.table('destinations').select('*')
+        
+        if has_center:
+            min_lat, max_lat, min_lon, max_lon = bounding_box(center_lat, center_lon, radius_km)
+            query = query.gte('latitude', min_lat).lte('latitude', max_lat)
+            # Boxes crossing the antimeridian are only constrained by latitude
+            if min_lon >= -180 and max_lon <= 180:
+                query = query.gte('longitude', min_lon).lte('longitude', max_lon)
+        
+        if preferences:
+            query = query.overlaps('categories', [p.lower() for p in preferences])
+        
+        response = query.order('id').range(rows_fetched, rows_fetched + page_size - 1).execute()
+        rows = response.data or []
+        rows_fetched += len(rows)
+        
+        page_places = []
+        for dest in rows:
+            try:
+                page_places.append(row_to_place(dest, preferences))
+            except Exception as e:
+                logger.warning(f"Error parsing destination: {str(e)}")
+                continue
+        
+        # Drop the bounding box corners that fall outside the radius
+        if has_center and page_places:
+            distances = haversine_one_to_many(
+                center_lat, center_lon,
+                [place.latitude for place in page_places],
+                [place.longitude for place in page_places]
+            )
+            page_places = [
+                place for place, distance in zip(page_places, distances)
+                if distance <= radius_km
+            ]
+        
+        places.extend(page_places)
+        
+        if len(rows) < page_size:
+            break
+    
+    return rows_fetched, places[:limit]
 
 
 def fetch_destinations_from_supabase(
@@ -62,6 +157,13 @@ def fetch_destinations_from_supabase(
     """
     Fetch destinations from Supabase database.
     
+    The radius bounding box and the preference categories are pushed down
+    into the query, and results are paged until `limit` in-radius places are
+    collected. If no nearby place matches the preferences, nearby places of
+    any category are returned instead. Planning only calls this until the
+    destination catalog has loaded; the catalog answers radius and nearest
+    queries from one spatial index built per load.
+    
     Args:
         preferences: List of preference categories to filter by
         limit: Maximum number of destinations to return
@@ -81,100 +183,23 @@ def fetch_destinations_from_supabase(
         print(f"\n🔗 SUPABASE: Fetching destinations (limit={limit}, radius={radius_km}km)")
         print(f"   Center: ({center_lat}, {center_lon}), Preferences: {preferences}")
         
-        query = client.table('destinations').select('*')
-        
-        # No category filtering here - we'll filter results client-side
-        # because Supabase array contains() operator is complex
+        rows_fetched, places = _fetch_in_radius(
+            client, preferences, limit, center_lat, center_lon, radius_km
+        )
+        print(f"📊 SUPABASE: Fetched {rows_fetched} rows, {len(places)} within {radius_km}km matching {preferences}")
         
-        response = query.limit(limit).execute()
+        # If no nearby place matches the preferences, use all nearby destinations (fallback)
+        if not places and preferences:
+            print(f"⚠️  SUPABASE: No destinations matching preferences {preferences}. Using all nearby destinations.")
+            rows_fetched, places = _fetch_in_radius(
+                client, None, limit, center_lat, center_lon, radius_km
+            )
+            print(f"📊 SUPABASE: Fetched {rows_fetched} rows, {len(places)} within {radius_km}km radius")
         
-        if not response.data:
+        if not places:
             print(f"⚠️  SUPABASE: No destinations found in Supabase database!")
             return []
         
-        print(f"✅ SUPABASE: Fetched {len(response.data)} destinations from Supabase table")
-        
-        # Convert to PlaceModel instances
-        places = []
-        all_places_count = 0
-        for dest in response.data:
-            all_places_count += 1
-            try:
-                # Map Supabase columns to PlaceModel
-                # Get the primary category from the categories array
-                categories_from_db = dest.get('categories', [])
-                primary_category = PreferenceEnum.NATURE  # Default fallback
-                
-                # If categories is a list, use first matching preference
-                if categories_from_db:
-                    if isinstance(categories_from_db, list):
-                        # Try to find first category that matches PreferenceEnum
-                        for cat in categories_from_db:
-                            try:
-                                primary_category = PreferenceEnum(cat.lower())
-                                break
-                            except ValueError:
-                                continue
-                    else:
-                        # If it's a string, try to parse it
-                        try:
-                            primary_category = PreferenceEnum(categories_from_db.lower())
-                        except ValueError:
-                            pass
-                
-                place = PlaceModel(
-                    id=str(dest.get('id', '')),
-                    name=dest.get('name', 'Unknown'),
-                    category=primary_category,
-                    latitude=float(dest.get('latitude', 0)),
-                    longitude=float(dest.get('longitude', 0)),
-                    rating=float(dest.get('rating', 4.0)),
-                    reviews=int(dest.get('reviews', 0)),
-                    estimated_cost=float(dest.get('estimated_cost', 0)),
-                    description=dest.get('description', ''),
-                    city=dest.get('city', None),
-                    state=dest.get('state', None),
-                    photo_url=dest.get('photo_url', None),
-                    opening_hours=dest.get('opening_hours', None)
-                )
-                
-                # Calculate distance if center coordinates provided
-                if center_lat is not None and center_lon is not None:
-                    distance = haversine_distance(
-                        center_lat, center_lon,
-                        place.latitude, place.longitude
-                    )
-                    
-                    # Filter by radius
-                    if distance <= radius_km:
-                        places.append(place)
-                    else:
-                        logger.debug(f"Place {place.name} too far: {distance:.0f}km > {radius_km}km")
-                else:
-                    places.append(place)
-                    
-            except Exception as e:
-                logger.warning(f"Error parsing destination: {str(e)}")
-                continue
-        
-        print(f"📊 SUPABASE: Parsed {all_places_count} destinations, {len(places)} within {radius_km}km radius")
-        
-        # Filter by preferences if provided
-        if preferences:
-            filtered_places = []
-            for place in places:
-                # Check if place category matches any of the requested preferences
-                if place.category.value in [p.lower() for p in preferences]:
-                    filtered_places.append(place)
-            
-            print(f"🏷️  SUPABASE: Preferences filter: {preferences}, matched {len(filtered_places)} out of {len(places)}")
-            
-            # If some matches found, use filtered results; otherwise use all (fallback)
-            if filtered_places:
-                places = filtered_places
-            else:
-                print(f"⚠️  SUPABASE: No destinations matching preferences {preferences}. Using all {len(places)} nearby destinations.")
-        
         print(f"📤 SUPABASE: Returning {len(places)} destinations to trip planner")
         return places
         
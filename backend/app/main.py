@@ -4,6 +4,8 @@ Main FastAPI application entry point.
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from app.config import settings
+from app.integrations.destination_catalog import get_destination_catalog
 from app.routes import trip_planning
 from app.utils.logger import get_logger
 
@@ -31,6 +33,19 @@ app.add_middleware(
 app.include_router(trip_planning.router)
 
 
+@app.on_event("startup")
+def start_destination_catalog():
+    """Load the destination catalog in the background and keep it fresh."""
+    if not settings.USE_MOCK_DATA:
+        get_destination_catalog().start()
+
+
+@app.on_event("shutdown")
+def stop_destination_catalog():
+    """Stop the catalog's background refresh."""
+    get_destination_catalog().stop()
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -54,8 +69,10 @@ async def info():
         "version": "1.0.0",
         "algorithms_used": {
             "scoring": "Multi-factor weighted scoring (Rating + Preferences + Popularity + Distance)",
-            "selection": "Greedy algorithm respecting budget and time constraints",
-            "optimization": "Nearest Neighbor heuristic for Traveling Salesman Problem",
+            "selection": "Budget-and-time knapsack (DP / branch-and-bound, greedy warm start)",
+            "distribution": "Capacitated geographic clustering (balanced k-means on visit time)",
+            "orienteering": "Optional engine selecting and routing places together under per-day time budgets including travel",
+            "optimization": "Held-Karp exact TSP for small days; anytime multi-start Nearest Neighbor + 2-opt/Or-opt for larger ones, within the request's latency budget",
             "weather_integration": "Rule-based weather adjustment and filtering"
         },
         "features": [
@@ -2,9 +2,10 @@
 Pydantic models for request/response validation and serialization.
 """
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any
-from datetime import datetime, date
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime, date, time
 from enum import Enum
+from app.utils.opening_hours import parse_opening_hours
 
 
 class PreferenceEnum(str, Enum):
@@ -19,6 +20,13 @@ class PreferenceEnum(str, Enum):
     CULTURAL = "cultural"
 
 
+class EditOperationEnum(str, Enum):
+    """Itinerary edit operations."""
+    ADD = "add"
+    REMOVE = "remove"
+    PIN = "pin"
+
+
 class ItineraryItemRequest(BaseModel):
     """Request model for single trip item."""
     start_date: date
@@ -28,6 +36,9 @@ class ItineraryItemRequest(BaseModel):
     city_name: Optional[str] = Field(None, min_length=1, description="Starting city name (e.g., 'Mumbai', 'Delhi')")
     latitude: Optional[float] = Field(None, ge=-90, le=90, description="(Deprecated) Use city_name instead")
     longitude: Optional[float] = Field(None, ge=-180, le=180, description="(Deprecated) Use city_name instead")
+    engine: Optional[str] = Field(None, description="Planning engine: 'staged' (default) or 'orienteering'")
+    latency_budget_ms: Optional[float] = Field(None, gt=0, description="Planning time budget in milliseconds (default 300)")
+    routing_mode: Optional[str] = Field(None, description="Routing mode: 'distance' (default) or 'time_windows' to respect opening hours")
     
     @validator('end_date')
     def validate_dates(cls, v, values):
@@ -59,11 +70,55 @@ class PlaceModel(BaseModel):
     state: Optional[str] = None
     photo_url: Optional[str] = None
     opening_hours: Optional[str] = None
+    open_intervals: Optional[List[Tuple[int, int]]] = Field(
+        None, description="Opening hours as (open, close) minutes after midnight; None if unconstrained"
+    )
+    
+    @validator('open_intervals', always=True)
+    def compile_opening_hours(cls, v, values):
+        """Parse opening_hours once, when the place is loaded."""
+        if v is None:
+            intervals = parse_opening_hours(values.get('opening_hours'))
+            return None if intervals is None else list(intervals)
+        return v
     
     class Config:
         use_enum_values = False
 
 
+class RouteImprovementReport(BaseModel):
+    """Outcome of the improvement stage run on a day's Nearest Neighbor route."""
+    method: str = Field(default="local_search", description="'local_search' (2-opt/Or-opt), 'anytime' (multi-start) or 'held_karp' (exact)")
+    initial_distance: float = Field(..., description="Route distance before improvement in km")
+    final_distance: float = Field(..., description="Route distance after improvement in km")
+    distance_saved: float = Field(default=0, description="Distance saved in km")
+    iterations: int = Field(default=0, description="Improving moves applied")
+    two_opt_moves: int = 0
+    or_opt_moves: int = 0
+    restarts: int = Field(default=0, description="Route constructions tried (anytime search)")
+    deadline_reached: bool = Field(default=False, description="Whether the search stopped at its deadline")
+    elapsed_ms: float = Field(default=0, description="Time spent improving in milliseconds")
+
+
+class PlanningReport(BaseModel):
+    """How the planning pipeline used its latency budget."""
+    latency_budget_ms: float = Field(..., description="Requested planning time budget in milliseconds")
+    elapsed_ms: float = Field(..., description="Planning time in milliseconds")
+    deadline_reached: bool = Field(default=False, description="Whether any optimization stage was cut short")
+    route_restarts: int = Field(default=0, description="Route constructions tried across all days")
+    route_iterations: int = Field(default=0, description="Improving route moves applied across all days")
+    distance_saved: float = Field(default=0, description="Distance saved vs Nearest Neighbor in km")
+
+
+class StopSchedule(BaseModel):
+    """Timed visit of one place (time-window routing)."""
+    place_id: str
+    arrival_time: time = Field(..., description="Arrival at the place")
+    start_time: time = Field(..., description="Visit start (after waiting for opening)")
+    departure_time: time = Field(..., description="Visit end")
+    wait_minutes: float = Field(default=0, description="Minutes spent waiting for opening")
+
+
 class DayItinerary(BaseModel):
     """Model for a single day in the itinerary."""
     day: int
@@ -72,6 +127,10 @@ class DayItinerary(BaseModel):
     total_distance: float = Field(default=0, description="Total distance in km")
     total_time: float = Field(default=0, description="Total time in minutes")
     estimated_budget: float = Field(default=0, description="Estimated cost for the day")
+    route_improvement: Optional[RouteImprovementReport] = None
+    pinned_place_ids: List[str] = Field(default=[], description="Places the user pinned to this day")
+    stops: List[StopSchedule] = Field(default=[], description="Per-stop times (time-window routing only)")
+    dropped_place_ids: List[str] = Field(default=[], description="Places dropped because their opening hours fit no day")
 
 
 class TripItineraryResponse(BaseModel):
@@ -84,11 +143,36 @@ class TripItineraryResponse(BaseModel):
     total_estimated_cost: float = Field(default=0, description="Total estimated cost")
     daily_itineraries: List[DayItinerary]
     algorithm_explanation: str = ""
+    planning_report: Optional[PlanningReport] = None
+    center_latitude: Optional[float] = Field(None, description="Daily start latitude used for routing")
+    center_longitude: Optional[float] = Field(None, description="Daily start longitude used for routing")
     
     class Config:
         use_enum_values = False
 
 
+class ItineraryEditOperation(BaseModel):
+    """A single edit to an existing itinerary."""
+    op: EditOperationEnum
+    place_id: str
+    day: Optional[int] = Field(None, ge=1, description="Target day (add: cheapest day if omitted; pin: current day if omitted)")
+    place: Optional[PlaceModel] = Field(None, description="Place details when adding a place the planner did not consider")
+
+
+class ItineraryEditRequest(BaseModel):
+    """Request model for editing a planned itinerary."""
+    trip_id: Optional[str] = Field(None, description="Trip to edit (must be a recent plan from this server)")
+    itinerary: Optional[TripItineraryResponse] = Field(None, description="Full prior itinerary (instead of trip_id)")
+    operations: List[ItineraryEditOperation] = Field(..., min_items=1)
+    
+    @validator('operations')
+    def validate_target(cls, v, values):
+        """Ensure the itinerary to edit is identified."""
+        if not values.get('trip_id') and values.get('itinerary') is None:
+            raise ValueError('trip_id or itinerary is required')
+        return v
+
+
 class ErrorResponse(BaseModel):
     """Error response model."""
     error: str
@@ -2,7 +2,10 @@
 REST API routes for trip planning.
 """
 from fastapi import APIRouter, HTTPException, status
-from app.models.schemas import ItineraryItemRequest, TripItineraryResponse, APIResponse
+from fastapi.concurrency import run_in_threadpool
+from app.models.schemas import (
+    ItineraryItemRequest, ItineraryEditRequest, TripItineraryResponse, APIResponse
+)
 from app.services.trip_planning_service import TripPlanningService
 from app.utils.logger import get_logger
 
@@ -22,6 +25,10 @@ async def plan_trip(request: ItineraryItemRequest) -> TripItineraryResponse:
     This endpoint accepts trip parameters and returns a day-wise optimized itinerary
     with places, routes, and estimated costs.
     
+    A request that differs from a recent plan only in `end_date` and/or
+    `budget` (e.g. from a date-range slider) reuses that plan's geocode,
+    scored candidates and unchanged days instead of planning from scratch.
+    
     **Request Body:**
     - `start_date`: Trip start date (YYYY-MM-DD)
     - `end_date`: Trip end date (YYYY-MM-DD)
@@ -30,6 +37,9 @@ async def plan_trip(request: ItineraryItemRequest) -> TripItineraryResponse:
     - `city_name`: (NEW) Starting city name (e.g., "Mumbai", "Delhi", "Goa"). Coordinates auto-fetched from OSM Nominatim API
     - `latitude`: (DEPRECATED) Use city_name instead. Center latitude for location-based filtering
     - `longitude`: (DEPRECATED) Use city_name instead. Center longitude for location-based filtering
+    - `engine`: (Optional) `staged` (default) or `orienteering` to select, distribute and route places together
+    - `latency_budget_ms`: (Optional) Planning time budget in milliseconds (default 300); the best plan found in time is returned
+    - `routing_mode`: (Optional) `distance` (default) or `time_windows` to schedule visits within opening hours
     
     **Response:**
     - `trip_id`: Unique identifier for the planned trip
@@ -38,8 +48,10 @@ async def plan_trip(request: ItineraryItemRequest) -> TripItineraryResponse:
     - `total_days`: Total number of days in the trip
     - `total_distance`: Total travel distance in kilometers
     - `total_estimated_cost`: Total estimated cost for the trip
-    - `daily_itineraries`: List of day-wise itineraries with places and metrics
+    - `daily_itineraries`: List of day-wise itineraries with places and metrics; with `time_windows`
+      routing each day also lists `stops` (arrival, start and departure times) and `dropped_place_ids`
     - `algorithm_explanation`: Detailed explanation of the planning algorithm including geocoding
+    - `planning_report`: Time used against the latency budget, route restarts and iterations
     
     **Example Request (NEW - Using City Name):**
     ```json
@@ -109,7 +121,8 @@ async def plan_trip(request: ItineraryItemRequest) -> TripItineraryResponse:
         logger.info(f"Received trip planning request: {request}")
         
         # Generate itinerary
-        itinerary = trip_service.plan_trip(request)
+        # Planning is CPU-bound (and may wait on the route pool), so keep it off the event loop
+        itinerary = await run_in_threadpool(trip_service.plan_trip, request)
         
         logger.info(f"Successfully planned trip: {itinerary.trip_id}")
         return itinerary
@@ -128,6 +141,62 @@ async def plan_trip(request: ItineraryItemRequest) -> TripItineraryResponse:
         )
 
 
+@router.post("/edit-itinerary", response_model=TripItineraryResponse, status_code=status.HTTP_200_OK)
+async def edit_itinerary(request: ItineraryEditRequest) -> TripItineraryResponse:
+    """
+    Add, remove or pin places in a planned itinerary without replanning.
+    
+    Only the days an edit touches are recomputed (cheapest insertion or
+    removal, then local route repair), so edits take milliseconds instead
+    of a full geocode/fetch/score/route pass. Itineraries planned with
+    `routing_mode: time_windows` get their touched days rescheduled, and an
+    edit that leaves a place no time within its opening hours is rejected
+    with 400.
+    
+    **Request Body:**
+    - `trip_id`: Trip returned by a recent `/api/plan-trip` call, or
+    - `itinerary`: The full prior `TripItineraryResponse`
+    - `operations`: List of edits, each with:
+        - `op`: `add`, `remove` or `pin`
+        - `place_id`: Place to edit
+        - `day`: (Optional) Target day; `add` picks the cheapest day when omitted
+        - `place`: (Optional) Full place details when adding a place the planner did not consider
+    
+    **Example Request:**
+    ```json
+    {
+        "trip_id": "550e8400-e29b-41d4-a716-446655440000",
+        "operations": [
+            {"op": "remove", "place_id": "beach_001"},
+            {"op": "pin", "place_id": "fort_003", "day": 2}
+        ]
+    }
+    ```
+    """
+    try:
+        logger.info(f"Received itinerary edit request: {len(request.operations)} operation(s)")
+        return await run_in_threadpool(trip_service.edit_itinerary, request)
+        
+    except KeyError as e:
+        logger.error(f"Trip not found: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Trip not found: {str(e)}"
+        )
+    except ValueError as e:
+        logger.error(f"Validation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid edit: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while editing the itinerary"
+        )
+
+
 @router.get("/health")
 async def health_check() -> dict:
     """Health check endpoint."""
@@ -0,0 +1,209 @@
+"""
+Capacitated geographic clustering of places into trip days.
+
+Balanced k-means on projected coordinates: every day gets a center, places
+are assigned to the nearest center that still has visit-time capacity
+(most constrained places first), and centers move to the mean of their
+places until the assignment settles. Days come out compact, so per-day
+routes stay short, and no day is overloaded with visits.
+
+extend_clusters adapts existing days instead: places keep their day and
+only new places are assigned, so unchanged days stay as they were.
+"""
+from typing import List, Sequence
+import numpy as np
+
+KM_PER_DEGREE = 111.195
+CAPACITY_SLACK = 0.15  # Allowed overload of a day above the average visit time
+MAX_ITERATIONS = 20
+RANDOM_SEED = 0  # Fixed seed so the same request always gets the same days
+
+
+def project_km(lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+    """
+    Equirectangular projection to kilometers around the points' mean latitude.
+    
+    Accurate enough for clustering places within a trip region.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    scale = np.cos(np.radians(lats.mean()))
+    return np.column_stack((lons * scale * KM_PER_DEGREE, lats * KM_PER_DEGREE))
+
+
+def _initial_centers(points: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """k-means++ seeding: spread initial centers across the region."""
+    centers = [points[rng.integers(len(points))]]
+    closest = ((points[:, None, :] - np.array(centers)[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+    for _ in range(len(centers), k):
+        total = closest.sum()
+        if total <= 0:
+            index = rng.integers(len(points))
+        else:
+            index = rng.choice(len(points), p=closest / total)
+        centers.append(points[index])
+        closest = np.minimum(closest, ((points - points[index]) ** 2).sum(axis=1))
+    return np.array(centers)
+
+
+def _assign(points: np.ndarray, weights: np.ndarray, centers: np.ndarray, capacity: float) -> np.ndarray:
+    """
+    Capacity-respecting assignment to centers.
+    
+    Places with the largest regret (gap between their best and second-best
+    center) choose first; each takes the nearest center with room left. A
+    place that fits nowhere goes to the center with the most room.
+    """
+    k = len(centers)
+    dist = np.sqrt(((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2))
+    preference = np.argsort(dist, axis=1)
+    
+    if k > 1:
+        ordered = np.take_along_axis(dist, preference[:, :2], axis=1)
+        regret = ordered[:, 1] - ordered[:, 0]
+    else:
+        regret = np.zeros(len(points))
+    order = np.lexsort((-weights, -regret))
+    
+    load = np.zeros(k)
+    labels = np.empty(len(points), dtype=np.intp)
+    for i in order:
+        for c in preference[i]:
+            if load[c] + weights[i] <= capacity:
+                break
+        else:
+            c = int(np.argmin(load))
+        labels[i] = c
+        load[c] += weights[i]
+    return labels
+
+
+def balanced_kmeans(
+    points: np.ndarray,
+    weights: Sequence[float],
+    k: int,
+    capacity: float = None,
+    max_iterations: int = MAX_ITERATIONS
+) -> np.ndarray:
+    """
+    Cluster points into k groups whose total weight stays within capacity.
+    
+    Args:
+        points: Array of shape (n, 2) in kilometers (see project_km)
+        weights: Weight of each point (visit minutes)
+        k: Number of clusters (days)
+        capacity: Maximum total weight per cluster (defaults to the
+            average load plus CAPACITY_SLACK)
+        max_iterations: Maximum assignment/update rounds
+    
+    Returns:
+        Array of cluster labels (0..k-1), one per point
+    """
+    n = len(points)
+    weights = np.asarray(weights, dtype=np.float64)
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+    k = max(1, min(k, n))
+    if capacity is None:
+        capacity = max(weights.sum() / k * (1 + CAPACITY_SLACK), weights.max())
+    
+    centers = _initial_centers(points, k, np.random.default_rng(RANDOM_SEED))
+    labels = _assign(points, weights, centers, capacity)
+    
+    for _ in range(max_iterations):
+        for c in range(k):
+            members = points[labels == c]
+            if len(members):
+                centers[c] = members.mean(axis=0)
+        new_labels = _assign(points, weights, centers, capacity)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    
+    return labels
+
+
+def extend_clusters(
+    points: np.ndarray,
+    weights: Sequence[float],
+    labels: Sequence[int],
+    k: int,
+    capacity: float
+) -> np.ndarray:
+    """
+    Assign unlabelled points to k clusters without moving labelled ones.
+    
+    Used to adapt a previous plan's days: each empty cluster (e.g. an added
+    day) is seeded with the unlabelled point farthest from every non-empty
+    cluster, then the remaining unlabelled points, in order, join the
+    nearest cluster with room left (the one with the most room if none
+    has), and that cluster's centroid moves to include them.
+    
+    Args:
+        points: Array of shape (n, 2) in kilometers (see project_km)
+        weights: Weight of each point (visit minutes)
+        labels: Fixed cluster per point, -1 for points to assign
+        k: Number of clusters (days)
+        capacity: Maximum total weight per cluster for new assignments
+    
+    Returns:
+        Array of cluster labels (0..k-1), one per point
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    labels = np.array(labels, dtype=np.intp)
+    pending = [i for i in range(len(points)) if labels[i] < 0]
+    
+    load = np.zeros(k)
+    sums = np.zeros((k, points.shape[1]))
+    counts = np.zeros(k)
+    fixed = labels >= 0
+    np.add.at(load, labels[fixed], weights[fixed])
+    np.add.at(sums, labels[fixed], points[fixed])
+    np.add.at(counts, labels[fixed], 1)
+    
+    def join(i: int, c: int):
+        labels[i] = c
+        load[c] += weights[i]
+        sums[c] += points[i]
+        counts[c] += 1
+    
+    for c in range(k):
+        if counts[c] or not pending:
+            continue
+        if counts.any():
+            centroids = sums[counts > 0] / counts[counts > 0, None]
+            gaps = ((points[pending, None, :] - centroids[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+            i = pending.pop(int(np.argmax(gaps)))
+        else:
+            i = pending.pop(0)
+        join(i, c)
+    
+    for i in pending:
+        dist = ((sums / np.maximum(counts, 1)[:, None] - points[i]) ** 2).sum(axis=1)
+        dist[counts == 0] = np.inf
+        room = load + weights[i] <= capacity
+        c = int(np.argmin(np.where(room, dist, np.inf))) if room.any() else int(np.argmin(load))
+        join(i, c)
+    
+    return labels
+
+
+def order_clusters(points: np.ndarray, labels: np.ndarray, k: int, origin: np.ndarray) -> List[int]:
+    """
+    Visit order for clusters: nearest cluster to the origin first, then
+    repeatedly the nearest remaining cluster. Empty clusters go last.
+    """
+    centroids = {}
+    for c in range(k):
+        members = points[labels == c]
+        if len(members):
+            centroids[c] = members.mean(axis=0)
+    
+    order = []
+    current = origin
+    while centroids:
+        c = min(centroids, key=lambda c: float(((centroids[c] - current) ** 2).sum()))
+        order.append(c)
+        current = centroids.pop(c)
+    
+    return order + [c for c in range(k) if c not in order]
@@ -0,0 +1,79 @@
+"""
+Exact route solver (Held-Karp dynamic programming) for small daily routes.
+
+Finds the optimal visiting order in O(2^n · n²) time, which is cheaper
+than shipping a heuristic approximation for the 2-12 places a day usually
+holds. DP layers are vectorized with NumPy: all subsets with the same
+number of places are relaxed together.
+"""
+from typing import List, Tuple
+import numpy as np
+
+MAX_EXACT_NODES = 13  # Start node + 12 places (4096 subsets)
+
+
+def held_karp(dist: np.ndarray, closed: bool = False) -> Tuple[float, List[int]]:
+    """
+    Optimal route over all nodes of a distance matrix, starting at node 0.
+    
+    Args:
+        dist: Square distance matrix; node 0 is the fixed start
+        closed: Whether the route returns to node 0 (tour) or ends anywhere (path)
+    
+    Returns:
+        Tuple of (route_length, route) where route is a list of node indices
+        beginning with 0
+    
+    Raises:
+        ValueError: If the matrix has more than MAX_EXACT_NODES nodes
+    """
+    n = dist.shape[0]
+    if n > MAX_EXACT_NODES:
+        raise ValueError(f"Held-Karp limited to {MAX_EXACT_NODES} nodes, got {n}")
+    if n <= 1:
+        return 0.0, list(range(n))
+    
+    # Places are nodes 1..n-1; bit j of a subset mask stands for node j + 1
+    m = n - 1
+    inner = np.asarray(dist[1:, 1:], dtype=np.float64)
+    full = (1 << m) - 1
+    
+    cost = np.full((1 << m, m), np.inf)
+    parent = np.full((1 << m, m), -1, dtype=np.int8)
+    for j in range(m):
+        cost[1 << j, j] = dist[0, j + 1]
+    
+    masks = np.arange(1 << m)
+    popcount = np.zeros(1 << m, dtype=np.int64)
+    for j in range(m):
+        popcount += (masks >> j) & 1
+    
+    for size in range(2, m + 1):
+        layer = masks[popcount == size]
+        for j in range(m):
+            ending = layer[(layer >> j) & 1 == 1]
+            previous = ending ^ (1 << j)
+            # Best predecessor k for every subset ending at j, in one pass
+            candidates = cost[previous] + inner[:, j]
+            best = np.argmin(candidates, axis=1)
+            cost[ending, j] = candidates[np.arange(len(ending)), best]
+            parent[ending, j] = best
+    
+    final = cost[full].copy()
+    if closed:
+        final += np.asarray(dist[1:, 0], dtype=np.float64)
+    last = int(np.argmin(final))
+    length = float(final[last])
+    
+    # Walk parents back from the last place
+    route = []
+    mask, j = full, last
+    while j >= 0:
+        route.append(j + 1)
+        prev = int(parent[mask, j])
+        mask ^= 1 << j
+        j = prev if mask else -1
+    route.append(0)
+    route.reverse()
+    
+    return length, route
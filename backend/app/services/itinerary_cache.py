@@ -0,0 +1,196 @@
+"""
+Two-tier cache of planned itineraries keyed by canonical request.
+
+Planning is not strictly deterministic: anytime route search stops at a
+wall-clock deadline, so the same request can come back with different
+(equally valid) plans under different load. The cache accepts that and
+serves the first plan made for a canonical request, latency budget
+included, until it expires or the catalog changes. An in-memory LRU holds
+recent plans as models; a SQLite file keeps them across restarts and
+shares them between worker processes. Every entry records the
+catalog version it was planned against and is only served for that
+version. The SQLite file is shared by workers that may see a new catalog
+version at different times, so rows of other versions are left alone and
+expire by TTL; a version change only clears this process's memory tier.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from app.models.schemas import PlaceModel, TripItineraryResponse
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ITINERARY_CACHE_PATH = os.getenv(
+    "ITINERARY_CACHE_PATH",
+    os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "itinerary_cache.sqlite3"))
+)
+ITINERARY_CACHE_SIZE = 512  # Plans kept in memory
+ITINERARY_TTL_SECONDS = 6 * 60 * 60  # How long a first plan is reused and its row kept
+
+CachedPlan = Tuple[TripItineraryResponse, List[PlaceModel]]
+
+
+class ItineraryCache:
+    """
+    Planned itineraries (with their candidate places) by request key.
+    
+    Keys are opaque strings built by the caller; the catalog version is
+    passed alongside and entries only hit for the version they were
+    planned against. SQLite errors are
+    logged and treated as misses, so a broken cache file never fails a
+    request.
+    """
+    
+    def __init__(
+        self,
+        path: str = ITINERARY_CACHE_PATH,
+        memory_size: int = ITINERARY_CACHE_SIZE,
+        ttl_seconds: float = ITINERARY_TTL_SECONDS
+    ):
+        """Create a cache backed by the SQLite file at `path` (opened on first use)."""
+        self.path = path
+        self.memory_size = memory_size
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[float, CachedPlan]]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()  # One SQLite connection per thread
+    
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's SQLite connection, creating the table on first use."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5)
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS itinerary ("
+                    "key TEXT PRIMARY KEY, catalog_version TEXT NOT NULL, expires_at REAL NOT NULL, "
+                    "itinerary TEXT NOT NULL, candidates TEXT NOT NULL)"
+                )
+                connection.execute("DELETE FROM itinerary WHERE expires_at <= ?", (time.time(),))
+            self._local.connection = connection
+        return connection
+    
+    def _use_version(self, version: str):
+        """
+        Switch the memory tier to a catalog version.
+        
+        Clears the memory tier and drops expired rows from SQLite. Rows of
+        other versions stay: workers that have not seen the new version
+        yet still read them, and reads filter by version anyway.
+        """
+        with self._lock:
+            if version == self._version:
+                return
+            self._version = version
+            self._memory.clear()
+        try:
+            connection = self._connection()
+            with connection:
+                removed = connection.execute(
+                    "DELETE FROM itinerary WHERE expires_at <= ?", (time.time(),)
+                ).rowcount
+            if removed:
+                logger.info(f"Dropped {removed} expired cached itineraries")
+        except sqlite3.Error as e:
+            logger.warning(f"Itinerary cache cleanup failed: {str(e)}")
+    
+    def _remember(self, key: str, expires_at: float, plan: CachedPlan):
+        """Put an entry in the memory tier, evicting the least recently used."""
+        with self._lock:
+            self._memory[key] = (expires_at, plan)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+    
+    def get(self, key: str, version: str) -> Optional[CachedPlan]:
+        """
+        Cached plan for a request key.
+        
+        Args:
+            key: Canonical request key
+            version: Current catalog version
+        
+        Returns:
+            (itinerary, candidate places), or None on a miss
+        """
+        self._use_version(version)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+        
+        try:
+            row = self._connection().execute(
+                "SELECT expires_at, itinerary, candidates FROM itinerary "
+                "WHERE key = ? AND catalog_version = ?", (key, version)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Itinerary cache read failed: {str(e)}")
+            return None
+        if row is None or row[0] <= now:
+            return None
+        
+        plan = (
+            TripItineraryResponse.parse_raw(row[1]),
+            [PlaceModel.parse_obj(place) for place in json.loads(row[2])]
+        )
+        self._remember(key, row[0], plan)
+        return plan
+    
+    def put(
+        self,
+        key: str,
+        version: str,
+        itinerary: TripItineraryResponse,
+        candidates: List[PlaceModel]
+    ):
+        """
+        Cache a plan.
+        
+        Args:
+            key: Canonical request key
+            version: Catalog version the plan was made against
+            itinerary: Planned itinerary
+            candidates: Candidate places the plan chose from (for later edits)
+        """
+        self._use_version(version)
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, expires_at, (itinerary, candidates))
+        
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO itinerary (key, catalog_version, expires_at, itinerary, candidates) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        key, version, expires_at, itinerary.json(),
+                        json.dumps([place.dict() for place in candidates])
+                    )
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Itinerary cache write failed: {str(e)}")
+
+
+_itinerary_cache = None
+
+
+def get_itinerary_cache() -> ItineraryCache:
+    """The process-wide itinerary cache"""
+    global _itinerary_cache
+    if _itinerary_cache is None:
+        _itinerary_cache = ItineraryCache()
+    return _itinerary_cache
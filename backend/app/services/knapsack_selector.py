@@ -0,0 +1,231 @@
+"""
+Place selection as a two-constraint (budget, visit minutes) knapsack.
+
+Maximizes the total score of the selected places. Small instances are
+solved by dynamic programming over quantized budget/time capacities;
+weights are rounded up, so every DP solution is truly feasible. Instances
+too large for the DP table use depth-first branch-and-bound with a
+fractional-relaxation bound under a wall-clock cap. The caller's greedy
+selection is the warm start, so the result is never worse than greedy.
+"""
+import time
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+MAX_BUDGET_BUCKETS = 1000  # Budget resolution of the DP table
+MAX_TIME_BUCKETS = 200  # Visit-time resolution of the DP table
+DP_MAX_WORK = 30_000_000  # Items × table cells handled by the DP
+TIME_CAP_MS = 50  # Wall-clock cap for branch-and-bound
+
+
+def _quantize(weights: np.ndarray, capacity: float, max_buckets: int) -> Tuple[np.ndarray, int]:
+    """
+    Integer weights and capacity for the DP table.
+    
+    Exact when the weights share a common unit that fits max_buckets,
+    otherwise rounded up (weights) and down (capacity). A constraint that
+    cannot bind (all weights fit together) collapses to a single bucket.
+    """
+    if weights.sum() <= capacity:
+        return np.zeros(len(weights), dtype=np.intp), 0
+    
+    unit = capacity / max_buckets
+    rounded = np.round(weights)
+    if np.allclose(weights, rounded):
+        unit = max(unit, float(np.gcd.reduce(rounded.astype(np.int64))))
+    
+    quantized = np.ceil(weights / unit - 1e-9).astype(np.intp)
+    return quantized, int(np.floor(capacity / unit + 1e-9))
+
+
+def knapsack_dp(
+    values: np.ndarray,
+    costs: np.ndarray,
+    times: np.ndarray,
+    budget: float,
+    time_limit: float
+) -> Optional[List[int]]:
+    """
+    Two-constraint knapsack by dynamic programming over quantized capacities.
+    
+    Returns:
+        Selected item indices, or None if the table would exceed DP_MAX_WORK
+    """
+    if budget <= 0 or time_limit <= 0:
+        return []  # No capacity (and _quantize needs a positive unit)
+    
+    q_costs, cap_b = _quantize(costs, budget, MAX_BUDGET_BUCKETS)
+    q_times, cap_t = _quantize(times, time_limit, MAX_TIME_BUCKETS)
+    n = len(values)
+    if n * (cap_b + 1) * (cap_t + 1) > DP_MAX_WORK:
+        return None
+    
+    # dp[b, t]: best value using at most b budget units and t time units
+    dp = np.zeros((cap_b + 1, cap_t + 1))
+    taken = []  # Packed "item improves this cell" masks, one per item
+    for i in range(n):
+        c, t = q_costs[i], q_times[i]
+        if c > cap_b or t > cap_t:
+            taken.append(None)
+            continue
+        candidate = dp[:cap_b + 1 - c, :cap_t + 1 - t] + values[i]
+        improved = np.zeros(dp.shape, dtype=bool)
+        improved[c:, t:] = candidate > dp[c:, t:]
+        dp[improved] = candidate[improved[c:, t:]]
+        taken.append(np.packbits(improved))
+    
+    selected = []
+    b, t = cap_b, cap_t
+    for i in range(n - 1, -1, -1):
+        if taken[i] is None:
+            continue
+        cell = b * (cap_t + 1) + t
+        if (taken[i][cell >> 3] >> (7 - (cell & 7))) & 1:
+            selected.append(i)
+            b -= q_costs[i]
+            t -= q_times[i]
+    selected.reverse()
+    return selected
+
+
+def _fractional_bound(
+    values: np.ndarray,
+    weights: np.ndarray,
+    order: np.ndarray,
+    start: int,
+    capacity: float
+) -> float:
+    """LP-relaxation bound for items start.. under a single capacity."""
+    items = order[order >= start]
+    cumulative = np.cumsum(weights[items])
+    fits = int(np.searchsorted(cumulative, capacity, side="right"))
+    bound = float(values[items[:fits]].sum())
+    if fits < len(items):
+        used = cumulative[fits - 1] if fits else 0.0
+        bound += float(values[items[fits]]) * (capacity - used) / weights[items[fits]]
+    return bound
+
+
+def knapsack_branch_and_bound(
+    values: np.ndarray,
+    costs: np.ndarray,
+    times: np.ndarray,
+    budget: float,
+    time_limit: float,
+    incumbent: Sequence[int] = (),
+    time_cap_ms: float = TIME_CAP_MS
+) -> Tuple[List[int], bool]:
+    """
+    Two-constraint knapsack by depth-first branch-and-bound.
+    
+    Items are branched in value-density order (value per combined share of
+    budget and time); a node is pruned when the smaller of the budget-only
+    and time-only fractional bounds cannot beat the incumbent.
+    
+    Args:
+        values, costs, times: Item arrays
+        budget, time_limit: Capacities
+        incumbent: Feasible starting solution (e.g. greedy selection)
+        time_cap_ms: Wall-clock cap; the best solution so far is returned
+    
+    Returns:
+        Tuple of (selected item indices, proven_optimal)
+    """
+    deadline = time.perf_counter() + time_cap_ms / 1000
+    density = values / (costs / max(budget, 1e-9) + times / max(time_limit, 1e-9) + 1e-12)
+    order = np.argsort(-density, kind="stable")
+    v, c, t = values[order], costs[order], times[order]
+    
+    # Bound orderings by position in the branching order
+    ratio_b = np.argsort(-(v / np.maximum(c, 1e-12)), kind="stable")
+    ratio_t = np.argsort(-(v / np.maximum(t, 1e-12)), kind="stable")
+    
+    best_value = float(values[list(incumbent)].sum()) if len(incumbent) else 0.0
+    best = None  # Linked list of chosen positions: (position, parent)
+    improved = False
+    n = len(order)
+    
+    # Stack entries: (depth, value, budget_left, time_left, chosen)
+    stack = [(0, 0.0, budget, time_limit, None)]
+    proven = True
+    while stack:
+        if time.perf_counter() >= deadline:
+            proven = False
+            break
+        depth, value, budget_left, time_left, chosen = stack.pop()
+        if value > best_value + 1e-9:
+            best_value, best, improved = value, chosen, True
+        if depth == n:
+            continue
+        bound = value + min(
+            _fractional_bound(v, c, ratio_b, depth, budget_left),
+            _fractional_bound(v, t, ratio_t, depth, time_left)
+        )
+        if bound <= best_value + 1e-9:
+            continue
+        
+        stack.append((depth + 1, value, budget_left, time_left, chosen))
+        if c[depth] <= budget_left and t[depth] <= time_left:
+            stack.append((
+                depth + 1, value + v[depth],
+                budget_left - c[depth], time_left - t[depth],
+                (depth, chosen)
+            ))
+    
+    if not improved:
+        return sorted(incumbent), proven
+    
+    selected = []
+    node = best
+    while node is not None:
+        selected.append(int(order[node[0]]))
+        node = node[1]
+    return sorted(selected), proven
+
+
+def select_knapsack(
+    values: Sequence[float],
+    costs: Sequence[float],
+    times: Sequence[float],
+    budget: float,
+    time_limit: float,
+    warm_start: Sequence[int] = (),
+    time_cap_ms: float = TIME_CAP_MS
+) -> Tuple[List[int], str]:
+    """
+    Best subset under both budget and visit-time limits.
+    
+    Args:
+        values: Score per candidate
+        costs: Cost per candidate
+        times: Visit minutes per candidate
+        budget: Total budget
+        time_limit: Total visit minutes
+        warm_start: Feasible selection to beat (greedy result)
+        time_cap_ms: Wall-clock cap for branch-and-bound
+    
+    Returns:
+        Tuple of (selected indices in ascending order, method) where method
+        is "dp", "branch_and_bound" or "greedy" (nothing better found, or
+        no budget / visit time to fill)
+    """
+    if budget <= 0 or time_limit <= 0:
+        return [], "greedy"
+    
+    values = np.asarray(values, dtype=np.float64)
+    costs = np.asarray(costs, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
+    warm_start = sorted(warm_start)
+    warm_value = float(values[warm_start].sum()) if warm_start else 0.0
+    
+    selected = knapsack_dp(values, costs, times, budget, time_limit)
+    method = "dp"
+    if selected is None:
+        selected, _ = knapsack_branch_and_bound(
+            values, costs, times, budget, time_limit, warm_start, time_cap_ms
+        )
+        method = "branch_and_bound"
+    
+    if float(values[selected].sum()) <= warm_value + 1e-9:
+        return warm_start, "greedy"
+    return selected, method
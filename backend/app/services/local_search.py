@@ -0,0 +1,334 @@
+"""
+Local search improvement for routes built by the Nearest Neighbor heuristic.
+
+Routes are lists of node indices into a distance matrix. The first node is
+fixed (the start point or first place); routes are open paths unless
+`closed` is set, in which case the last node returns to the first.
+
+Moves:
+- 2-opt: reverse a segment so two crossing edges become non-crossing
+- Or-opt: move a chain of 1-3 consecutive nodes (optionally reversed) elsewhere
+
+Both moves only consider candidate positions next to each node's nearest
+neighbours, so a pass costs O(n·k) instead of O(n²).
+
+anytime_search wraps this in a multi-start loop under a deadline: several
+Nearest Neighbor constructions are each improved, and the best route found
+when time runs out is returned.
+"""
+import time
+from typing import List, Optional, Tuple
+import numpy as np
+from app.models.schemas import RouteImprovementReport
+
+OR_OPT_MAX_SEGMENT = 3  # Longest chain moved by Or-opt
+ANYTIME_MAX_STARTS = 16  # Constructions tried by anytime_search when time allows
+RANDOMIZED_CHOICES = 3  # Randomized starts pick among this many nearest nodes
+
+
+def route_length(route: List[int], dist: np.ndarray, closed: bool = False) -> float:
+    """Total length of a route over a distance matrix."""
+    if len(route) < 2:
+        return 0.0
+    length = float(dist[route[:-1], route[1:]].sum())
+    if closed:
+        length += float(dist[route[-1], route[0]])
+    return length
+
+
+def neighbour_lists(dist: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k nearest other nodes for every node, nearest first."""
+    n = dist.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.intp)
+    
+    masked = dist + np.diag(np.full(n, np.inf))
+    nearest = np.argpartition(masked, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(masked, nearest, axis=1).argsort(axis=1)
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+class _Route:
+    """Mutable route with node positions for O(1) successor lookups."""
+    
+    def __init__(self, route: List[int], dist: np.ndarray, closed: bool):
+        self.nodes = list(route)
+        self.dist = dist
+        self.closed = closed
+        self.pos = {node: i for i, node in enumerate(self.nodes)}
+        self.cursor = 0  # Scan resumes where the last improving move was found
+    
+    def next_node(self, i: int) -> Optional[int]:
+        """Node after position i, or None at the open end."""
+        if i + 1 < len(self.nodes):
+            return self.nodes[i + 1]
+        return self.nodes[0] if self.closed else None
+    
+    def edge(self, a: int, b: Optional[int]) -> float:
+        """Edge length, zero for the missing edge past an open end."""
+        return 0.0 if b is None else float(self.dist[a, b])
+    
+    def reindex(self, start: int = 0):
+        for i in range(start, len(self.nodes)):
+            self.pos[self.nodes[i]] = i
+    
+    def try_two_opt(self, neighbours: np.ndarray) -> float:
+        """Apply the first improving 2-opt move; returns the gain (0 if none)."""
+        nodes = self.nodes
+        n = len(nodes)
+        for offset in range(n):
+            p = (self.cursor + offset) % n
+            a = nodes[p]
+            succ = self.next_node(p)
+            limit = self.edge(a, succ) if succ is not None else np.inf
+            
+            for c in neighbours[a]:
+                if self.dist[a, c] >= limit:
+                    break
+                q = self.pos.get(c)
+                if q is None:
+                    continue
+                i, j = min(p, q) + 1, max(p, q)
+                if j <= i or i < 1:
+                    continue
+                
+                after = self.next_node(j)
+                if after == nodes[i - 1]:
+                    continue
+                delta = (
+                    self.edge(nodes[i - 1], nodes[j]) + self.edge(nodes[i], after)
+                    - self.edge(nodes[i - 1], nodes[i]) - self.edge(nodes[j], after)
+                )
+                if delta < -1e-9:
+                    nodes[i:j + 1] = nodes[i:j + 1][::-1]
+                    self.reindex(i)
+                    self.cursor = p
+                    return -delta
+        return 0.0
+    
+    def try_or_opt(self, neighbours: np.ndarray) -> float:
+        """Apply the first improving Or-opt move; returns the gain (0 if none)."""
+        nodes = self.nodes
+        n = len(nodes)
+        for length in range(1, OR_OPT_MAX_SEGMENT + 1):
+            starts = n - length
+            for offset in range(starts):
+                i = 1 + (self.cursor + offset) % starts
+                first, last = nodes[i], nodes[i + length - 1]
+                prev, after = nodes[i - 1], self.next_node(i + length - 1)
+                if after == first:
+                    continue
+                removal_gain = (
+                    self.edge(prev, first) + self.edge(last, after) - self.edge(prev, after)
+                )
+                if removal_gain <= 1e-9:
+                    continue
+                
+                # Insert the chain next to a neighbour of either end
+                for end in (first, last):
+                    for c in neighbours[end]:
+                        if self.dist[end, c] >= removal_gain:
+                            break
+                        q = self.pos.get(c)
+                        if q is None or i <= q < i + length:
+                            continue
+                        for k in (q - 1, q):
+                            if k < 0 or i - 1 <= k < i + length:
+                                continue
+                            x, y = nodes[k], self.next_node(k)
+                            base = self.edge(x, y)
+                            forward = self.edge(x, first) + self.edge(last, y) - base
+                            backward = self.edge(x, last) + self.edge(first, y) - base
+                            cost = min(forward, backward)
+                            if cost < removal_gain - 1e-9:
+                                segment = nodes[i:i + length]
+                                if backward < forward:
+                                    segment = segment[::-1]
+                                rest = nodes[:i] + nodes[i + length:]
+                                insert_at = rest.index(x) + 1
+                                self.nodes = nodes = rest[:insert_at] + segment + rest[insert_at:]
+                                self.reindex()
+                                self.cursor = i
+                                return removal_gain - cost
+        return 0.0
+
+
+def improve_route(
+    route: List[int],
+    dist: np.ndarray,
+    closed: bool = False,
+    time_budget_ms: Optional[float] = None,
+    max_iterations: Optional[int] = None,
+    neighbour_count: int = 8,
+    neighbours: Optional[np.ndarray] = None
+) -> Tuple[List[int], RouteImprovementReport]:
+    """
+    Improve a route with 2-opt and Or-opt moves until no move improves it
+    or the time/iteration budget runs out.
+    
+    Args:
+        route: Initial route as node indices (first node stays fixed)
+        dist: Square distance matrix over all nodes
+        closed: Whether the route returns to its first node
+        time_budget_ms: Wall-clock budget in milliseconds (None for no limit)
+        max_iterations: Maximum number of applied moves (None for no limit)
+        neighbour_count: Size of each node's candidate neighbour list
+        neighbours: Precomputed neighbour lists (computed if None)
+    
+    Returns:
+        Tuple of (improved_route, report)
+    """
+    started = time.perf_counter()
+    deadline = None if time_budget_ms is None else started + time_budget_ms / 1000
+    initial = route_length(route, dist, closed)
+    
+    state = _Route(route, dist, closed)
+    if neighbours is None:
+        neighbours = neighbour_lists(dist, neighbour_count)
+    iterations = two_opt_moves = or_opt_moves = 0
+    
+    while len(state.nodes) > 2:
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        
+        if state.try_two_opt(neighbours) > 0:
+            two_opt_moves += 1
+        elif state.try_or_opt(neighbours) > 0:
+            or_opt_moves += 1
+        else:
+            break
+        iterations += 1
+    
+    final = route_length(state.nodes, dist, closed)
+    report = RouteImprovementReport(
+        initial_distance=initial,
+        final_distance=final,
+        distance_saved=initial - final,
+        iterations=iterations,
+        two_opt_moves=two_opt_moves,
+        or_opt_moves=or_opt_moves,
+        elapsed_ms=(time.perf_counter() - started) * 1000
+    )
+    return state.nodes, report
+
+
+def nearest_neighbour_route(
+    dist: np.ndarray,
+    first: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
+    choices: int = 1
+) -> List[int]:
+    """
+    Nearest Neighbor route from node 0.
+    
+    Args:
+        dist: Square distance matrix
+        first: Forced first hop (None for the nearest node)
+        rng: Random generator for randomized construction
+        choices: With rng, each step picks uniformly among this many
+            nearest unvisited nodes
+    """
+    n = dist.shape[0]
+    unvisited = np.ones(n, dtype=bool)
+    unvisited[0] = False
+    route = [0]
+    if first is not None and n > 1:
+        unvisited[first] = False
+        route.append(int(first))
+    
+    while len(route) < n:
+        row = np.where(unvisited, dist[route[-1]], np.inf)
+        if rng is not None and choices > 1:
+            k = min(choices, n - len(route))
+            nearest = int(rng.choice(np.argpartition(row, k - 1)[:k]))
+        else:
+            nearest = int(np.argmin(row))
+        unvisited[nearest] = False
+        route.append(nearest)
+    
+    return route
+
+
+def anytime_search(
+    dist: np.ndarray,
+    closed: bool = False,
+    deadline: Optional[float] = None,
+    max_starts: int = ANYTIME_MAX_STARTS,
+    neighbour_count: int = 8,
+    seed: int = 0,
+    max_iterations: Optional[int] = None
+) -> Tuple[List[int], RouteImprovementReport]:
+    """
+    Multi-start Nearest Neighbor with 2-opt / Or-opt (relocate) improvement,
+    returning the best route found by the deadline.
+    
+    Start 0 is the plain Nearest Neighbor route; the next starts force each
+    of node 0's nearest neighbours as the first hop, later ones use
+    randomized construction (seeded, so runs are repeatable). The first
+    start always runs, so a route is returned even past the deadline.
+    
+    Args:
+        dist: Square distance matrix; node 0 is the fixed start
+        closed: Whether the route returns to node 0
+        deadline: time.perf_counter() value to stop at (None: run all starts)
+        max_starts: Maximum number of constructions
+        neighbour_count: Size of each node's candidate neighbour list
+        seed: Seed for randomized constructions
+        max_iterations: Move budget per start (None for no limit); without
+            a deadline the result then depends only on the inputs
+    
+    Returns:
+        Tuple of (best_route, report) where the report compares against the
+        plain Nearest Neighbor route
+    """
+    started = time.perf_counter()
+    neighbours = neighbour_lists(dist, neighbour_count)
+    rng = np.random.default_rng(seed)
+    
+    initial = None
+    best, best_length = None, np.inf
+    starts = iterations = two_opt_moves = or_opt_moves = 0
+    deadline_reached = False
+    
+    for start in range(max_starts):
+        if start > 0 and deadline is not None and time.perf_counter() >= deadline:
+            deadline_reached = True
+            break
+        
+        if start == 0:
+            route = nearest_neighbour_route(dist)
+            initial = route_length(route, dist, closed)
+        elif start < neighbours.shape[1]:
+            route = nearest_neighbour_route(dist, first=int(neighbours[0, start]))
+        else:
+            route = nearest_neighbour_route(dist, rng=rng, choices=RANDOMIZED_CHOICES)
+        
+        budget_ms = None if deadline is None else max((deadline - time.perf_counter()) * 1000, 0)
+        route, report = improve_route(
+            route, dist, closed, time_budget_ms=budget_ms, max_iterations=max_iterations,
+            neighbours=neighbours
+        )
+        starts += 1
+        iterations += report.iterations
+        two_opt_moves += report.two_opt_moves
+        or_opt_moves += report.or_opt_moves
+        
+        if report.final_distance < best_length - 1e-9:
+            best, best_length = route, report.final_distance
+    
+    report = RouteImprovementReport(
+        method="anytime",
+        initial_distance=initial,
+        final_distance=best_length,
+        distance_saved=initial - best_length,
+        iterations=iterations,
+        two_opt_moves=two_opt_moves,
+        or_opt_moves=or_opt_moves,
+        restarts=starts,
+        deadline_reached=deadline_reached,
+        elapsed_ms=(time.perf_counter() - started) * 1000
+    )
+    return best, report
@@ -0,0 +1,198 @@
+"""
+Combined place selection and routing (team orienteering problem).
+
+Chooses which places to visit and in which order on every day at once,
+maximizing total score under the trip budget and a per-day time budget
+that counts both visit and travel minutes. Each day is an open path from
+the start node (node 0 of the travel matrix).
+
+Heuristic:
+1. Ratio insertion: repeatedly insert the place with the best score per
+   unit of resources (added day minutes and cost) at its cheapest position
+2. Local search: shorten each day's route (Held-Karp or 2-opt/Or-opt),
+   which frees time for further insertions
+3. Swaps: replace a routed place with a higher-scoring unrouted one when
+   the day and budget still fit, then insert again
+"""
+import time
+from typing import List, Sequence
+import numpy as np
+from app.services.exact_tsp import held_karp, MAX_EXACT_NODES
+from app.services.local_search import improve_route, route_length
+
+TIME_BUDGET_MS = 200  # Wall-clock budget for the improvement rounds
+MAX_SWAP_CANDIDATES = 100  # Unrouted places considered for swaps per round
+
+
+def _insertion_costs(route: List[int], travel: np.ndarray, nodes: np.ndarray):
+    """
+    Cheapest insertion of each node into an open route.
+    
+    Returns:
+        Tuple of (added_travel, position) arrays; position is the index in
+        the route after which the node goes
+    """
+    before = travel[np.ix_(route, nodes)]
+    after = np.zeros_like(before)
+    removed = np.zeros(len(route))
+    if len(route) > 1:
+        after[:-1] = travel[np.ix_(nodes, route[1:])].T
+        removed[:-1] = travel[route[:-1], route[1:]]
+    delta = before + after - removed[:, None]
+    position = np.argmin(delta, axis=0)
+    return delta[position, np.arange(len(nodes))], position
+
+
+class _Plan:
+    """Routes, resource usage and cached insertion costs for every day."""
+    
+    def __init__(
+        self,
+        scores: np.ndarray,
+        costs: np.ndarray,
+        visit_minutes: np.ndarray,
+        travel: np.ndarray,
+        budget: float,
+        days: int,
+        day_minutes: float
+    ):
+        self.scores = scores
+        self.costs = costs
+        self.visit = np.concatenate(([0.0], visit_minutes))  # Indexed by node
+        self.travel = travel
+        self.budget = budget
+        self.day_minutes = day_minutes
+        self.nodes = np.arange(1, len(scores) + 1)
+        
+        self.routes = [[0] for _ in range(days)]
+        self.day_time = np.zeros(days)
+        self.spent = 0.0
+        self.routed = np.zeros(len(scores), dtype=bool)
+        self.delta = np.zeros((days, len(scores)))
+        self.position = np.zeros((days, len(scores)), dtype=np.intp)
+        for d in range(days):
+            self.refresh(d)
+    
+    def refresh(self, d: int):
+        """Recompute day d's time and insertion costs after its route changed."""
+        route = self.routes[d]
+        self.day_time[d] = route_length(route, self.travel) + self.visit[route].sum()
+        self.delta[d], self.position[d] = _insertion_costs(route, self.travel, self.nodes)
+    
+    def insert_all(self) -> int:
+        """Ratio insertion until nothing fits; returns the number inserted."""
+        inserted = 0
+        while True:
+            added = self.delta + self.visit[1:]
+            feasible = (
+                ~self.routed
+                & (self.day_time[:, None] + added <= self.day_minutes + 1e-9)
+                & (self.spent + self.costs <= self.budget + 1e-9)
+            )
+            if not feasible.any():
+                return inserted
+            
+            usage = added / self.day_minutes + self.costs / self.budget
+            ratio = np.where(feasible, self.scores / np.maximum(usage, 1e-9), -np.inf)
+            d, j = np.unravel_index(int(np.argmax(ratio)), ratio.shape)
+            self.routes[d].insert(int(self.position[d, j]) + 1, j + 1)
+            self.routed[j] = True
+            self.spent += self.costs[j]
+            self.refresh(d)
+            inserted += 1
+    
+    def improve_routes(self):
+        """Shorten every day's route; freed minutes allow more insertions."""
+        for d, route in enumerate(self.routes):
+            if len(route) <= 3:
+                continue
+            sub = self.travel[np.ix_(route, route)]
+            if len(route) <= MAX_EXACT_NODES:
+                _, order = held_karp(sub)
+            else:
+                order, _ = improve_route(list(range(len(route))), sub)
+            self.routes[d] = [route[i] for i in order]
+            self.refresh(d)
+    
+    def try_swap(self, deadline: float) -> bool:
+        """Apply the first improving swap of a routed for an unrouted place."""
+        unrouted = np.flatnonzero(~self.routed)
+        unrouted = unrouted[np.argsort(-self.scores[unrouted], kind="stable")][:MAX_SWAP_CANDIDATES]
+        
+        for j in unrouted:
+            if time.perf_counter() >= deadline:
+                return False
+            node = j + 1
+            for d, route in enumerate(self.routes):
+                for i in range(1, len(route)):
+                    out = route[i] - 1
+                    if self.scores[out] >= self.scores[j]:
+                        continue
+                    if self.spent - self.costs[out] + self.costs[j] > self.budget + 1e-9:
+                        continue
+                    
+                    reduced = route[:i] + route[i + 1:]
+                    delta, position = _insertion_costs(reduced, self.travel, np.array([node]))
+                    new_time = (
+                        route_length(reduced, self.travel) + self.visit[reduced].sum()
+                        + delta[0] + self.visit[node]
+                    )
+                    if new_time <= self.day_minutes + 1e-9:
+                        reduced.insert(int(position[0]) + 1, node)
+                        self.routes[d] = reduced
+                        self.routed[out], self.routed[j] = False, True
+                        self.spent += self.costs[j] - self.costs[out]
+                        self.refresh(d)
+                        return True
+        return False
+
+
+def plan_orienteering(
+    scores: Sequence[float],
+    costs: Sequence[float],
+    visit_minutes: Sequence[float],
+    travel: np.ndarray,
+    budget: float,
+    days: int,
+    day_minutes: float,
+    time_budget_ms: float = TIME_BUDGET_MS
+) -> List[List[int]]:
+    """
+    Select and route places for every day.
+    
+    Args:
+        scores: Score per candidate place
+        costs: Cost per candidate place
+        visit_minutes: Visit duration per candidate place
+        travel: Travel minutes between nodes; node 0 is the daily start,
+            candidate i is node i + 1
+        budget: Total trip budget
+        days: Number of days
+        day_minutes: Time budget per day (visits plus travel)
+        time_budget_ms: Wall-clock budget for local search and swaps
+    
+    Returns:
+        One list per day of candidate indices in visiting order (all empty
+        without candidates, budget or day time)
+    """
+    if len(scores) == 0 or budget <= 0 or day_minutes <= 0:
+        return [[] for _ in range(days)]
+    
+    deadline = time.perf_counter() + time_budget_ms / 1000
+    plan = _Plan(
+        np.asarray(scores, dtype=np.float64),
+        np.asarray(costs, dtype=np.float64),
+        np.asarray(visit_minutes, dtype=np.float64),
+        np.asarray(travel, dtype=np.float64),
+        budget, days, day_minutes
+    )
+    
+    plan.insert_all()
+    while time.perf_counter() < deadline:
+        plan.improve_routes()
+        plan.insert_all()
+        if not plan.try_swap(deadline):
+            break
+        plan.insert_all()
+    
+    return [[node - 1 for node in route[1:]] for route in plan.routes]
@@ -1,12 +1,14 @@
 """
 Place fetcher that aggregates places from multiple sources.
-Primary: Supabase database, Fallback: Mock data for testing.
+Primary: in-memory destination catalog, then Supabase database,
+Fallback: Mock data for testing.
 """
 from typing import List, Optional
 import sys
 from app.models.schemas import PlaceModel, PreferenceEnum
 from app.integrations.mock_data import get_mock_places
 from app.integrations.supabase_service import fetch_destinations_from_supabase
+from app.integrations.destination_catalog import get_destination_catalog
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -52,16 +54,24 @@ class PlaceFetcher:
             sys.stdout.flush()
             return PlaceFetcher._fetch_from_mock(preferences, limit)
         
-        # Try Supabase first
-        print(f"\n📡 Attempting Supabase fetch...", flush=True)
-        sys.stdout.flush()
-        places = fetch_destinations_from_supabase(
+        # Try the in-memory catalog first, Supabase until it has loaded
+        places = get_destination_catalog().fetch_places(
             preferences=[p.value for p in preferences],
             limit=limit,
             center_lat=center_lat,
             center_lon=center_lon,
             radius_km=radius_km
         )
+        if places is None:
+            print(f"\n📡 Catalog not loaded yet - attempting Supabase fetch...", flush=True)
+            sys.stdout.flush()
+            places = fetch_destinations_from_supabase(
+                preferences=[p.value for p in preferences],
+                limit=limit,
+                center_lat=center_lat,
+                center_lon=center_lon,
+                radius_km=radius_km
+            )
         
         print(f"📦 Supabase returned: {len(places) if places else 0} places", flush=True)
         sys.stdout.flush()
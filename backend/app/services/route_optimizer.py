@@ -1,29 +1,124 @@
 """
-Route optimization using Nearest Neighbor heuristic for Traveling Salesman Problem.
-Finds a feasible approximation to the optimal visiting order.
+Route optimization for the Traveling Salesman Problem.
+Small routes are solved exactly (Held-Karp); larger ones run anytime
+multi-start search under a deadline, or otherwise the Nearest Neighbor
+heuristic refined with 2-opt / Or-opt local search.
 """
-from typing import List, Tuple
-from app.models.schemas import PlaceModel
-from app.services.scoring_engine import haversine_distance
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+import numpy as np
+from app.models.schemas import PlaceModel, RouteImprovementReport
+from app.services.local_search import ANYTIME_MAX_STARTS, anytime_search, improve_route, route_length
+from app.services.exact_tsp import held_karp, MAX_EXACT_NODES
+from app.utils.geo import haversine_matrix, haversine_one_to_many
+from app.utils.distance_matrix import get_distance_matrix, road_minutes
+from app.utils.spatial_index import SpatialIndex
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Pool size per uvicorn worker process; keep ROUTE_WORKERS x uvicorn workers <= cores
+ROUTE_WORKERS = int(os.getenv("ROUTE_WORKERS", "2"))
+# Workers start from a clean interpreter: forking a server process that runs
+# threads (the request thread pool) can copy locks held by other threads
+ROUTE_POOL_START_METHOD = os.getenv("ROUTE_POOL_START_METHOD") or (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+_route_pool = None
+_route_pool_lock = threading.Lock()  # Requests are planned on a thread pool
+
+
+def _get_route_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared worker pool for per-day routing (created on first use)."""
+    global _route_pool
+    if ROUTE_WORKERS <= 1:
+        return None
+    with _route_pool_lock:
+        if _route_pool is None:
+            _route_pool = ProcessPoolExecutor(
+                max_workers=ROUTE_WORKERS,
+                mp_context=multiprocessing.get_context(ROUTE_POOL_START_METHOD)
+            )
+            atexit.register(_route_pool.shutdown, wait=False, cancel_futures=True)
+            logger.info(
+                f"Started route optimization pool with {ROUTE_WORKERS} workers "
+                f"({ROUTE_POOL_START_METHOD})"
+            )
+        return _route_pool
+
+
+def _reset_route_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next request starts a new one."""
+    global _route_pool
+    with _route_pool_lock:
+        if _route_pool is pool:
+            _route_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _optimize_day(
+    places: List[PlaceModel],
+    start_lat: Optional[float],
+    start_lon: Optional[float],
+    closed: bool
+) -> Tuple[float, List[int], Optional[RouteImprovementReport]]:
+    """
+    Optimize one day's route with a fixed work budget (runs in pool workers
+    or in-process).
+    
+    Search runs DAY_MAX_STARTS starts of at most DAY_MAX_ITERATIONS moves
+    each and no wall-clock limit, so the route depends only on the inputs,
+    not on load or on which process runs it. Workers read the catalog
+    matrix through their own memory map, so its pages are shared, not copied.
+    
+    Returns:
+        Tuple of (distance, visiting order as indices into places, report)
+    """
+    return RouteOptimizer.optimize_order(
+        places, start_lat, start_lon, closed=closed,
+        max_starts=RouteOptimizer.DAY_MAX_STARTS,
+        max_iterations=RouteOptimizer.DAY_MAX_ITERATIONS
+    )
+
 
 class RouteOptimizer:
     """
     Optimizes the visiting order of places to minimize total distance/time.
     
-    Uses Nearest Neighbor algorithm:
-    1. Start at a random/initial place
-    2. Find the nearest unvisited place
-    3. Move to that place
-    4. Repeat until all places visited
+    optimize_route picks the strategy by route size:
+    1. Up to EXACT_MAX_PLACES places: Held-Karp dynamic programming, optimal
+       in O(n² 2^n) time (cheap at this size)
+    2. Larger, with a deadline or a move budget: anytime multi-start search
+       (anytime_search), which builds routes from several starts, improves
+       each with 2-opt and Or-opt, and keeps the best found before the
+       deadline
+    3. Larger, without a deadline: Nearest Neighbor (greedy, O(n²); built on
+       a grid index from INDEXED_NN_MIN_PLACES places) refined by 2-opt /
+       Or-opt moves under a time/iteration budget (improve_route) when
+       IMPROVE_ROUTES is set
     
-    This is a greedy approximation that gives good results in O(n²) time.
-    Optimal solution would require exponential time (NP-hard problem).
+    calculate_route_distance is the plain Nearest Neighbor route, kept as the
+    baseline the improvement reports compare against.
     """
     
+    EXACT_MAX_PLACES = MAX_EXACT_NODES - 1  # Largest route solved exactly
+    IMPROVE_ROUTES = True  # Run local search on Nearest Neighbor routes
+    IMPROVEMENT_TIME_BUDGET_MS = 25  # Per-route wall-clock budget
+    IMPROVEMENT_MAX_ITERATIONS = 500  # Per-route cap on applied moves
+    NEIGHBOUR_LIST_SIZE = 8  # Candidate neighbours per place
+    PARALLEL_MIN_DAYS = 4  # Fewer days are routed in-process (pool overhead)
+    DAY_MAX_STARTS = 8  # Anytime starts per pooled day in optimize_days
+    DAY_MAX_ITERATIONS = 500  # Moves per start for pooled days (no clock, so routes are repeatable)
+    INDEXED_NN_MIN_PLACES = 1000  # Larger routes build NN on a grid index, not a matrix
+    INDEXED_NN_POINTS_PER_CELL = 4  # Target grid density for the indexed builder
+    
     @staticmethod
     def calculate_route_distance(
         places: List[PlaceModel],
@@ -33,6 +128,10 @@ class RouteOptimizer:
         """
         Optimize route using Nearest Neighbor algorithm.
         
+        Up to INDEXED_NN_MIN_PLACES places, NN runs as a masked argmin over
+        the distance matrix; larger sets (multi-city trips) use a grid index
+        with deletion instead, avoiding the O(n²) matrix.
+        
         Args:
             places: List of places to visit
             start_lat: Starting latitude (if None, uses first place)
@@ -47,46 +146,440 @@ class RouteOptimizer:
         if len(places) == 1:
             return 0.0, places
         
-        # Initialize starting point
-        if start_lat is None or start_lon is None:
-            current_lat, current_lon = places[0].latitude, places[0].longitude
-            unvisited = places[1:]
-            visited = [places[0]]
+        if len(places) >= RouteOptimizer.INDEXED_NN_MIN_PLACES:
+            total_distance, order = RouteOptimizer._nearest_neighbor_route_indexed(
+                places, start_lat, start_lon
+            )
+            logger.info(f"Optimized route: {len(order)} places, total distance: {total_distance:.2f} km")
+            return total_distance, [places[i] for i in order]
+        
+        dist, offset = RouteOptimizer.route_matrix(places, start_lat, start_lon)
+        route = RouteOptimizer._nearest_neighbor_route(dist)
+        total_distance = float(dist[route[:-1], route[1:]].sum())
+        visited = [places[node - offset] for node in route[offset:]]
+        
+        logger.info(f"Optimized route: {len(visited)} places, total distance: {total_distance:.2f} km")
+        
+        return total_distance, visited
+    
+    @staticmethod
+    def improve_route(
+        places: List[PlaceModel],
+        start_lat: float = None,
+        start_lon: float = None,
+        time_budget_ms: Optional[float] = None,
+        max_iterations: Optional[int] = None,
+        closed: bool = False
+    ) -> Tuple[float, List[PlaceModel], RouteImprovementReport]:
+        """
+        Refine a visiting order with 2-opt and Or-opt local search.
+        
+        Args:
+            places: Places in their current visiting order (e.g. Nearest Neighbor output)
+            start_lat: Starting latitude (if None, the first place stays first)
+            start_lon: Starting longitude (if None, the first place stays first)
+            closed: Whether the route returns to its start
+            time_budget_ms: Wall-clock budget (defaults to IMPROVEMENT_TIME_BUDGET_MS)
+            max_iterations: Move budget (defaults to IMPROVEMENT_MAX_ITERATIONS)
+        
+        Returns:
+            Tuple of (total_distance_km, improved_place_order, report)
+        """
+        if time_budget_ms is None:
+            time_budget_ms = RouteOptimizer.IMPROVEMENT_TIME_BUDGET_MS
+        if max_iterations is None:
+            max_iterations = RouteOptimizer.IMPROVEMENT_MAX_ITERATIONS
+        
+        dist, offset = RouteOptimizer.route_matrix(places, start_lat, start_lon)
+        route, report = improve_route(
+            list(range(len(places) + offset)), dist,
+            closed=closed,
+            time_budget_ms=time_budget_ms,
+            max_iterations=max_iterations,
+            neighbour_count=RouteOptimizer.NEIGHBOUR_LIST_SIZE
+        )
+        improved = [places[node - offset] for node in route[offset:]]
+        
+        if report.distance_saved > 0:
+            logger.info(
+                f"Improved route: {report.initial_distance:.2f} → {report.final_distance:.2f} km "
+                f"({report.two_opt_moves} 2-opt, {report.or_opt_moves} Or-opt, {report.elapsed_ms:.1f} ms)"
+            )
+        
+        return report.final_distance, improved, report
+    
+    @staticmethod
+    def optimize_route(
+        places: List[PlaceModel],
+        start_lat: float = None,
+        start_lon: float = None,
+        closed: bool = False,
+        deadline: Optional[float] = None,
+        max_starts: int = ANYTIME_MAX_STARTS,
+        max_iterations: Optional[int] = None
+    ) -> Tuple[float, List[PlaceModel], Optional[RouteImprovementReport]]:
+        """
+        Best available route for a set of places.
+        
+        Routes with at most EXACT_MAX_PLACES places are solved exactly with
+        Held-Karp. Larger ones run anytime multi-start search (up to
+        max_starts constructions, each refined by 2-opt / Or-opt) when a
+        deadline or a move budget is given, otherwise Nearest Neighbor
+        followed by 2-opt / Or-opt local search (when IMPROVE_ROUTES is
+        set), or plain Nearest Neighbor.
+        
+        Args:
+            places: Places to visit
+            start_lat: Starting latitude (if None, the first place stays first)
+            start_lon: Starting longitude (if None, the first place stays first)
+            closed: Whether the route returns to its start (tour) or ends at the last place (path)
+            deadline: time.perf_counter() value by which to return (None for no deadline)
+            max_starts: Constructions tried by anytime search
+            max_iterations: Moves per anytime start (None for no limit)
+        
+        Returns:
+            Tuple of (total_distance_km, ordered_places, report). The report
+            compares against the Nearest Neighbor route and is None when no
+            improvement stage ran.
+        """
+        distance, order, report = RouteOptimizer.optimize_order(
+            places, start_lat, start_lon, closed=closed, deadline=deadline,
+            max_starts=max_starts, max_iterations=max_iterations
+        )
+        return distance, [places[i] for i in order], report
+    
+    @staticmethod
+    def optimize_order(
+        places: List[PlaceModel],
+        start_lat: float = None,
+        start_lon: float = None,
+        closed: bool = False,
+        deadline: Optional[float] = None,
+        max_starts: int = ANYTIME_MAX_STARTS,
+        max_iterations: Optional[int] = None
+    ) -> Tuple[float, List[int], Optional[RouteImprovementReport]]:
+        """
+        Same as optimize_route, but returns the visiting order as indices
+        into places, so repeated place objects stay distinct stops.
+        
+        Returns:
+            Tuple of (total_distance_km, visiting order as indices into places, report)
+        """
+        if len(places) <= 1:
+            return 0.0, list(range(len(places))), None
+        
+        dist, offset = RouteOptimizer.route_matrix(places, start_lat, start_lon)
+        if len(places) >= RouteOptimizer.INDEXED_NN_MIN_PLACES:
+            _, order = RouteOptimizer._nearest_neighbor_route_indexed(places, start_lat, start_lon)
+            nn_route = [0] * offset + [i + offset for i in order]
         else:
-            current_lat, current_lon = start_lat, start_lon
-            unvisited = places.copy()
-            visited = []
+            nn_route = RouteOptimizer._nearest_neighbor_route(dist)
+        nn_distance = route_length(nn_route, dist, closed)
+        
+        if len(places) <= RouteOptimizer.EXACT_MAX_PLACES:
+            started = time.perf_counter()
+            distance, route = held_karp(dist, closed=closed)
+            report = RouteImprovementReport(
+                method="held_karp",
+                initial_distance=nn_distance,
+                final_distance=distance,
+                distance_saved=max(nn_distance - distance, 0.0),
+                elapsed_ms=(time.perf_counter() - started) * 1000
+            )
+            return distance, [node - offset for node in route[offset:]], report
+        
+        if deadline is not None or max_iterations is not None:
+            route, report = anytime_search(
+                dist, closed=closed, deadline=deadline, max_starts=max_starts,
+                neighbour_count=RouteOptimizer.NEIGHBOUR_LIST_SIZE, max_iterations=max_iterations
+            )
+            return report.final_distance, [node - offset for node in route[offset:]], report
+        
+        if not RouteOptimizer.IMPROVE_ROUTES:
+            return nn_distance, [node - offset for node in nn_route[offset:]], None
+        
+        # Local search over the matrix in Nearest Neighbor order (node 0 stays first)
+        route, report = improve_route(
+            list(range(len(nn_route))), dist[np.ix_(nn_route, nn_route)],
+            closed=closed,
+            time_budget_ms=RouteOptimizer.IMPROVEMENT_TIME_BUDGET_MS,
+            max_iterations=RouteOptimizer.IMPROVEMENT_MAX_ITERATIONS,
+            neighbour_count=RouteOptimizer.NEIGHBOUR_LIST_SIZE
+        )
+        return report.final_distance, [nn_route[node] - offset for node in route[offset:]], report
+    
+    @staticmethod
+    def repair_route(
+        places: List[PlaceModel],
+        start_lat: float = None,
+        start_lon: float = None,
+        time_budget_ms: Optional[float] = None
+    ) -> Tuple[float, List[PlaceModel], Optional[RouteImprovementReport]]:
+        """
+        Re-optimize a route after a local edit (insertion or removal).
+        
+        Small routes are re-solved exactly; larger ones keep the edited
+        order as the starting point for local search, so the rest of the
+        day is disturbed as little as possible.
+        
+        Args:
+            places: Places in their edited visiting order
+            start_lat: Starting latitude (if None, the first place stays first)
+            start_lon: Starting longitude (if None, the first place stays first)
+            time_budget_ms: Local search budget (defaults to IMPROVEMENT_TIME_BUDGET_MS)
+        
+        Returns:
+            Tuple of (total_distance_km, ordered_places, report)
+        """
+        if len(places) <= RouteOptimizer.EXACT_MAX_PLACES:
+            return RouteOptimizer.optimize_route(places, start_lat, start_lon)
+        return RouteOptimizer.improve_route(places, start_lat, start_lon, time_budget_ms=time_budget_ms)
+    
+    @staticmethod
+    def cheapest_insertion(
+        places: List[PlaceModel],
+        place: PlaceModel,
+        start_lat: float = None,
+        start_lon: float = None
+    ) -> Tuple[float, int]:
+        """
+        Cheapest position to insert a place into an open route.
+        
+        Returns:
+            Tuple of (added_distance_km, index in places to insert at)
+        """
+        if not places and (start_lat is None or start_lon is None):
+            return 0.0, 0
+        
+        dist, offset = RouteOptimizer.route_matrix(places + [place], start_lat, start_lon)
+        new = dist.shape[0] - 1
+        route = list(range(new))
+        # Insert after route node i: edge (i, i+1) is replaced by (i, new) + (new, i+1)
+        added = dist[route, new].copy()
+        added[:-1] += dist[new, route[1:]] - dist[route[:-1], route[1:]]
+        if offset == 0:
+            # Without a start point the first place may also be preceded by the new one
+            front = dist[new, 0]
+            best = int(np.argmin(added))
+            if front < added[best]:
+                return float(front), 0
+            return float(added[best]), best + 1
+        best = int(np.argmin(added))
+        return float(added[best]), best
+    
+    @staticmethod
+    def route_matrix(
+        places: List[PlaceModel],
+        start_lat: float = None,
+        start_lon: float = None
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Distance matrix over route nodes.
+        
+        Node 0 is the starting point. With start coordinates it is an extra
+        node and place i is node i + 1; without them place 0 is the start.
+        
+        Returns:
+            Tuple of (distance_matrix, offset) where place i is node i + offset
+        """
+        dist = RouteOptimizer.pairwise_distances(places)
+        if start_lat is None or start_lon is None:
+            return dist, 0
+        
+        start = haversine_one_to_many(
+            start_lat, start_lon,
+            [place.latitude for place in places],
+            [place.longitude for place in places]
+        )
+        full = np.zeros((len(places) + 1, len(places) + 1))
+        full[1:, 1:] = dist
+        full[0, 1:] = start
+        full[1:, 0] = start
+        return full, 1
+    
+    @staticmethod
+    def travel_matrix(
+        places: List[PlaceModel],
+        start_lat: float = None,
+        start_lon: float = None
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Travel time matrix (minutes) over route nodes, laid out like route_matrix.
+        
+        Reads the precomputed catalog travel times when every place is in the
+        catalog matrix at its current coordinates; otherwise, and for legs from the start point, uses
+        road-adjusted distance at average speed.
+        
+        Returns:
+            Tuple of (travel_minutes, offset) where place i is node i + offset
+        """
+        catalog = get_distance_matrix()
+        minutes = None
+        if catalog is not None:
+            minutes = catalog.travel_submatrix(
+                [place.id for place in places],
+                [(place.latitude, place.longitude) for place in places]
+            )
+        if minutes is None:
+            minutes = road_minutes(RouteOptimizer.pairwise_distances(places))
+        if start_lat is None or start_lon is None:
+            return minutes, 0
         
-        total_distance = 0.0
+        start = road_minutes(haversine_one_to_many(
+            start_lat, start_lon,
+            [place.latitude for place in places],
+            [place.longitude for place in places]
+        ))
+        full = np.zeros((len(places) + 1, len(places) + 1))
+        full[1:, 1:] = minutes
+        full[0, 1:] = start
+        full[1:, 0] = start
+        return full, 1
+    
+    @staticmethod
+    def _nearest_neighbor_route(dist: np.ndarray) -> List[int]:
+        """Nearest Neighbor route over a node matrix, starting at node 0."""
+        unvisited = np.ones(dist.shape[0], dtype=bool)
+        unvisited[0] = False
+        route = [0]
         
-        # Nearest Neighbor algorithm
-        while unvisited:
-            # Find nearest unvisited place
-            nearest_place = None
-            min_distance = float('inf')
+        while len(route) < dist.shape[0]:
+            # Find nearest unvisited node (masked argmin over the distance row)
+            nearest = int(np.argmin(np.where(unvisited, dist[route[-1]], np.inf)))
+            unvisited[nearest] = False
+            route.append(nearest)
             
-            for place in unvisited:
-                distance = haversine_distance(
-                    current_lat, current_lon,
-                    place.latitude, place.longitude
+            logger.debug(f"Route step: node {nearest} (distance: {dist[route[-2], nearest]:.2f} km)")
+        
+        return route
+    
+    @staticmethod
+    def _nearest_neighbor_route_indexed(
+        places: List[PlaceModel],
+        start_lat: float = None,
+        start_lon: float = None
+    ) -> Tuple[float, List[int]]:
+        """
+        Nearest Neighbor route built on a grid spatial index.
+        
+        Each step is a k=1 nearest query around the current place, after
+        which the place is removed from the index; a query only touches
+        nearby cells, so construction is roughly O(n log n).
+        
+        Returns:
+            Tuple of (total_distance_km, visiting order as indices into places)
+        """
+        lats = np.array([place.latitude for place in places])
+        lons = np.array([place.longitude for place in places])
+        area = max(float(np.ptp(lats) * np.ptp(lons)), 1e-6)
+        cell_deg = float(np.clip(
+            np.sqrt(area * RouteOptimizer.INDEXED_NN_POINTS_PER_CELL / len(places)), 0.01, 1.0
+        ))
+        
+        index = SpatialIndex(cell_deg)
+        for i in range(len(places)):
+            index.insert(lats[i], lons[i], i)
+        
+        if start_lat is None or start_lon is None:
+            current, total_distance = 0, 0.0
+        else:
+            total_distance, current = index.nearest(start_lat, start_lon)[0]
+        index.remove(current)
+        order = [current]
+        
+        while len(index):
+            distance, current = index.nearest(lats[current], lons[current])[0]
+            index.remove(current)
+            order.append(current)
+            total_distance += distance
+        
+        return total_distance, order
+    
+    @staticmethod
+    def pairwise_distances(places: List[PlaceModel]) -> np.ndarray:
+        """
+        Pairwise distance matrix (km) for places.
+        
+        Reads from the precomputed catalog matrix when every place is in it
+        at its current coordinates, otherwise computes great circle
+        distances directly.
+        """
+        catalog = get_distance_matrix()
+        if catalog is not None:
+            dist = catalog.submatrix(
+                [place.id for place in places],
+                [(place.latitude, place.longitude) for place in places]
+            )
+            if dist is not None:
+                return dist
+        
+        lats = [place.latitude for place in places]
+        lons = [place.longitude for place in places]
+        return haversine_matrix(lats, lons)
+    
+    @staticmethod
+    def optimize_days(
+        daily_place_lists: List[List[PlaceModel]],
+        start_lat: float = None,
+        start_lon: float = None,
+        closed: bool = False,
+        time_budget_ms: Optional[float] = None
+    ) -> List[Tuple[float, List[PlaceModel], Optional[RouteImprovementReport]]]:
+        """
+        Optimize every day's route, fanning days out to the shared process
+        pool when there are at least PARALLEL_MIN_DAYS of them.
+        
+        Pooled days run a fixed work budget (_optimize_day) and come back
+        in day order, so their routes depend neither on pool scheduling nor
+        on load, and are the same when the pool is unavailable and they run
+        in-process instead. Fewer days are routed in-process as anytime
+        search under the time budget, so those routes can vary with load
+        when the budget runs out (their reports say so). A broken pool is
+        replaced so later requests get a fresh one.
+        
+        Args:
+            daily_place_lists: List of place lists for each day
+            start_lat: Daily starting latitude (if None, each day starts at its first place)
+            start_lon: Daily starting longitude (if None, each day starts at its first place)
+            closed: Whether each route returns to its start
+            time_budget_ms: Wall-clock budget shared by in-process days (None
+                for no limit); pooled days are bounded by moves instead
+        
+        Returns:
+            List of (distance, optimized_places, report) tuples for each day
+        """
+        days = [i for i, places in enumerate(daily_place_lists) if places]
+        results = [(0.0, [], None) for _ in daily_place_lists]
+        if not days:
+            return results
+        
+        tasks = [(daily_place_lists[i], start_lat, start_lon, closed) for i in days]
+        if len(days) >= RouteOptimizer.PARALLEL_MIN_DAYS:
+            outputs = None
+            pool = _get_route_pool()
+            if pool is not None:
+                try:
+                    outputs = list(pool.map(_optimize_day, *zip(*tasks)))
+                except BrokenProcessPool as e:
+                    logger.warning(f"Route optimization pool broke, replacing it: {e}")
+                    _reset_route_pool(pool)
+                except Exception as e:
+                    logger.warning(f"Parallel route optimization failed, routing in-process: {e}")
+            if outputs is None:
+                outputs = [_optimize_day(*task) for task in tasks]
+        else:
+            deadline = None if time_budget_ms is None else time.perf_counter() + time_budget_ms / 1000
+            outputs = [
+                RouteOptimizer.optimize_order(
+                    *task, deadline=deadline, max_starts=RouteOptimizer.DAY_MAX_STARTS
                 )
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest_place = place
-            
-            # Move to nearest place
-            if nearest_place:
-                visited.append(nearest_place)
-                total_distance += min_distance
-                current_lat = nearest_place.latitude
-                current_lon = nearest_place.longitude
-                unvisited.remove(nearest_place)
-                
-                logger.debug(f"Route step: {nearest_place.name} (distance: {min_distance:.2f} km)")
+                for task in tasks
+            ]
         
-        logger.info(f"Optimized route: {len(visited)} places, total distance: {total_distance:.2f} km")
+        for i, (distance, order, report) in zip(days, outputs):
+            results[i] = (distance, [daily_place_lists[i][j] for j in order], report)
         
-        return total_distance, visited
+        return results
     
     @staticmethod
     def optimize_multi_day_routes(
@@ -101,10 +594,7 @@ class RouteOptimizer:
         Returns:
             List of (distance, optimized_places) tuples for each day
         """
-        optimized_days = []
-        
-        for day_places in daily_place_lists:
-            distance, optimized = RouteOptimizer.calculate_route_distance(day_places)
-            optimized_days.append((distance, optimized))
-        
-        return optimized_days
+        return [
+            (distance, optimized)
+            for distance, optimized, _ in RouteOptimizer.optimize_days(daily_place_lists)
+        ]
@@ -2,28 +2,16 @@
 Scoring engine for ranking and evaluating places.
 Uses rule-based logic with weighted factors.
 """
-from typing import List, Tuple
+from typing import Iterator, List
+import numpy as np
 from app.models.schemas import PlaceModel, PreferenceEnum
 from app.config import settings
 from app.utils.logger import get_logger
-from math import radians, cos, sin, asin, sqrt
+from app.utils.geo import haversine_distance, haversine_one_to_many
 
 logger = get_logger(__name__)
 
 
-def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """
-    Calculate great circle distance between two points on earth (in kilometers).
-    """
-    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    c = 2 * asin(sqrt(a))
-    km = 6371 * c
-    return km
-
-
 class ScoringEngine:
     """
     Scores places based on multiple factors:
@@ -33,6 +21,8 @@ class ScoringEngine:
     - Distance: Proximity to center location (closer is better)
     """
     
+    RANK_CHUNK_SIZE = 32  # First batch pulled by the lazy ranking iterator
+    
     def __init__(self):
         """Initialize scoring weights from configuration."""
         self.rating_weight = settings.RATING_WEIGHT
@@ -99,33 +89,117 @@ class ScoringEngine:
         
         return min(composite_score, 100)  # Cap at 100
     
-    def score_and_rank_places(
+    def score_columns(
+        self,
+        ratings: np.ndarray,
+        reviews: np.ndarray,
+        preference_match: np.ndarray,
+        distances_km: np.ndarray,
+        max_distance_km: float = 50
+    ) -> np.ndarray:
+        """
+        Composite scores over columnar place attributes.
+        
+        Same formula as calculate_place_score, evaluated for every place at
+        once.
+        
+        Args:
+            ratings: Ratings (0-5)
+            reviews: Review counts
+            preference_match: Boolean array, True where the category is preferred
+            distances_km: Distances to the center in kilometers
+            max_distance_km: Maximum distance to consider
+        
+        Returns:
+            Array of scores between 0 and 100
+        """
+        rating_score = ratings / 5.0 * 100
+        preference_score = np.where(preference_match, 1.0, 0.5) * 100
+        popularity_score = np.minimum(reviews / 1000, 1.0) * 100
+        distance_score = np.where(
+            distances_km <= max_distance_km,
+            (max_distance_km - distances_km) / max_distance_km * 100,
+            0.0
+        )
+        
+        composite_score = (
+            rating_score * self.rating_weight +
+            preference_score * self.preference_weight +
+            popularity_score * self.popularity_weight +
+            distance_score * self.distance_weight
+        )
+        return np.minimum(composite_score, 100)
+    
+    def score_places(
         self,
         places: List[PlaceModel],
         user_preferences: List[PreferenceEnum],
         center_lat: float,
-        center_lon: float
-    ) -> List[Tuple[PlaceModel, float]]:
+        center_lon: float,
+        max_distance_km: float = 50
+    ) -> np.ndarray:
         """
-        Score all places and return sorted by score (descending).
+        Score a whole candidate set in one vectorized pass.
         
         Args:
             places: List of places to score
             user_preferences: User's preferred categories
             center_lat: Center latitude
             center_lon: Center longitude
+            max_distance_km: Maximum distance to consider
         
         Returns:
-            List of (place, score) tuples sorted by score descending
+            Array of scores, aligned with places
+        """
+        count = len(places)
+        ratings = np.fromiter((place.rating for place in places), dtype=np.float64, count=count)
+        reviews = np.fromiter((place.reviews for place in places), dtype=np.float64, count=count)
+        preference_match = np.fromiter(
+            (place.category in user_preferences for place in places), dtype=bool, count=count
+        )
+        distances = haversine_one_to_many(
+            center_lat, center_lon,
+            [place.latitude for place in places],
+            [place.longitude for place in places]
+        )
+        return self.score_columns(ratings, reviews, preference_match, distances, max_distance_km)
+    
+    @staticmethod
+    def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Indices of the k highest scores, descending (ties keep input order).
+        
+        Uses a partition to find the cut-off score, so only the k winners
+        are sorted: O(n + k log k) instead of O(n log n).
         """
-        scored_places = [
-            (place, self.calculate_place_score(place, user_preferences, center_lat, center_lon))
-            for place in places
-        ]
+        n = len(scores)
+        if k >= n:
+            return np.argsort(-scores, kind="stable")
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
         
-        # Sort by score descending
-        scored_places.sort(key=lambda x: x[1], reverse=True)
+        threshold = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > threshold)
+        tied = np.flatnonzero(scores == threshold)[:k - len(above)]
+        chosen = np.concatenate((above, tied))
+        return chosen[np.lexsort((chosen, -scores[chosen]))]
+    
+    def iter_ranked(self, scores: np.ndarray, chunk_size: int = None) -> Iterator[int]:
+        """
+        Lazily yield indices by score descending (same order as a full sort).
         
-        logger.info(f"Ranked {len(scored_places)} places by score")
+        Candidates are pulled in top-k chunks that double in size, so a
+        consumer that stops early never pays for sorting the rest.
         
-        return scored_places
+        Args:
+            scores: Score per place
+            chunk_size: Size of the first chunk (defaults to RANK_CHUNK_SIZE)
+        """
+        k = chunk_size or self.RANK_CHUNK_SIZE
+        remaining = np.arange(len(scores))
+        while len(remaining):
+            # remaining stays in input order, so ties still resolve by index
+            top = self.top_k_indices(scores[remaining], k)
+            yield from remaining[top].tolist()
+            remaining = np.delete(remaining, top)
+            k *= 2
@@ -0,0 +1,161 @@
+"""
+Day scheduling with opening-hours time windows (VRPTW).
+
+Each trip day is a vehicle that leaves the start node (node 0 of the travel
+matrix) at DAY_START_MINUTES and must finish its last visit by
+DAY_END_MINUTES. A visit can only start inside one of the place's opening
+intervals and must end before that interval closes; arriving early means
+waiting for opening.
+
+Heuristic, starting from the distance-optimized day routes:
+1. Per day, re-insert the route's stops in order, each at its cheapest
+   position that keeps every visit inside its window; stops that fit
+   nowhere (closed, or not reachable before closing) are set aside
+2. Re-insert dropped stops at the cheapest position, on any day, that keeps
+   the whole day feasible (time-window insertion)
+3. Stops that fit nowhere are reported as dropped
+"""
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from app.utils.opening_hours import ALWAYS_OPEN
+
+DAY_START_MINUTES = 9 * 60  # Departure from the start node each day
+DAY_END_MINUTES = 21 * 60  # Latest end of the last visit each day
+
+Windows = Sequence[Optional[Sequence[Tuple[int, int]]]]
+
+
+def visit_start(arrival: float, service: float, intervals: Optional[Sequence[Tuple[int, int]]]) -> Optional[float]:
+    """
+    Earliest time a visit arriving at `arrival` can start.
+    
+    Args:
+        arrival: Arrival minute of day
+        service: Visit duration in minutes
+        intervals: Sorted (open, close) minute pairs, or None if unconstrained
+    
+    Returns:
+        Start minute, or None if no interval fits the whole visit
+    """
+    for opening, close in intervals if intervals is not None else ALWAYS_OPEN:
+        start = max(arrival, opening)
+        if start + service <= close:
+            return start
+    return None
+
+
+def schedule_route(
+    route: Sequence[int],
+    travel: np.ndarray,
+    service: Sequence[float],
+    windows: Windows,
+    day_start: float = DAY_START_MINUTES,
+    day_end: float = DAY_END_MINUTES
+) -> Optional[List[Tuple[float, float]]]:
+    """
+    Arrival and visit start times along a route.
+    
+    Args:
+        route: Nodes in visiting order (node 0 is the start and is implicit)
+        travel: Travel minutes between nodes
+        service: Visit minutes per node
+        windows: Opening intervals per node
+        day_start: Departure minute from node 0
+        day_end: Latest end of the last visit
+    
+    Returns:
+        (arrival, start) per stop, or None if any stop misses its window
+    """
+    schedule = []
+    clock, previous = day_start, 0
+    for node in route:
+        arrival = clock + travel[previous, node]
+        start = visit_start(arrival, service[node], windows[node])
+        if start is None or start + service[node] > day_end:
+            return None
+        schedule.append((arrival, start))
+        clock, previous = start + service[node], node
+    return schedule
+
+
+def _feasible_insertion(
+    route: List[int],
+    node: int,
+    travel: np.ndarray,
+    service: Sequence[float],
+    windows: Windows,
+    day_start: float,
+    day_end: float
+) -> Optional[Tuple[float, int]]:
+    """Cheapest (added_travel, index) insertion keeping the route feasible, or None."""
+    best = None
+    path = [0] + route
+    for index in range(len(route) + 1):
+        before = path[index]
+        added = travel[before, node]
+        if index < len(route):
+            added += travel[node, route[index]] - travel[before, route[index]]
+        if best is not None and added >= best[0]:
+            continue
+        candidate = route[:index] + [node] + route[index:]
+        if schedule_route(candidate, travel, service, windows, day_start, day_end) is not None:
+            best = (float(added), index)
+    return best
+
+
+def schedule_days(
+    routes: List[List[int]],
+    travel: np.ndarray,
+    service: Sequence[float],
+    windows: Windows,
+    day_start: float = DAY_START_MINUTES,
+    day_end: float = DAY_END_MINUTES
+) -> Tuple[List[List[int]], List[List[Tuple[float, float]]], List[int]]:
+    """
+    Make day routes respect opening hours, moving or dropping stops as needed.
+    
+    Args:
+        routes: Day routes as node lists in visiting order (node 0 excluded)
+        travel: Travel minutes between nodes (node 0 is the daily start)
+        service: Visit minutes per node
+        windows: Opening intervals per node (None where unconstrained)
+        day_start: Departure minute from node 0 each day
+        day_end: Latest end of the last visit each day
+    
+    Returns:
+        Tuple of (feasible routes, (arrival, start) schedule per route,
+        dropped nodes that fit on no day)
+    """
+    routes = [list(route) for route in routes]
+    dropped = []
+    
+    # 1. Rebuild each day from its own stops in route order, each at its
+    #    cheapest feasible position; stops that fit nowhere are set aside
+    for d, route in enumerate(routes):
+        kept = []
+        for node in route:
+            option = _feasible_insertion(kept, node, travel, service, windows, day_start, day_end)
+            if option is None:
+                dropped.append(node)
+            else:
+                kept.insert(option[1], node)
+        routes[d] = kept
+    
+    # 2. Time-window insertion of dropped stops into any day
+    unplaced = []
+    for node in dropped:
+        options = []
+        for d, route in enumerate(routes):
+            option = _feasible_insertion(route, node, travel, service, windows, day_start, day_end)
+            if option is not None:
+                options.append((option, d))
+        if not options:
+            unplaced.append(node)
+            continue
+        (_, index), d = min(options)
+        routes[d].insert(index, node)
+    
+    schedules = [
+        schedule_route(route, travel, service, windows, day_start, day_end) for route in routes
+    ]
+    return routes, schedules, unplaced
@@ -2,23 +2,60 @@
 Main trip planning orchestrator service.
 Integrates all components to generate optimized itineraries.
 """
-from typing import List, Tuple
-from datetime import datetime, timedelta, date
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta, date, time as clock_time
 from app.models.schemas import (
-    ItineraryItemRequest, PlaceModel, DayItinerary, TripItineraryResponse, PreferenceEnum
+    ItineraryItemRequest, PlaceModel, DayItinerary, TripItineraryResponse, PreferenceEnum,
+    PlanningReport, RouteImprovementReport, ItineraryEditRequest, EditOperationEnum, StopSchedule
 )
 from app.services.place_fetcher import PlaceFetcher
 from app.services.scoring_engine import ScoringEngine
 from app.services.route_optimizer import RouteOptimizer
+from app.services.knapsack_selector import select_knapsack, TIME_CAP_MS
+from app.services.orienteering import plan_orienteering, TIME_BUDGET_MS
+from app.services.day_clustering import (
+    balanced_kmeans, extend_clusters, order_clusters, project_km, CAPACITY_SLACK
+)
+from app.services.time_windows import schedule_days, DAY_START_MINUTES
+from app.services.local_search import route_length
 from app.services.weather_service import WeatherService
+from app.services.itinerary_cache import get_itinerary_cache
 from app.integrations.geocoding_service import get_city_coordinates
+from app.integrations.geocode_cache import normalize_place_name
+from app.integrations.destination_catalog import get_destination_catalog
 from app.config import settings
 from app.utils.logger import get_logger
+import numpy as np
+import hashlib
+import json
+import threading
+import time
 import uuid
 
 logger = get_logger(__name__)
 
 
+class _PlanState:
+    """Scored candidates and the itinerary of a staged plan, kept for reuse."""
+    
+    def __init__(
+        self,
+        itinerary: TripItineraryResponse,
+        places: List[PlaceModel],
+        scores: np.ndarray,
+        geocoded_city: Optional[str],
+        center_lat: float,
+        center_lon: float
+    ):
+        self.itinerary = itinerary
+        self.places = places
+        self.scores = scores
+        self.geocoded_city = geocoded_city
+        self.center_lat = center_lat
+        self.center_lon = center_lon
+
+
 class TripPlanningService:
     """
     Orchestrates the complete trip planning workflow:
@@ -27,14 +64,72 @@ class TripPlanningService:
     3. Select feasible set considering budget and time
     4. Optimize visiting order
     5. Generate day-wise itinerary
+    
+    Place selection runs on one of SELECTION_ENGINES: "knapsack" (best
+    score under budget and time, warm-started from greedy) or "greedy"
+    (score order while budget and time allow).
+    
+    Planning runs on one of ENGINES: "staged" (steps 3-5 above, one after
+    another) or "orienteering" (selection, day assignment and routing
+    solved together, with travel minutes counted against each day).
+    
+    Routing runs in one of ROUTING_MODES: "distance" (shortest day routes)
+    or "time_windows" (routes also respect each place's opening hours,
+    with per-stop arrival times; visits that fit no day are dropped).
+    
+    Staged plans are remembered (per destination catalog version) by
+    everything except end date and budget, so a follow-up request that
+    only changes those reuses the geocode, candidates and scores and
+    re-routes only the days that changed.
+    
+    Finished plans are also cached by canonical request (dates, budget
+    rounded down to RESPONSE_BUDGET_BUCKET, preferences, normalized city or
+    rounded coordinates, engines, latency budget) for the current
+    destination catalog version, in memory and on disk. A repeated request
+    gets a copy of the cached plan with a new trip_id, as long as it fits
+    the budget.
     """
     
-    def __init__(self):
-        """Initialize service components."""
+    SELECTION_ENGINES = ("knapsack", "greedy")
+    SELECTION_ENGINE = "knapsack"  # Default place selection engine
+    ENGINES = ("staged", "orienteering")
+    ENGINE = "staged"  # Default planning engine
+    ROUTING_MODES = ("distance", "time_windows")
+    ROUTING_MODE = "distance"  # Default routing mode
+    LATENCY_BUDGET_MS = 300  # Default planning deadline per request
+    SELECTION_BUDGET_SHARE = 0.25  # Share of the remaining budget for knapsack search
+    ORIENTEERING_BUDGET_SHARE = 0.5  # Share of the remaining budget for orienteering
+    ORIENTEERING_DAY_MINUTES = 8 * 60  # Visits plus travel per orienteering day
+    TRIP_CACHE_SIZE = 256  # Recent plans kept for edits by trip_id
+    EDIT_ROUTE_BUDGET_MS = 20  # Local repair budget per edited day
+    RESPONSE_BUDGET_BUCKET = 500  # Budgets in one bucket share a cached plan (₹)
+    COORD_GRID_DEG = 0.01  # Coordinates rounded to this grid in plan cache keys
+    
+    def __init__(self, selection_engine: str = None, engine: str = None):
+        """
+        Initialize service components.
+        
+        Args:
+            selection_engine: One of SELECTION_ENGINES (defaults to SELECTION_ENGINE)
+            engine: One of ENGINES (defaults to ENGINE); requests may override it
+        """
+        selection_engine = selection_engine or self.SELECTION_ENGINE
+        if selection_engine not in self.SELECTION_ENGINES:
+            raise ValueError(f"Unknown selection engine: {selection_engine}")
+        engine = engine or self.ENGINE
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown planning engine: {engine}")
+        self.selection_engine = selection_engine
+        self.engine = engine
         self.place_fetcher = PlaceFetcher()
         self.scoring_engine = ScoringEngine()
         self.route_optimizer = RouteOptimizer()
         self.weather_service = WeatherService()
+        # trip_id -> (itinerary, candidate places by id), most recent last
+        self._trips: "OrderedDict[str, Tuple[TripItineraryResponse, Dict[str, PlaceModel]]]" = OrderedDict()
+        # Reuse key (request minus end date and budget) -> plan state, most recent last
+        self._plans: "OrderedDict[tuple, _PlanState]" = OrderedDict()
+        self._lock = threading.Lock()  # Requests are planned on a thread pool
     
     def plan_trip(self, request: ItineraryItemRequest) -> TripItineraryResponse:
         """
@@ -45,12 +140,17 @@ class TripPlanningService:
         2. Calculate trip parameters (duration, daily budget)
         3. Fetch places matching preferences
         4. Score places using multi-factor scoring
-        5. Select optimal set respecting budget constraints (greedy algorithm)
-        6. Distribute places across days
+        5. Select optimal set respecting budget and time (knapsack or greedy)
+        6. Distribute places across days (capacitated geographic clustering)
         7. Optimize route within each day (nearest neighbor TSP)
         8. Adjust for weather
         9. Generate day-wise itinerary
         
+        Planning runs against a latency budget (request.latency_budget_ms,
+        default LATENCY_BUDGET_MS): search stages get a share of the time
+        left, and larger daily routes run anytime search that returns the
+        best route found when their slice runs out.
+        
         Args:
             request: Trip planning request with dates, budget, preferences, city_name
         
@@ -60,6 +160,38 @@ class TripPlanningService:
         trip_id = str(uuid.uuid4())
         logger.info(f"Starting trip planning: {trip_id}")
         
+        started = time.perf_counter()
+        latency_budget_ms = request.latency_budget_ms or self.LATENCY_BUDGET_MS
+        deadline = started + latency_budget_ms / 1000
+        
+        engine = request.engine or self.engine
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown planning engine: {engine}")
+        routing_mode = request.routing_mode or self.ROUTING_MODE
+        if routing_mode not in self.ROUTING_MODES:
+            raise ValueError(f"Unknown routing mode: {routing_mode}")
+        
+        # Same canonical request as a cached plan on the current catalog?
+        catalog_version = self._catalog_version()
+        response_key = None
+        if catalog_version is not None:
+            response_key = self._response_key(request, engine, routing_mode, latency_budget_ms)
+            cached = get_itinerary_cache().get(response_key, catalog_version)
+            if cached is not None and cached[0].total_estimated_cost <= request.budget:
+                return self._serve_cached(cached, trip_id, started)
+        
+        # Near-duplicate of a recent plan (only end_date / budget changed)?
+        reuse_key = self._reuse_key(request, engine, routing_mode, catalog_version)
+        prior = self._recall_plan(reuse_key) if engine == "staged" else None
+        if prior is not None:
+            itinerary = self._replan_incremental(
+                request, prior, reuse_key, trip_id, started, deadline, latency_budget_ms,
+                time_windows=routing_mode == "time_windows"
+            )
+            if response_key is not None:
+                get_itinerary_cache().put(response_key, catalog_version, itinerary, prior.places)
+            return itinerary
+        
         # Step 0: Geocode city name to get coordinates (NEW)
         center_lat = None
         center_lon = None
@@ -123,69 +255,654 @@ class TripPlanningService:
                 algorithm_explanation="No places found for the given preferences."
             )
         
-        # Step 3: Score and rank places (using geocoded coordinates)
-        scored_places = self.scoring_engine.score_and_rank_places(
-            places, request.preferences, center_lat, center_lon
-        )
+        if engine == "orienteering":
+            # Steps 3-5 in one pass: selection, day assignment and routing
+            selected_places, daily_places = self._plan_orienteering(
+                places, request.preferences, daily_budget * total_days,
+                total_days, center_lat, center_lon,
+                time_budget_ms=min(
+                    TIME_BUDGET_MS, self._remaining_ms(deadline) * self.ORIENTEERING_BUDGET_SHARE
+                )
+            )
+            selection_method = "orienteering"
+        else:
+            # Step 3: Score places (using geocoded coordinates)
+            scores = self.scoring_engine.score_places(
+                places, request.preferences, center_lat, center_lon
+            )
+            
+            # Step 4: Select optimal set of places
+            selected_places, selection_method = self._select_places(
+                places, scores, daily_budget * total_days, total_days, deadline
+            )
+            
+            logger.info(f"Selected {len(selected_places)} places for trip")
+            
+            # Step 5: Distribute places across days
+            daily_places = self._distribute_places_across_days(
+                selected_places, total_days, center_lat, center_lon
+            )
         
-        # Step 4: Select optimal set of places (greedy selection)
-        selected_places = self._select_places_greedy(
-            scored_places, daily_budget * total_days, total_days
+        # Step 6 & 7: Optimize routes and adjust for weather
+        daily_itineraries = self._generate_daily_itineraries(
+            daily_places, start_date, center_lat, center_lon, deadline,
+            time_windows=routing_mode == "time_windows"
         )
         
-        logger.info(f"Selected {len(selected_places)} places for trip")
-        
-        # Step 5: Distribute places across days
-        daily_places = self._distribute_places_across_days(
-            selected_places, total_days
+        itinerary = self._finish_plan(
+            trip_id, request, daily_itineraries, selected_places, places,
+            selection_method, geocoded_city, center_lat, center_lon,
+            started, latency_budget_ms
         )
+        if engine == "staged":
+            self._remember_plan(
+                reuse_key, itinerary, places, scores, geocoded_city, center_lat, center_lon
+            )
+        if response_key is not None:
+            get_itinerary_cache().put(response_key, catalog_version, itinerary, places)
         
-        # Step 6 & 7: Optimize routes and adjust for weather
-        daily_itineraries = self._generate_daily_itineraries(
-            daily_places, start_date, center_lat, center_lon
-        )
+        return itinerary
+    
+    def _finish_plan(
+        self,
+        trip_id: str,
+        request: ItineraryItemRequest,
+        daily_itineraries: List[DayItinerary],
+        selected_places: List[PlaceModel],
+        places: List[PlaceModel],
+        selection_method: str,
+        geocoded_city: Optional[str],
+        center_lat: float,
+        center_lon: float,
+        started: float,
+        latency_budget_ms: float,
+        reuse_info: str = ""
+    ) -> TripItineraryResponse:
+        """Totals, explanation and planning report for routed days."""
+        total_days = (request.end_date - request.start_date).days + 1
         
         # Calculate totals
         total_distance = sum(day.total_distance for day in daily_itineraries)
         total_cost = sum(day.estimated_budget for day in daily_itineraries)
         
         # Generate algorithm explanation
+        distance_saved = sum(
+            day.route_improvement.distance_saved
+            for day in daily_itineraries if day.route_improvement
+        )
         explanation = self._generate_explanation(
-            total_days, len(selected_places), len(places), geocoded_city
+            total_days, len(selected_places), len(places), geocoded_city, distance_saved,
+            selection_method
+        )
+        if any(day.stops or day.dropped_place_ids for day in daily_itineraries):
+            dropped = sum(len(day.dropped_place_ids) for day in daily_itineraries)
+            explanation += (
+                f"\n7. Time windows: Scheduled visits within opening hours "
+                f"(time-window insertion), dropped {dropped} place(s) that fit no day"
+            )
+        explanation += reuse_info
+        
+        reports = [day.route_improvement for day in daily_itineraries if day.route_improvement]
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        planning_report = PlanningReport(
+            latency_budget_ms=latency_budget_ms,
+            elapsed_ms=elapsed_ms,
+            deadline_reached=(
+                elapsed_ms >= latency_budget_ms or any(r.deadline_reached for r in reports)
+            ),
+            route_restarts=sum(r.restarts for r in reports),
+            route_iterations=sum(r.iterations for r in reports),
+            distance_saved=distance_saved
         )
         
         logger.info(
             f"Trip planned: {len(selected_places)} places, "
-            f"{total_distance:.1f} km, ₹{total_cost:.0f}"
+            f"{total_distance:.1f} km, ₹{total_cost:.0f} "
+            f"in {elapsed_ms:.0f}/{latency_budget_ms:.0f} ms"
         )
         
-        return TripItineraryResponse(
+        itinerary = TripItineraryResponse(
             trip_id=trip_id,
-            start_date=start_date,
-            end_date=end_date,
+            start_date=request.start_date,
+            end_date=request.end_date,
             total_days=total_days,
             total_distance=total_distance,
             total_estimated_cost=total_cost,
             daily_itineraries=daily_itineraries,
-            algorithm_explanation=explanation
+            algorithm_explanation=explanation,
+            planning_report=planning_report,
+            center_latitude=center_lat,
+            center_longitude=center_lon
         )
+        self._remember_trip(itinerary, places)
+        
+        return itinerary
     
-    def _select_places_greedy(
+    def _canonical_request(self, request: ItineraryItemRequest) -> Tuple[object, Tuple[str, ...]]:
+        """
+        Location and preferences of a request in the form both plan caches
+        key on: normalized city name (or coordinates rounded to
+        COORD_GRID_DEG) and sorted, deduplicated preferences.
+        """
+        if request.city_name:
+            location = normalize_place_name(request.city_name)
+        elif request.latitude is not None and request.longitude is not None:
+            location = (
+                round(request.latitude / self.COORD_GRID_DEG),
+                round(request.longitude / self.COORD_GRID_DEG)
+            )
+        else:
+            location = None
+        return location, tuple(sorted({preference.value for preference in request.preferences}))
+    
+    def _reuse_key(
         self,
-        scored_places: List[Tuple[PlaceModel, float]],
+        request: ItineraryItemRequest,
+        engine: str,
+        routing_mode: str,
+        catalog_version: Optional[str]
+    ) -> tuple:
+        """Identity of a request for plan reuse: everything but end date and budget."""
+        location, preferences = self._canonical_request(request)
+        return (
+            request.start_date, preferences, location, engine, routing_mode,
+            self.selection_engine, catalog_version
+        )
+    
+    @staticmethod
+    def _catalog_version() -> Optional[str]:
+        """Version of the destination data plans come from, or None if unknown."""
+        if settings.USE_MOCK_DATA:
+            return "mock"
+        snapshot = get_destination_catalog().snapshot
+        return None if snapshot is None else repr(snapshot.version)
+    
+    def _response_key(
+        self,
+        request: ItineraryItemRequest,
+        engine: str,
+        routing_mode: str,
+        latency_budget_ms: float
+    ) -> str:
+        """
+        Canonical request hash for the response cache.
+        
+        Requests that can only get the same plan share a key: location and
+        preferences are canonicalized as for plan reuse, and budgets within
+        RESPONSE_BUDGET_BUCKET are folded. Anytime search stops at a wall-clock deadline, so the
+        latency budget is part of the key: a request with a different budget
+        plans afresh instead of getting a plan searched for longer or shorter.
+        """
+        location, preferences = self._canonical_request(request)
+        canonical = [
+            request.start_date.isoformat(),
+            request.end_date.isoformat(),
+            int(request.budget // self.RESPONSE_BUDGET_BUCKET),
+            preferences,
+            location,
+            engine,
+            routing_mode,
+            self.selection_engine,
+            latency_budget_ms,
+            settings.MAX_PLACES_PER_TRIP,
+            settings.MAX_SEARCH_RADIUS_KM
+        ]
+        return hashlib.sha256(json.dumps(canonical).encode()).hexdigest()
+    
+    def _serve_cached(
+        self,
+        cached: Tuple[TripItineraryResponse, List[PlaceModel]],
+        trip_id: str,
+        started: float
+    ) -> TripItineraryResponse:
+        """Copy of a cached plan under a new trip_id, remembered for edits."""
+        prior, candidates = cached
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        update = {
+            "trip_id": trip_id,
+            "algorithm_explanation": (
+                f"{prior.algorithm_explanation}\nCache: served plan {prior.trip_id} "
+                f"for an identical request"
+            )
+        }
+        if prior.planning_report is not None:
+            update["planning_report"] = prior.planning_report.copy(
+                update={"elapsed_ms": elapsed_ms, "deadline_reached": False}
+            )
+        itinerary = prior.copy(update=update)
+        self._remember_trip(itinerary, candidates)
+        logger.info(f"Served cached plan {prior.trip_id} as {trip_id} in {elapsed_ms:.2f} ms")
+        return itinerary
+    
+    def _remember_plan(
+        self,
+        key: tuple,
+        itinerary: TripItineraryResponse,
+        places: List[PlaceModel],
+        scores: np.ndarray,
+        geocoded_city: Optional[str],
+        center_lat: float,
+        center_lon: float
+    ):
+        """Keep a staged plan's candidates and scores for reuse (LRU-bounded)."""
+        with self._lock:
+            self._plans[key] = _PlanState(itinerary, places, scores, geocoded_city, center_lat, center_lon)
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.TRIP_CACHE_SIZE:
+                self._plans.popitem(last=False)
+    
+    def _recall_plan(self, key: tuple) -> Optional[_PlanState]:
+        """Remembered staged plan for a reuse key, marked as recently used."""
+        with self._lock:
+            prior = self._plans.get(key)
+            if prior is not None:
+                self._plans.move_to_end(key)
+            return prior
+    
+    def _replan_incremental(
+        self,
+        request: ItineraryItemRequest,
+        prior: _PlanState,
+        key: tuple,
+        trip_id: str,
+        started: float,
+        deadline: float,
+        latency_budget_ms: float,
+        time_windows: bool = False
+    ) -> TripItineraryResponse:
+        """
+        Adapt a remembered plan to a new end date and/or budget.
+        
+        Geocoding, fetching and scoring are skipped. Selection starts from
+        the prior selection and only adds or drops marginal places
+        (_select_places_incremental); prior places keep their days and only
+        new ones are assigned (_distribute_places_across_days with
+        previous_days), so only days whose places changed are routed again.
+        
+        Args:
+            request: Trip request differing from the prior one only in
+                end_date and/or budget
+            prior: Remembered plan state
+            key: Reuse key of the request
+            trip_id: New trip identifier
+            started: time.perf_counter() value when planning started
+            deadline: time.perf_counter() value to finish by
+            latency_budget_ms: Planning time budget
+            time_windows: Schedule the routes within opening hours
+        
+        Returns:
+            TripItineraryResponse with a new trip_id
+        """
+        total_days = (request.end_date - request.start_date).days + 1
+        logger.info(
+            f"Reusing plan {prior.itinerary.trip_id}: {total_days} days, "
+            f"Budget: ₹{request.budget}, {len(prior.places)} cached candidates"
+        )
+        
+        selected_places = self._select_places_incremental(
+            prior.places, prior.scores,
+            {place.id for day in prior.itinerary.daily_itineraries for place in day.places},
+            request.budget, total_days
+        )
+        selection_method = "incremental"
+        daily_places = self._distribute_places_across_days(
+            selected_places, total_days, prior.center_lat, prior.center_lon,
+            previous_days=prior.itinerary.daily_itineraries
+        )
+        
+        if time_windows:
+            # Opening hours can move stops between days, so every day is rescheduled
+            daily_itineraries = self._generate_daily_itineraries(
+                daily_places, request.start_date, prior.center_lat, prior.center_lon,
+                deadline, time_windows=True
+            )
+            return self._finish_reuse(
+                request, prior, key, trip_id, started, latency_budget_ms,
+                daily_itineraries, selected_places, selection_method,
+                list(range(1, total_days + 1))
+            )
+        
+        # Route changed days only; unchanged days keep their itinerary
+        previous = {day.day: day for day in prior.itinerary.daily_itineraries}
+        changed = [
+            day_num for day_num, places in enumerate(daily_places, 1)
+            if places and (
+                day_num not in previous
+                or sorted(place.id for place in previous[day_num].places)
+                != sorted(place.id for place in places)
+            )
+        ]
+        routes = self.route_optimizer.optimize_days(
+            [places if day_num in changed else [] for day_num, places in enumerate(daily_places, 1)],
+            prior.center_lat, prior.center_lon,
+            time_budget_ms=self._remaining_ms(deadline)
+        )
+        daily_itineraries = []
+        for day_num, places in enumerate(daily_places, 1):
+            if not places:
+                continue
+            if day_num in changed:
+                distance, ordered, report = routes[day_num - 1]
+                daily_itineraries.append(self._build_day_itinerary(
+                    day_num, request.start_date, ordered, distance, report
+                ))
+            else:
+                daily_itineraries.append(previous[day_num])
+        
+        return self._finish_reuse(
+            request, prior, key, trip_id, started, latency_budget_ms,
+            daily_itineraries, selected_places, selection_method, changed
+        )
+    
+    def _finish_reuse(
+        self,
+        request: ItineraryItemRequest,
+        prior: _PlanState,
+        key: tuple,
+        trip_id: str,
+        started: float,
+        latency_budget_ms: float,
+        daily_itineraries: List[DayItinerary],
+        selected_places: List[PlaceModel],
+        selection_method: str,
+        changed: List[int]
+    ) -> TripItineraryResponse:
+        """Finish an adapted plan and remember it for further reuse."""
+        kept = len(daily_itineraries) - len(changed)
+        itinerary = self._finish_plan(
+            trip_id, request, daily_itineraries, selected_places, prior.places,
+            selection_method, prior.geocoded_city, prior.center_lat, prior.center_lon,
+            started, latency_budget_ms,
+            reuse_info=(
+                f"\nReuse: adapted plan {prior.itinerary.trip_id}, kept {kept} day(s), "
+                f"recomputed day(s) {changed} from {len(prior.places)} cached candidates"
+            )
+        )
+        self._remember_plan(
+            key, itinerary, prior.places, prior.scores, prior.geocoded_city,
+            prior.center_lat, prior.center_lon
+        )
+        
+        return itinerary
+    
+    def _remember_trip(self, itinerary: TripItineraryResponse, candidates: Iterable[PlaceModel]):
+        """Keep a plan and its candidate places for later edits (LRU-bounded)."""
+        entry = (itinerary, {place.id: place for place in candidates})
+        with self._lock:
+            self._trips[itinerary.trip_id] = entry
+            self._trips.move_to_end(itinerary.trip_id)
+            while len(self._trips) > self.TRIP_CACHE_SIZE:
+                self._trips.popitem(last=False)
+    
+    def edit_itinerary(self, request: ItineraryEditRequest) -> TripItineraryResponse:
+        """
+        Apply add / remove / pin edits to a planned itinerary.
+        
+        Only days touched by an edit are recomputed: a removed place is
+        dropped from its day, an added place goes to the cheapest position
+        (on the requested day, or on the day where it adds the least
+        distance), and each touched day's route is then repaired locally.
+        Pinned places are moved to the requested day and recorded on it.
+        When the itinerary was planned within opening hours (it has stops),
+        touched days are rescheduled the same way, and an edit that leaves
+        a place no feasible visit on its day is rejected.
+        
+        Args:
+            request: Prior itinerary (or its trip_id) and edit operations
+        
+        Returns:
+            Updated TripItineraryResponse with the same trip_id
+        
+        Raises:
+            KeyError: If trip_id is not a recent plan and no itinerary is given
+            ValueError: If an operation cannot be applied
+        """
+        started = time.perf_counter()
+        
+        with self._lock:
+            cached = self._trips.get(request.trip_id or (request.itinerary and request.itinerary.trip_id))
+        if request.itinerary is not None:
+            itinerary = request.itinerary
+        elif cached is not None:
+            itinerary = cached[0]
+        else:
+            raise KeyError(f"Unknown trip_id: {request.trip_id}")
+        candidates = cached[1] if cached is not None else {}
+        
+        center_lat, center_lon = itinerary.center_latitude, itinerary.center_longitude
+        time_windows = any(day.stops or day.dropped_place_ids for day in itinerary.daily_itineraries)
+        days = {day.day: list(day.places) for day in itinerary.daily_itineraries}
+        pinned = {day.day: set(day.pinned_place_ids) for day in itinerary.daily_itineraries}
+        affected = set()
+        
+        for operation in request.operations:
+            if operation.day is not None and operation.day > itinerary.total_days:
+                raise ValueError(f"Day {operation.day} is outside the {itinerary.total_days}-day trip")
+            location = self._find_place(days, operation.place_id)
+            
+            if operation.op == EditOperationEnum.REMOVE:
+                if location is None:
+                    raise ValueError(f"Place {operation.place_id} is not in the itinerary")
+                day_num, index = location
+                days[day_num].pop(index)
+                pinned.get(day_num, set()).discard(operation.place_id)
+                affected.add(day_num)
+                continue
+            
+            if location is None:
+                place = operation.place or candidates.get(operation.place_id)
+                if place is None:
+                    raise ValueError(f"Unknown place {operation.place_id}; include its details to add it")
+                if operation.op == EditOperationEnum.PIN and operation.day is None:
+                    raise ValueError(f"Pinning new place {operation.place_id} requires a day")
+            elif operation.op == EditOperationEnum.ADD:
+                raise ValueError(f"Place {operation.place_id} is already in the itinerary")
+            else:
+                # Pin: keep the place on its day, or move it to the requested one
+                day_num, index = location
+                if operation.day is None or operation.day == day_num:
+                    pinned.setdefault(day_num, set()).add(operation.place_id)
+                    continue
+                place = days[day_num].pop(index)
+                pinned.get(day_num, set()).discard(operation.place_id)
+                affected.add(day_num)
+            
+            day_num = operation.day
+            if day_num is None:
+                # Day where the place adds the least distance
+                day_num = min(
+                    range(1, itinerary.total_days + 1),
+                    key=lambda d: self.route_optimizer.cheapest_insertion(
+                        days.get(d, []), place, center_lat, center_lon
+                    )[0]
+                )
+            day_places = days.setdefault(day_num, [])
+            _, index = self.route_optimizer.cheapest_insertion(day_places, place, center_lat, center_lon)
+            day_places.insert(index, place)
+            if operation.op == EditOperationEnum.PIN:
+                pinned.setdefault(day_num, set()).add(operation.place_id)
+            affected.add(day_num)
+        
+        # Recompute touched days only; untouched days are reused as they are
+        daily_itineraries = {
+            day.day: day.copy(update={"pinned_place_ids": sorted(pinned.get(day.day, set()))})
+            for day in itinerary.daily_itineraries if day.day not in affected
+        }
+        previous_dropped = {day.day: day.dropped_place_ids for day in itinerary.daily_itineraries}
+        planned = {place.id for places in days.values() for place in places}
+        for day_num in sorted(affected):
+            if not days[day_num]:
+                continue
+            distance, ordered, report = self.route_optimizer.repair_route(
+                days[day_num], center_lat, center_lon, time_budget_ms=self.EDIT_ROUTE_BUDGET_MS
+            )
+            day = self._build_day_itinerary(
+                day_num, itinerary.start_date, ordered, distance, report,
+                sorted(pinned.get(day_num, set()))
+            )
+            if time_windows:
+                day = self._reschedule_day(
+                    day, center_lat, center_lon,
+                    [place_id for place_id in previous_dropped.get(day_num, []) if place_id not in planned]
+                )
+            daily_itineraries[day_num] = day
+        daily_itineraries = [daily_itineraries[day_num] for day_num in sorted(daily_itineraries)]
+        
+        edited = itinerary.copy(update={
+            "total_distance": sum(day.total_distance for day in daily_itineraries),
+            "total_estimated_cost": sum(day.estimated_budget for day in daily_itineraries),
+            "daily_itineraries": daily_itineraries,
+            "algorithm_explanation": (
+                f"{itinerary.algorithm_explanation}\n"
+                f"Edits: applied {len(request.operations)} operation(s), recomputed day(s) "
+                f"{sorted(affected)} using cheapest insertion/removal with local route repair"
+            ),
+        })
+        self._remember_trip(edited, candidates.values())
+        
+        logger.info(
+            f"Edited trip {edited.trip_id}: {len(request.operations)} operation(s), "
+            f"days {sorted(affected)} in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+        
+        return edited
+    
+    @staticmethod
+    def _find_place(days: Dict[int, List[PlaceModel]], place_id: str) -> Optional[Tuple[int, int]]:
+        """(day, index) of a place in the itinerary, or None."""
+        for day_num, places in days.items():
+            for index, place in enumerate(places):
+                if place.id == place_id:
+                    return day_num, index
+        return None
+    
+    @staticmethod
+    def _remaining_ms(deadline: float) -> float:
+        """Milliseconds left before the planning deadline (never negative)."""
+        return max((deadline - time.perf_counter()) * 1000, 0.0)
+    
+    @staticmethod
+    def _place_cost(place: PlaceModel) -> float:
+        """Estimated cost of visiting a place."""
+        return place.estimated_cost or settings.AVG_COST_PER_PLACE.get(place.category, 1000)
+    
+    @staticmethod
+    def _max_visit_time(total_days: int) -> float:
+        """Total visit minutes available for the trip."""
+        avg_day_time = (total_days * 24 * 60) - (total_days * 8)  # 16 hours/day
+        return avg_day_time * 0.8  # Use 80% of available time
+    
+    def _select_places(
+        self,
+        places: List[PlaceModel],
+        scores: np.ndarray,
+        total_budget: float,
+        total_days: int,
+        deadline: float
+    ) -> Tuple[List[PlaceModel], str]:
+        """
+        Select places with the configured selection engine.
+        
+        Returns:
+            Tuple of (selected places, method used)
+        """
+        if self.selection_engine == "knapsack":
+            # The knapsack weighs every candidate, so rank them all in one sort
+            order = np.argsort(-scores, kind="stable")
+            return self._select_places_knapsack(
+                [(places[i], float(scores[i])) for i in order], total_budget, total_days,
+                time_cap_ms=min(TIME_CAP_MS, self._remaining_ms(deadline) * self.SELECTION_BUDGET_SHARE)
+            )
+        
+        # Greedy stops once nothing else fits, so rank lazily: only the
+        # candidates it reads get sorted
+        scored_places = (
+            (places[i], float(scores[i])) for i in self.scoring_engine.iter_ranked(scores)
+        )
+        selected = self._select_places_greedy(
+            scored_places, total_budget, total_days,
+            min_place_cost=min(self._place_cost(place) for place in places)
+        )
+        return selected, "greedy"
+    
+    def _select_places_incremental(
+        self,
+        places: List[PlaceModel],
+        scores: np.ndarray,
+        previous_ids: set,
         total_budget: float,
         total_days: int
+    ) -> List[PlaceModel]:
+        """
+        Adapt a previous selection to a new budget and trip length.
+        
+        Previously selected places stay while budget and visit time allow
+        (the lowest-scoring go first); what is left of both then goes to
+        the best unselected places in score order, so only the marginal
+        places change.
+        
+        Args:
+            places: Scored candidate places
+            scores: Score per candidate
+            previous_ids: Ids of the previously selected places
+            total_budget: Total budget for trip
+            total_days: Total number of days
+        
+        Returns:
+            List of selected PlaceModel instances in score order
+        """
+        order = np.argsort(-scores, kind="stable")
+        costs = [self._place_cost(place) for place in places]
+        visit_times = [settings.AVG_VISIT_TIME.get(place.category, 120) for place in places]
+        max_visit_time = self._max_visit_time(total_days)
+        
+        kept = [i for i in order if places[i].id in previous_ids]
+        total_cost = sum(costs[i] for i in kept)
+        total_visit_time = sum(visit_times[i] for i in kept)
+        while kept and (total_cost > total_budget or total_visit_time > max_visit_time):
+            i = kept.pop()
+            total_cost -= costs[i]
+            total_visit_time -= visit_times[i]
+        
+        chosen = set(kept)
+        for i in order:
+            if i in chosen:
+                continue
+            if total_cost + costs[i] <= total_budget and total_visit_time + visit_times[i] <= max_visit_time:
+                chosen.add(i)
+                total_cost += costs[i]
+                total_visit_time += visit_times[i]
+        
+        logger.info(
+            f"Selected places (incremental): {len(chosen)} "
+            f"(kept {len(kept)} of {len(previous_ids)}), "
+            f"Cost: ₹{total_cost:.0f}/{total_budget:.0f}, "
+            f"Time: {total_visit_time}mins/{max_visit_time:.0f}mins"
+        )
+        
+        return [places[i] for i in order if i in chosen]
+    
+    def _select_places_greedy(
+        self,
+        scored_places: Iterable[Tuple[PlaceModel, float]],
+        total_budget: float,
+        total_days: int,
+        min_place_cost: float = 0
     ) -> List[PlaceModel]:
         """
         Greedy selection algorithm:
-        - Sort by score (already done)
+        - Consume places by score (best first)
         - Select places while budget allows
         - Ensure reasonable time to visit each place
+        - Stop early once no remaining place can fit
         
         Args:
-            scored_places: List of (place, score) tuples sorted by score
+            scored_places: (place, score) tuples by score descending; may be
+                a lazy iterator (see ScoringEngine.iter_ranked)
             total_budget: Total budget for trip
             total_days: Total number of days
+            min_place_cost: Cheapest candidate cost, used to stop once the
+                remaining budget cannot cover any place
         
         Returns:
             List of selected PlaceModel instances
@@ -193,18 +910,23 @@ class TripPlanningService:
         selected = []
         total_cost = 0
         total_visit_time = 0
-        avg_day_time = (total_days * 24 * 60) - (total_days * 8)  # 16 hours/day
-        max_visit_time = avg_day_time * 0.8  # Use 80% of available time
+        max_visit_time = self._max_visit_time(total_days)
+        min_visit_time = min(list(settings.AVG_VISIT_TIME.values()) + [120])
         
         for place, score in scored_places:
             visit_time = settings.AVG_VISIT_TIME.get(place.category, 120)
-            place_cost = place.estimated_cost or settings.AVG_COST_PER_PLACE.get(place.category, 1000)
+            place_cost = self._place_cost(place)
             
             # Check budget and time constraints
             if total_cost + place_cost <= total_budget and total_visit_time + visit_time <= max_visit_time:
                 selected.append(place)
                 total_cost += place_cost
                 total_visit_time += visit_time
+                
+                # Nothing further down the ranking can fit any more
+                if (total_budget - total_cost < min_place_cost or
+                        max_visit_time - total_visit_time < min_visit_time):
+                    break
         
         logger.info(
             f"Selected places (greedy): {len(selected)}, "
@@ -214,26 +936,176 @@ class TripPlanningService:
         
         return selected
     
+    def _select_places_knapsack(
+        self,
+        scored_places: List[Tuple[PlaceModel, float]],
+        total_budget: float,
+        total_days: int,
+        time_cap_ms: float = TIME_CAP_MS
+    ) -> Tuple[List[PlaceModel], str]:
+        """
+        Knapsack selection: maximize total score under budget and visit time.
+        
+        The greedy selection is the warm start and the fallback, so the
+        result never scores lower than greedy.
+        
+        Args:
+            scored_places: List of (place, score) tuples sorted by score
+            total_budget: Total budget for trip
+            total_days: Total number of days
+            time_cap_ms: Wall-clock cap for branch-and-bound
+        
+        Returns:
+            Tuple of (selected places in score order, method used)
+        """
+        if not scored_places:
+            return [], "greedy"
+        
+        greedy = self._select_places_greedy(scored_places, total_budget, total_days)
+        greedy_ids = {id(place) for place in greedy}
+        warm_start = [i for i, (place, _) in enumerate(scored_places) if id(place) in greedy_ids]
+        
+        chosen, method = select_knapsack(
+            [score for _, score in scored_places],
+            [self._place_cost(place) for place, _ in scored_places],
+            [settings.AVG_VISIT_TIME.get(place.category, 120) for place, _ in scored_places],
+            total_budget,
+            self._max_visit_time(total_days),
+            warm_start=warm_start,
+            time_cap_ms=time_cap_ms
+        )
+        selected = [scored_places[i][0] for i in chosen]
+        
+        logger.info(
+            f"Selected places (knapsack/{method}): {len(selected)}, "
+            f"Score: {sum(scored_places[i][1] for i in chosen):.1f} "
+            f"(greedy: {sum(scored_places[i][1] for i in warm_start):.1f}), "
+            f"Cost: ₹{sum(self._place_cost(place) for place in selected):.0f}/{total_budget:.0f}"
+        )
+        
+        return selected, method
+    
+    def _plan_orienteering(
+        self,
+        places: List[PlaceModel],
+        preferences: List[PreferenceEnum],
+        total_budget: float,
+        total_days: int,
+        center_lat: float,
+        center_lon: float,
+        time_budget_ms: float = TIME_BUDGET_MS
+    ) -> Tuple[List[PlaceModel], List[List[PlaceModel]]]:
+        """
+        Select, distribute and route places together (orienteering engine).
+        
+        Every day starts at the trip center and has ORIENTEERING_DAY_MINUTES
+        for visits plus travel between consecutive places
+        (RouteOptimizer.travel_matrix), so no day is handed places it cannot
+        reach.
+        
+        Args:
+            places: Candidate places
+            preferences: User's preferred categories
+            total_budget: Total budget for trip
+            total_days: Total number of days
+            center_lat: Daily start latitude
+            center_lon: Daily start longitude
+            time_budget_ms: Wall-clock budget for the improvement rounds
+        
+        Returns:
+            Tuple of (selected places, place lists for each day in visiting order)
+        """
+        scores = self.scoring_engine.score_places(places, preferences, center_lat, center_lon)
+        travel_minutes, _ = self.route_optimizer.travel_matrix(places, center_lat, center_lon)
+        
+        routes = plan_orienteering(
+            scores,
+            [self._place_cost(place) for place in places],
+            [settings.AVG_VISIT_TIME.get(place.category, 120) for place in places],
+            travel_minutes,
+            total_budget,
+            total_days,
+            self.ORIENTEERING_DAY_MINUTES,
+            time_budget_ms=time_budget_ms
+        )
+        daily_places = [[places[i] for i in route] for route in routes]
+        selected = [place for day in daily_places for place in day]
+        
+        logger.info(
+            f"Orienteering plan: {len(selected)} places, "
+            f"Score: {sum(scores[i] for route in routes for i in route):.1f}, "
+            f"Cost: ₹{sum(self._place_cost(place) for place in selected):.0f}/{total_budget:.0f}, "
+            f"per day: {[len(day) for day in daily_places]}"
+        )
+        
+        return selected, daily_places
+    
     def _distribute_places_across_days(
         self,
         places: List[PlaceModel],
-        total_days: int
+        total_days: int,
+        center_lat: float = None,
+        center_lon: float = None,
+        previous_days: List[DayItinerary] = None
     ) -> List[List[PlaceModel]]:
         """
-        Distribute selected places across days using round-robin.
+        Distribute selected places across days by geographic clustering.
+        
+        Places are grouped with capacitated (balanced) k-means so each day
+        covers one compact area, while no day's visit time (from
+        settings.AVG_VISIT_TIME) exceeds its share of the trip by more than
+        day_clustering.CAPACITY_SLACK. Days are ordered nearest-first from
+        the trip center.
+        
+        With previous_days, places that were already planned keep their day
+        number and only the others are assigned (day_clustering.extend_clusters):
+        they seed added days first, then join the nearest day with room. A
+        day's room is the balanced capacity above, but at least the load of
+        the heaviest kept day, so extending a trip never unsettles the days
+        it already had.
         
         Args:
             places: List of places to distribute
             total_days: Number of days
+            center_lat: Trip center latitude (orders the days)
+            center_lon: Trip center longitude (orders the days)
+            previous_days: Prior itinerary days to warm-start from
         
         Returns:
             List of place lists for each day
         """
         daily_places = [[] for _ in range(total_days)]
+        if not places:
+            return daily_places
         
-        for i, place in enumerate(places):
-            day_index = i % total_days
-            daily_places[day_index].append(place)
+        lats = [place.latitude for place in places]
+        lons = [place.longitude for place in places]
+        if center_lat is None or center_lon is None:
+            center_lat, center_lon = lats[0], lons[0]
+        
+        # Project places together with the center so both share one scale
+        coords = project_km(lats + [center_lat], lons + [center_lon])
+        points, origin = coords[:-1], coords[-1]
+        visit_times = [settings.AVG_VISIT_TIME.get(place.category, 120) for place in places]
+        
+        if previous_days is None:
+            labels = balanced_kmeans(points, visit_times, total_days)
+            day_order = order_clusters(points, labels, total_days, origin)
+        else:
+            previous = {place.id: day.day - 1 for day in previous_days for place in day.places}
+            initial = np.array([previous.get(place.id, -1) for place in places])
+            initial[initial >= total_days] = -1  # Days cut off by an earlier end date
+            weights = np.asarray(visit_times, dtype=np.float64)
+            kept_load = np.bincount(
+                initial[initial >= 0], weights[initial >= 0], minlength=total_days
+            )
+            capacity = max(weights.sum() / total_days * (1 + CAPACITY_SLACK), kept_load.max())
+            labels = extend_clusters(points, weights, initial, total_days, capacity)
+            day_order = range(total_days)
+        for day_index, cluster in enumerate(day_order):
+            daily_places[day_index] = [
+                place for place, label in zip(places, labels) if label == cluster
+            ]
         
         logger.info(
             f"Distributed {len(places)} places across {total_days} days: "
@@ -247,7 +1119,9 @@ class TripPlanningService:
         daily_places: List[List[PlaceModel]],
         start_date: date,
         center_lat: float,
-        center_lon: float
+        center_lon: float,
+        deadline: float = None,
+        time_windows: bool = False
     ) -> List[DayItinerary]:
         """
         Generate optimized day-wise itineraries.
@@ -257,58 +1131,225 @@ class TripPlanningService:
             start_date: Trip start date
             center_lat: Center latitude
             center_lon: Center longitude
+            deadline: time.perf_counter() value to finish routing by
+            time_windows: Schedule the routes within opening hours
         
         Returns:
             List of DayItinerary objects
         """
         daily_itineraries = []
         
-        for day_num, places_for_day in enumerate(daily_places, 1):
+        # Optimize every day's route (exact for small days, anytime search
+        # otherwise); long trips fan out to the route optimization pool
+        time_budget_ms = None if deadline is None else self._remaining_ms(deadline)
+        routes = self.route_optimizer.optimize_days(
+            daily_places, center_lat, center_lon, time_budget_ms=time_budget_ms
+        )
+        
+        if time_windows:
+            return self._schedule_time_windows(routes, start_date, center_lat, center_lon)
+        
+        for day_num, (places_for_day, route) in enumerate(zip(daily_places, routes), 1):
             if not places_for_day:
                 continue
-            
-            # Optimize route for the day
-            distance, optimized_places = self.route_optimizer.calculate_route_distance(
-                places_for_day, center_lat, center_lon
-            )
-            
-            # Calculate metrics
-            total_time = 0
-            total_cost = 0
-            for place in optimized_places:
-                visit_time = settings.AVG_VISIT_TIME.get(place.category, 120)
-                place_cost = place.estimated_cost or settings.AVG_COST_PER_PLACE.get(place.category, 1000)
-                total_time += visit_time + settings.AVG_TRAVEL_TIME
-                total_cost += place_cost
-            
-            day_date = start_date + timedelta(days=day_num - 1)
-            
-            day_itinerary = DayItinerary(
-                day=day_num,
-                date=day_date,
-                places=optimized_places,
-                total_distance=distance,
-                total_time=total_time,
-                estimated_budget=total_cost
+            distance, optimized_places, route_improvement = route
+            daily_itineraries.append(self._build_day_itinerary(
+                day_num, start_date, optimized_places, distance, route_improvement
+            ))
+        
+        return daily_itineraries
+    
+    def _schedule_time_windows(
+        self,
+        routes: List[Tuple[float, List[PlaceModel], Optional[RouteImprovementReport]]],
+        start_date: date,
+        center_lat: float,
+        center_lon: float
+    ) -> List[DayItinerary]:
+        """
+        Fit distance-optimized day routes into opening hours.
+        
+        Works on the intervals compiled when places were loaded
+        (PlaceModel.open_intervals) and RouteOptimizer.travel_matrix travel
+        minutes. Stops that miss their window move to a
+        feasible position on any day, or are dropped and listed on the day
+        they came from.
+        
+        Args:
+            routes: (distance, ordered places, report) for each day
+            start_date: Trip start date
+            center_lat: Daily start latitude
+            center_lon: Daily start longitude
+        
+        Returns:
+            List of DayItinerary objects with per-stop times
+        """
+        places = [place for _, day_places, _ in routes for place in day_places]
+        dist, _ = self.route_optimizer.route_matrix(places, center_lat, center_lon)
+        travel_minutes, _ = self.route_optimizer.travel_matrix(places, center_lat, center_lon)
+        service = [0.0] + [settings.AVG_VISIT_TIME.get(place.category, 120) for place in places]
+        windows = [None] + [place.open_intervals for place in places]
+        
+        node_routes, home = [], {}
+        for d, (_, day_places, _) in enumerate(routes):
+            first = len(home) + 1
+            node_routes.append(list(range(first, first + len(day_places))))
+            home.update((node, d) for node in node_routes[-1])
+        
+        node_routes, schedules, dropped = schedule_days(node_routes, travel_minutes, service, windows)
+        dropped_ids = [[] for _ in routes]
+        for node in dropped:
+            dropped_ids[home[node]].append(places[node - 1].id)
+        
+        daily_itineraries = []
+        for d, (node_route, schedule) in enumerate(zip(node_routes, schedules)):
+            if not node_route and not dropped_ids[d]:
+                continue
+            day = self._build_day_itinerary(
+                d + 1, start_date, [places[node - 1] for node in node_route],
+                route_length([0] + node_route, dist), routes[d][2]
             )
-            
-            daily_itineraries.append(day_itinerary)
+            daily_itineraries.append(day.copy(update={
+                "stops": self._stop_schedules(places, node_route, schedule, service),
+                "dropped_place_ids": dropped_ids[d]
+            }))
+        
+        logger.info(
+            f"Time-window schedule from {self._clock(DAY_START_MINUTES)}: "
+            f"{sum(len(r) for r in node_routes)} stops, dropped {len(dropped)}"
+        )
         
         return daily_itineraries
     
+    def _reschedule_day(
+        self,
+        day: DayItinerary,
+        center_lat: float,
+        center_lon: float,
+        dropped_place_ids: List[str]
+    ) -> DayItinerary:
+        """
+        Fit an edited day into opening hours, keeping its places on that day.
+        
+        The repaired route is rebuilt with time-window insertion
+        (time_windows.schedule_days on this day alone).
+        
+        Raises:
+            ValueError: If some place has no feasible visit on this day
+        """
+        places = day.places
+        dist, _ = self.route_optimizer.route_matrix(places, center_lat, center_lon)
+        travel_minutes, _ = self.route_optimizer.travel_matrix(places, center_lat, center_lon)
+        service = [0.0] + [settings.AVG_VISIT_TIME.get(place.category, 120) for place in places]
+        windows = [None] + [place.open_intervals for place in places]
+        
+        (route,), (schedule,), unplaced = schedule_days(
+            [list(range(1, len(places) + 1))], travel_minutes, service, windows
+        )
+        if unplaced:
+            raise ValueError(
+                f"Day {day.day} has no time within opening hours for "
+                f"{', '.join(places[node - 1].id for node in unplaced)}"
+            )
+        
+        return day.copy(update={
+            "places": [places[node - 1] for node in route],
+            "total_distance": route_length([0] + route, dist),
+            "stops": self._stop_schedules(places, route, schedule, service),
+            "dropped_place_ids": dropped_place_ids
+        })
+    
+    @staticmethod
+    def _clock(minute: float) -> clock_time:
+        """Time of day for a minute after midnight."""
+        return clock_time(int(minute) // 60, int(minute) % 60)
+    
+    def _stop_schedules(
+        self,
+        places: List[PlaceModel],
+        route: List[int],
+        schedule: List[Tuple[float, float]],
+        service: List[float]
+    ) -> List[StopSchedule]:
+        """Per-stop times for a scheduled route whose node i is places[i - 1]."""
+        return [
+            StopSchedule(
+                place_id=places[node - 1].id,
+                arrival_time=self._clock(arrival),
+                start_time=self._clock(start),
+                departure_time=self._clock(start + service[node]),
+                wait_minutes=round(start - arrival, 1)
+            )
+            for node, (arrival, start) in zip(route, schedule)
+        ]
+    
+    def _build_day_itinerary(
+        self,
+        day_num: int,
+        start_date: date,
+        places: List[PlaceModel],
+        distance: float,
+        route_improvement: Optional[RouteImprovementReport] = None,
+        pinned_place_ids: List[str] = None
+    ) -> DayItinerary:
+        """DayItinerary with time and cost metrics for an ordered day of places."""
+        # Calculate metrics
+        total_time = 0
+        total_cost = 0
+        for place in places:
+            visit_time = settings.AVG_VISIT_TIME.get(place.category, 120)
+            place_cost = self._place_cost(place)
+            total_time += visit_time + settings.AVG_TRAVEL_TIME
+            total_cost += place_cost
+        
+        return DayItinerary(
+            day=day_num,
+            date=start_date + timedelta(days=day_num - 1),
+            places=places,
+            total_distance=distance,
+            total_time=total_time,
+            estimated_budget=total_cost,
+            route_improvement=route_improvement,
+            pinned_place_ids=pinned_place_ids or []
+        )
+    
     @staticmethod
-    def _generate_explanation(total_days: int, selected_count: int, total_count: int, geocoded_city: str = None) -> str:
+    def _generate_explanation(
+        total_days: int,
+        selected_count: int,
+        total_count: int,
+        geocoded_city: str = None,
+        distance_saved: float = 0,
+        selection_method: str = "greedy"
+    ) -> str:
         """Generate explanation of the algorithm used."""
         city_info = f" starting from {geocoded_city}" if geocoded_city else ""
+        selection_info = {
+            "greedy": "greedy algorithm",
+            "dp": "knapsack dynamic programming",
+            "branch_and_bound": "knapsack branch-and-bound",
+            "orienteering": "orienteering (ratio insertion, route local search and swaps)",
+            "incremental": "the previous selection adjusted at the margin",
+        }.get(selection_method, selection_method)
+        distribution_info = (
+            "orienteering routes with per-day time budgets including travel"
+            if selection_method == "orienteering"
+            else "capacitated geographic clustering (balanced k-means on visit time)"
+        )
+        improvement_info = (
+            f"; small days solved exactly (Held-Karp), larger ones refined with "
+            f"2-opt/Or-opt local search (saved {distance_saved:.1f} km vs Nearest Neighbor)"
+            if distance_saved > 0 else ""
+        )
         return (
             f"Trip Plan Algorithm{city_info}:\n"
             f"1. Geocoding: Converted city name to coordinates using OSM Nominatim API\n"
             f"2. Scoring: Evaluated {total_count} places using multi-factor scoring "
             f"(Rating×0.1 + Preferences×0.4 + Distance×0.4 + Popularity×0.1)\n"
-            f"3. Selection: Selected {selected_count} places using greedy algorithm "
+            f"3. Selection: Selected {selected_count} places using {selection_info} "
             f"respecting budget and time constraints\n"
-            f"4. Distribution: Distributed across {total_days} days using round-robin\n"
+            f"4. Distribution: Distributed across {total_days} days using {distribution_info}\n"
             f"5. Optimization: Optimized visiting order per day using Nearest Neighbor algorithm "
-            f"(TSP approximation)\n"
+            f"(TSP approximation){improvement_info}\n"
             f"6. Feasibility: All selections verified for budget and time constraints"
         )
@@ -1,7 +1,12 @@
 """
 Weather service for fetching weather data and adjusting trip recommendations.
 """
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import Future
+from math import floor
+from typing import Dict, List, Optional, Tuple
+import threading
+import time
 from app.models.schemas import PlaceModel, PreferenceEnum
 from app.config import settings
 from app.utils.logger import get_logger
@@ -14,8 +19,20 @@ logger = get_logger(__name__)
 class WeatherService:
     """
     Integrates weather data and adjusts place recommendations accordingly.
+    
+    Forecasts are cached process-wide per FORECAST_CELL_DEG grid cell, so
+    nearby requests share one provider call, until the next 3-hour forecast
+    step. Concurrent misses for the same cell wait for a single request.
     """
     
+    FORECAST_CELL_DEG = 0.25  # Grid cell size of the forecast cache
+    FORECAST_STEP_SECONDS = 3 * 60 * 60  # OpenWeatherMap forecast step; cache entries expire on it
+    FORECAST_CACHE_SIZE = 512  # Cells kept
+    
+    _forecasts: "OrderedDict[Tuple[int, int], Tuple[float, Dict]]" = OrderedDict()
+    _in_flight: Dict[Tuple[int, int], Future] = {}
+    _cache_lock = threading.Lock()
+    
     def __init__(self, api_key: Optional[str] = None):
         """Initialize with OpenWeatherMap API key."""
         self.api_key = api_key or settings.OPENWEATHER_API_KEY
@@ -30,6 +47,9 @@ class WeatherService:
         """
         Get weather forecast for a location.
         
+        Served from the grid-cell cache when possible; API errors fall back
+        to mock data, which is not cached.
+        
         Args:
             latitude: Location latitude
             longitude: Location longitude
@@ -42,24 +62,74 @@ class WeatherService:
             logger.warning("No OpenWeatherMap API key. Returning mock weather data.")
             return self._get_mock_weather()
         
-        try:
-            url = f"{self.base_url}/forecast"
-            params = {
-                "lat": latitude,
-                "lon": longitude,
-                "appid": self.api_key,
-                "units": "metric"
-            }
-            
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            
-            logger.info(f"Fetched weather data for ({latitude}, {longitude})")
-            return response.json()
+        cell = self._forecast_cell(latitude, longitude)
+        now = time.time()
+        with self._cache_lock:
+            cached = self._forecasts.get(cell)
+            if cached is not None and cached[0] > now:
+                self._forecasts.move_to_end(cell)
+                logger.info(f"Weather cache hit for cell {cell}")
+                return cached[1]
             
+            pending = self._in_flight.get(cell)
+            owner = pending is None
+            if owner:
+                pending = self._in_flight[cell] = Future()
+        
+        if not owner:
+            # Another request is already fetching this cell
+            return pending.result()
+        
+        forecast = None
+        try:
+            forecast = self._fetch_forecast(cell)
         except requests.RequestException as e:
             logger.error(f"Weather API error: {e}. Using mock data.")
-            return self._get_mock_weather()
+        finally:
+            with self._cache_lock:
+                if forecast is not None:
+                    self._forecasts[cell] = (self._next_forecast_step(now), forecast)
+                    self._forecasts.move_to_end(cell)
+                    while len(self._forecasts) > self.FORECAST_CACHE_SIZE:
+                        self._forecasts.popitem(last=False)
+                del self._in_flight[cell]
+            # Waiters get the mock data too if this request failed
+            pending.set_result(forecast if forecast is not None else self._get_mock_weather())
+        
+        return pending.result()
+    
+    def _fetch_forecast(self, cell: Tuple[int, int]) -> Dict:
+        """
+        Fetch the forecast for a cache cell, queried at the cell's center.
+        
+        Raises:
+            requests.RequestException: On network or HTTP errors
+        """
+        latitude = (cell[0] + 0.5) * self.FORECAST_CELL_DEG
+        longitude = (cell[1] + 0.5) * self.FORECAST_CELL_DEG
+        url = f"{self.base_url}/forecast"
+        params = {
+            "lat": latitude,
+            "lon": longitude,
+            "appid": self.api_key,
+            "units": "metric"
+        }
+        
+        response = requests.get(url, params=params, timeout=5)
+        response.raise_for_status()
+        
+        logger.info(f"Fetched weather data for ({latitude}, {longitude})")
+        return response.json()
+    
+    @classmethod
+    def _forecast_cell(cls, latitude: float, longitude: float) -> Tuple[int, int]:
+        """Forecast cache cell (row, column) containing a coordinate."""
+        return floor(latitude / cls.FORECAST_CELL_DEG), floor(longitude / cls.FORECAST_CELL_DEG)
+    
+    @classmethod
+    def _next_forecast_step(cls, now: float) -> float:
+        """Epoch time of the next forecast step boundary after `now`."""
+        return (floor(now / cls.FORECAST_STEP_SECONDS) + 1) * cls.FORECAST_STEP_SECONDS
     
     def should_avoid_place(
         self,
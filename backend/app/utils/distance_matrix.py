@@ -0,0 +1,309 @@
+"""
+Precomputed pairwise distance and travel-time matrix for the destination catalog.
+
+The catalog only changes between deploys, so distances are built offline into
+.npy files and memory-mapped at runtime. Every worker process maps the same
+files, so the operating system keeps a single shared copy in the page cache.
+
+The matrix is keyed by the ids planning sees, so build it from the live
+destinations table (the default), or from the CSV the table was seeded from,
+whose ids generate_sql.py shifts by CSV_ID_OFFSET on insert. It also stores
+the coordinates it was built from: lookups pass the places' current
+coordinates, and a place the catalog has since moved makes the lookup miss,
+so callers fall back to haversine until the matrix is rebuilt.
+
+Build (from the backend directory):
+    python -m app.utils.distance_matrix [path/to/new_dataset.csv] [data/distance_matrix]
+"""
+import csv
+import json
+import os
+import sys
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from app.utils.geo import haversine_matrix
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DISTANCE_MATRIX_DIR = os.getenv(
+    "DISTANCE_MATRIX_DIR",
+    os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "distance_matrix"))
+)
+
+ROAD_FACTOR = 1.3  # Road distance vs great circle distance
+AVG_SPEED_KMH = 50  # Average travel speed including stops and traffic
+BUILD_BLOCK_ROWS = 1024  # Rows computed per block while building
+CSV_ID_OFFSET = 500  # generate_sql.py stores CSV id kl_koc_001 as kl_koc_501
+COORD_TOLERANCE_DEG = 1e-5  # ~1 m; larger moves mean the matrix is stale
+
+
+def road_minutes(distance_km):
+    """Estimated road travel time in minutes for great circle distance(s) in km"""
+    return distance_km * ROAD_FACTOR / AVG_SPEED_KMH * 60
+
+
+def offset_id(dest_id: str, offset: int = CSV_ID_OFFSET) -> str:
+    """Id a CSV row gets in the destinations table (same rule as generate_sql.py)"""
+    parts = dest_id.rsplit('_', 1)
+    if len(parts) == 2 and parts[1].isdigit():
+        return f"{parts[0]}_{int(parts[1]) + offset:03d}"
+    return dest_id
+
+
+class DistanceMatrix:
+    """
+    Memory-mapped pairwise matrices keyed by dense destination index.
+    
+    - coords: float64 (lat, lon) per destination the matrices were built from
+    - distance_km: float32 great circle distances in kilometers
+    - travel_minutes: uint16 estimated road travel time in minutes
+    """
+    
+    IDS_FILE = "ids.json"
+    COORDS_FILE = "coords.npy"
+    DISTANCE_FILE = "distance_km.npy"
+    TRAVEL_FILE = "travel_minutes.npy"
+    
+    def __init__(
+        self,
+        ids: List[str],
+        coords: np.ndarray,
+        distance_km: np.ndarray,
+        travel_minutes: np.ndarray
+    ):
+        """Wrap loaded matrices; use load() or build() instead of calling directly."""
+        self.ids = ids
+        self.coords = coords
+        self.distance_km = distance_km
+        self.travel_minutes = travel_minutes
+        self._index = {dest_id: i for i, dest_id in enumerate(ids)}
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def __contains__(self, dest_id: str) -> bool:
+        return dest_id in self._index
+    
+    @classmethod
+    def load(cls, directory: str) -> "DistanceMatrix":
+        """
+        Memory-map a matrix previously written by build().
+        
+        Args:
+            directory: Directory containing the matrix files
+        
+        Returns:
+            DistanceMatrix backed by read-only memory maps
+        """
+        with open(os.path.join(directory, cls.IDS_FILE), encoding="utf-8") as f:
+            ids = json.load(f)
+        
+        coords = np.load(os.path.join(directory, cls.COORDS_FILE))
+        distance_km = np.load(os.path.join(directory, cls.DISTANCE_FILE), mmap_mode="r")
+        travel_minutes = np.load(os.path.join(directory, cls.TRAVEL_FILE), mmap_mode="r")
+        return cls(ids, coords, distance_km, travel_minutes)
+    
+    @classmethod
+    def build(
+        cls,
+        ids: Sequence[str],
+        lats: Sequence[float],
+        lons: Sequence[float],
+        directory: str
+    ) -> "DistanceMatrix":
+        """
+        Compute and write the matrices for a catalog.
+        
+        Rows are computed in blocks so memory stays bounded for large catalogs.
+        
+        Args:
+            ids: Destination ids, defining the dense index order
+            lats, lons: Destination coordinates in degrees
+            directory: Output directory (created if missing)
+        
+        Returns:
+            The freshly written matrix, memory-mapped
+        """
+        os.makedirs(directory, exist_ok=True)
+        n = len(ids)
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        
+        distance_km = np.lib.format.open_memmap(
+            os.path.join(directory, cls.DISTANCE_FILE), mode="w+", dtype=np.float32, shape=(n, n)
+        )
+        travel_minutes = np.lib.format.open_memmap(
+            os.path.join(directory, cls.TRAVEL_FILE), mode="w+", dtype=np.uint16, shape=(n, n)
+        )
+        
+        for start in range(0, n, BUILD_BLOCK_ROWS):
+            stop = min(start + BUILD_BLOCK_ROWS, n)
+            block = haversine_matrix(lats[start:stop], lons[start:stop], lats, lons)
+            distance_km[start:stop] = block
+            minutes = np.rint(road_minutes(block))
+            travel_minutes[start:stop] = np.minimum(minutes, np.iinfo(np.uint16).max)
+        
+        distance_km.flush()
+        travel_minutes.flush()
+        del distance_km, travel_minutes
+        np.save(os.path.join(directory, cls.COORDS_FILE), np.column_stack((lats, lons)))
+        
+        with open(os.path.join(directory, cls.IDS_FILE), "w", encoding="utf-8") as f:
+            json.dump(list(ids), f)
+        
+        logger.info(f"Built {n}x{n} distance matrix in {directory}")
+        return cls.load(directory)
+    
+    def indices(
+        self,
+        dest_ids: Sequence[str],
+        coords: Optional[Sequence[Tuple[float, float]]] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Dense indices for ids.
+        
+        Args:
+            dest_ids: Destination ids
+            coords: Current (lat, lon) of each id, checked against the
+                coordinates the matrix was built from (None to skip)
+        
+        Returns:
+            Index array, or None if any id is unknown or has moved
+        """
+        try:
+            idx = np.fromiter((self._index[dest_id] for dest_id in dest_ids), dtype=np.intp)
+        except KeyError:
+            return None
+        if coords is not None and not np.allclose(
+            self.coords[idx], np.asarray(coords, dtype=np.float64).reshape(-1, 2),
+            rtol=0, atol=COORD_TOLERANCE_DEG
+        ):
+            return None
+        return idx
+    
+    def submatrix(
+        self,
+        dest_ids: Sequence[str],
+        coords: Optional[Sequence[Tuple[float, float]]] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Pairwise distances (km) among the given ids.
+        
+        Returns:
+            float64 array of shape (len(ids), len(ids)), or None if any id is
+            unknown or does not match coords
+        """
+        idx = self.indices(dest_ids, coords)
+        if idx is None:
+            return None
+        return np.asarray(self.distance_km[np.ix_(idx, idx)], dtype=np.float64)
+    
+    def travel_submatrix(
+        self,
+        dest_ids: Sequence[str],
+        coords: Optional[Sequence[Tuple[float, float]]] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Pairwise travel times (minutes) among the given ids.
+        
+        Returns:
+            float64 array of shape (len(ids), len(ids)), or None if any id is
+            unknown or does not match coords
+        """
+        idx = self.indices(dest_ids, coords)
+        if idx is None:
+            return None
+        return np.asarray(self.travel_minutes[np.ix_(idx, idx)], dtype=np.float64)
+    
+    def row(
+        self,
+        from_id: str,
+        to_ids: Sequence[str],
+        coords: Optional[Sequence[Tuple[float, float]]] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Distances (km) from one id to many ids.
+        
+        Args:
+            from_id: Origin id
+            to_ids: Target ids
+            coords: Current (lat, lon) of the origin followed by each target
+                (None to skip the check)
+        
+        Returns:
+            float64 array of length len(to_ids), or None if any id is unknown
+            or does not match coords
+        """
+        idx = self.indices([from_id, *to_ids], coords)
+        if idx is None:
+            return None
+        return np.asarray(self.distance_km[idx[0], idx[1:]], dtype=np.float64)
+
+
+_distance_matrix = None
+_distance_matrix_loaded = False
+
+
+def get_distance_matrix() -> Optional[DistanceMatrix]:
+    """
+    Process-wide catalog matrix, loaded on first use.
+    
+    Returns:
+        DistanceMatrix, or None if it has not been built for this deploy
+    """
+    global _distance_matrix, _distance_matrix_loaded
+    if not _distance_matrix_loaded:
+        _distance_matrix_loaded = True
+        try:
+            _distance_matrix = DistanceMatrix.load(DISTANCE_MATRIX_DIR)
+            logger.info(f"Loaded {len(_distance_matrix)}-destination distance matrix")
+        except FileNotFoundError:
+            logger.info(
+                f"No distance matrix (or one without {DistanceMatrix.COORDS_FILE}; rebuild it) "
+                f"at {DISTANCE_MATRIX_DIR}; computing distances on the fly"
+            )
+    return _distance_matrix
+
+
+def build_from_csv(csv_path: str, directory: str, id_offset: int = CSV_ID_OFFSET) -> DistanceMatrix:
+    """
+    Build the matrix for a destinations CSV (id, latitude, longitude columns).
+    
+    Args:
+        csv_path: CSV the destinations table was seeded from
+        directory: Output directory
+        id_offset: Shift applied to CSV ids on insert (0 to keep them as they are)
+    """
+    ids, lats, lons = [], [], []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            ids.append(offset_id(row["id"], id_offset) if id_offset else row["id"])
+            lats.append(float(row["latitude"]))
+            lons.append(float(row["longitude"]))
+    return DistanceMatrix.build(ids, lats, lons, directory)
+
+
+def build_from_catalog(directory: str) -> DistanceMatrix:
+    """Build the matrix for the rows currently in the Supabase destinations table."""
+    from app.integrations.destination_catalog import get_destination_catalog
+    
+    catalog = get_destination_catalog()
+    catalog.refresh(force=True)
+    if catalog.snapshot is None:
+        raise RuntimeError("Could not load the destinations table")
+    
+    places = catalog.snapshot.places
+    return DistanceMatrix.build(
+        [place.id for place in places],
+        [place.latitude for place in places],
+        [place.longitude for place in places],
+        directory
+    )
+
+
+if __name__ == "__main__":
+    csv_path = next((arg for arg in sys.argv[1:] if arg.endswith(".csv")), None)
+    out_dir = next((arg for arg in sys.argv[1:] if not arg.endswith(".csv")), DISTANCE_MATRIX_DIR)
+    matrix = build_from_csv(csv_path, out_dir) if csv_path else build_from_catalog(out_dir)
+    print(f"Wrote {len(matrix)}x{len(matrix)} distance matrix to {os.path.abspath(out_dir)}")
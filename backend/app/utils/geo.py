@@ -0,0 +1,104 @@
+"""
+Geodesic distance helpers shared by scoring, filtering and routing.
+Scalar haversine for single pairs, NumPy-vectorized kernels for arrays.
+"""
+from math import radians, degrees, sin, cos, asin, sqrt, pi
+from typing import Sequence, Tuple
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Calculate great circle distance between two points on earth (in kilometers).
+    """
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(min(a, 1.0)))
+
+
+def haversine_one_to_many(
+    lat: float,
+    lon: float,
+    lats: Sequence[float],
+    lons: Sequence[float]
+) -> np.ndarray:
+    """
+    Distances from one point to many points.
+    
+    Args:
+        lat, lon: Origin coordinates in degrees
+        lats, lons: Target coordinates in degrees (equal length)
+    
+    Returns:
+        Array of distances in kilometers, one per target
+    """
+    lat_rad = np.radians(lat)
+    lats_rad = np.radians(np.asarray(lats, dtype=np.float64))
+    lons_rad = np.radians(np.asarray(lons, dtype=np.float64))
+    
+    a = (
+        np.sin((lats_rad - lat_rad) / 2) ** 2
+        + np.cos(lat_rad) * np.cos(lats_rad) * np.sin((lons_rad - np.radians(lon)) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def haversine_matrix(
+    lats1: Sequence[float],
+    lons1: Sequence[float],
+    lats2: Sequence[float] = None,
+    lons2: Sequence[float] = None
+) -> np.ndarray:
+    """
+    Pairwise distances between two point sets.
+    
+    Args:
+        lats1, lons1: First point set in degrees
+        lats2, lons2: Second point set in degrees (defaults to the first set)
+    
+    Returns:
+        Array of shape (len(lats1), len(lats2)) with distances in kilometers
+    """
+    if lats2 is None or lons2 is None:
+        lats2, lons2 = lats1, lons1
+    
+    lats1_rad = np.radians(np.asarray(lats1, dtype=np.float64))[:, None]
+    lons1_rad = np.radians(np.asarray(lons1, dtype=np.float64))[:, None]
+    lats2_rad = np.radians(np.asarray(lats2, dtype=np.float64))[None, :]
+    lons2_rad = np.radians(np.asarray(lons2, dtype=np.float64))[None, :]
+    
+    a = (
+        np.sin((lats2_rad - lats1_rad) / 2) ** 2
+        + np.cos(lats1_rad) * np.cos(lats2_rad) * np.sin((lons2_rad - lons1_rad) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Smallest lat/lon box containing every point within radius_km of (lat, lon).
+    
+    Args:
+        lat, lon: Center coordinates
+        radius_km: Search radius in kilometers
+    
+    Returns:
+        Tuple of (min_lat, max_lat, min_lon, max_lon). Longitudes are not
+        wrapped, so min_lon may be below -180 or max_lon above 180 near the
+        antimeridian; the full range (-180, 180) is returned near the poles.
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    min_lat = lat - degrees(angular)
+    max_lat = lat + degrees(angular)
+    
+    if min_lat <= -90 or max_lat >= 90 or angular >= pi:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+    
+    ratio = sin(angular) / cos(radians(lat))
+    if ratio >= 1:
+        return min_lat, max_lat, -180.0, 180.0
+    
+    delta_lon = degrees(asin(ratio))
+    return min_lat, max_lat, lon - delta_lon, lon + delta_lon
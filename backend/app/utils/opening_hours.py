@@ -0,0 +1,90 @@
+"""
+Opening hours parsing into minute-of-day intervals.
+
+Catalog strings such as "9 AM - 6 PM", "09:00-18:00", "6 AM - 12 PM, 4 PM - 9 PM"
+or "Open 24 hours" are compiled once into sorted (open, close) pairs of
+minutes after midnight, so scheduling only compares numbers. The catalog
+repeats a handful of distinct strings, so results are memoized.
+"""
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+ALWAYS_OPEN: Tuple[Tuple[int, int], ...] = ((0, MINUTES_PER_DAY),)
+CLOSED: Tuple[Tuple[int, int], ...] = ()
+
+_ALWAYS_OPEN_PATTERN = re.compile(r"24\s*(hours|hrs|x\s*7|/\s*7)|always open|open all day")
+_CLOSED_PATTERN = re.compile(r"^(closed|permanently closed|temporarily closed)$")
+_TIME = r"(\d{1,2})(?:[:.](\d{2}))?\s*(a\.?m\.?|p\.?m\.?)?|(noon|midnight|sunrise|sunset)"
+_RANGE_PATTERN = re.compile(rf"(?:{_TIME})\s*(?:-|–|—|to|till|until)\s*(?:{_TIME})")
+_NAMED_TIMES = {"noon": 12 * 60, "midnight": 0, "sunrise": 6 * 60, "sunset": 18 * 60}
+
+
+def _minutes(hour: Optional[str], minute: Optional[str], meridiem: Optional[str], name: Optional[str]) -> int:
+    """Minute of day for one matched time."""
+    if name:
+        return _NAMED_TIMES[name]
+    hour, minute = int(hour), int(minute or 0)
+    if meridiem:
+        hour %= 12
+        if meridiem.startswith("p"):
+            hour += 12
+    return min(hour * 60 + minute, MINUTES_PER_DAY)
+
+
+@lru_cache(maxsize=1024)
+def parse_opening_hours(text: Optional[str]) -> Optional[Tuple[Tuple[int, int], ...]]:
+    """
+    Compile an opening hours string into minute-of-day intervals.
+    
+    A range without AM/PM on its opening time takes the closing time's
+    meridiem when that keeps it before closing ("9 - 6 PM"). Ranges past
+    midnight are split in two, and overlapping ranges are merged.
+    
+    Args:
+        text: Opening hours as written in the catalog
+    
+    Returns:
+        Sorted, non-overlapping (open, close) minute pairs; CLOSED for a
+        closed place, or None when there is no (recognizable) constraint
+    """
+    if not text or not text.strip():
+        return None
+    text = text.strip().lower()
+    if _ALWAYS_OPEN_PATTERN.search(text):
+        return ALWAYS_OPEN
+    if _CLOSED_PATTERN.match(text):
+        return CLOSED
+    
+    intervals = []
+    for match in _RANGE_PATTERN.finditer(text):
+        open_hour, open_minute, open_meridiem, open_name = match.group(1, 2, 3, 4)
+        close_hour, close_minute, close_meridiem, close_name = match.group(5, 6, 7, 8)
+        close = _minutes(close_hour, close_minute, close_meridiem, close_name)
+        opening = _minutes(open_hour, open_minute, open_meridiem, open_name)
+        if open_hour and not open_meridiem and close_meridiem:
+            inherited = _minutes(open_hour, open_minute, close_meridiem, None)
+            if inherited < close:
+                opening = inherited
+        
+        if opening < close:
+            intervals.append((opening, close))
+        elif opening > close:
+            # Open past midnight: the evening part and the early-morning part
+            intervals.append((opening, MINUTES_PER_DAY))
+            if close > 0:
+                intervals.append((0, close))
+        else:
+            intervals.append((0, MINUTES_PER_DAY))
+    
+    if not intervals:
+        return None
+    
+    merged = []
+    for opening, close in sorted(intervals):
+        if merged and opening <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], close))
+        else:
+            merged.append((opening, close))
+    return tuple(merged)
@@ -0,0 +1,163 @@
+"""
+Spatial index for fast radius and nearest-neighbour queries over coordinates.
+Uses a uniform latitude/longitude grid so only nearby cells are distance-checked.
+"""
+from math import floor, pi
+from typing import Any, Dict, List, Tuple
+from app.utils.geo import EARTH_RADIUS_KM, bounding_box, haversine_one_to_many
+
+
+class SpatialIndex:
+    """
+    Grid index over (lat, lon) points.
+    
+    Points are bucketed into square cells of `cell_deg` degrees. A radius query
+    only computes distances for points in cells overlapping the query's
+    bounding box, and a k-nearest query grows the radius until k points are
+    found, so both run in time proportional to the local density instead of
+    the catalog size.
+    
+    Points can be removed (e.g. visited places during tour construction);
+    emptied cells are dropped so later queries skip them.
+    """
+    
+    def __init__(self, cell_deg: float = 0.5):
+        """Create an empty index with the given cell size in degrees."""
+        self.cell_deg = cell_deg
+        self._lon_cells = int(round(360 / cell_deg))
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._points: List[Tuple[float, float]] = []
+        self._items: List[Any] = []
+        self._removed = 0
+    
+    def __len__(self) -> int:
+        return len(self._items) - self._removed
+    
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        """Grid cell (row, column) for a coordinate."""
+        return floor(lat / self.cell_deg), floor(lon / self.cell_deg) % self._lon_cells
+    
+    def insert(self, lat: float, lon: float, item: Any) -> int:
+        """
+        Add a point to the index.
+        
+        Args:
+            lat, lon: Point coordinates
+            item: Payload returned by queries (e.g. a destination dict)
+        
+        Returns:
+            Dense position of the point within the index
+        """
+        position = len(self._items)
+        self._points.append((lat, lon))
+        self._items.append(item)
+        self._cells.setdefault(self._cell(lat, lon), []).append(position)
+        return position
+    
+    def remove(self, position: int):
+        """
+        Remove a point so queries no longer return it.
+        
+        Args:
+            position: Position returned by insert
+        """
+        cell = self._cell(*self._points[position])
+        positions = self._cells[cell]
+        positions.remove(position)
+        if not positions:
+            del self._cells[cell]
+        self._removed += 1
+    
+    @classmethod
+    def from_items(cls, items: List[Any], key, cell_deg: float = 0.5) -> "SpatialIndex":
+        """
+        Build an index from items.
+        
+        Args:
+            items: Objects to index
+            key: Callable returning (lat, lon) for an item
+            cell_deg: Grid cell size in degrees
+        
+        Returns:
+            Populated SpatialIndex
+        """
+        index = cls(cell_deg)
+        for item in items:
+            lat, lon = key(item)
+            index.insert(lat, lon, item)
+        return index
+    
+    def _candidate_positions(self, lat: float, lon: float, radius_km: float) -> List[int]:
+        """Positions of points in cells overlapping the query bounding box."""
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+        min_row, max_row = floor(min_lat / self.cell_deg), floor(max_lat / self.cell_deg)
+        min_col, max_col = floor(min_lon / self.cell_deg), floor(max_lon / self.cell_deg)
+        col_span = min(max_col - min_col + 1, self._lon_cells)
+        
+        # Large boxes: walking occupied cells is cheaper than walking the box
+        if (max_row - min_row + 1) * col_span > len(self._cells):
+            cols = {(min_col + i) % self._lon_cells for i in range(col_span)} \
+                if col_span < self._lon_cells else None
+            return [
+                position
+                for (row, col), positions in self._cells.items()
+                if min_row <= row <= max_row and (cols is None or col in cols)
+                for position in positions
+            ]
+        
+        candidates = []
+        for row in range(min_row, max_row + 1):
+            for i in range(col_span):
+                positions = self._cells.get((row, (min_col + i) % self._lon_cells))
+                if positions:
+                    candidates.extend(positions)
+        return candidates
+    
+    def within_radius(self, lat: float, lon: float, radius_km: float) -> List[Tuple[float, Any]]:
+        """
+        All points within radius_km of (lat, lon).
+        
+        Args:
+            lat, lon: Query coordinates
+            radius_km: Search radius in kilometers
+        
+        Returns:
+            List of (distance_km, item) tuples sorted by distance ascending
+        """
+        candidates = self._candidate_positions(lat, lon, radius_km)
+        if not candidates:
+            return []
+        
+        distances = haversine_one_to_many(
+            lat, lon,
+            [self._points[position][0] for position in candidates],
+            [self._points[position][1] for position in candidates]
+        )
+        results = sorted(
+            (float(distance), position)
+            for distance, position in zip(distances, candidates)
+            if distance <= radius_km
+        )
+        return [(distance, self._items[position]) for distance, position in results]
+    
+    def nearest(self, lat: float, lon: float, k: int = 1) -> List[Tuple[float, Any]]:
+        """
+        The k points closest to (lat, lon).
+        
+        Args:
+            lat, lon: Query coordinates
+            k: Number of neighbours to return
+        
+        Returns:
+            Up to k (distance_km, item) tuples sorted by distance ascending
+        """
+        if k <= 0 or not len(self):
+            return []
+        
+        max_radius = EARTH_RADIUS_KM * pi
+        radius = self.cell_deg * 111.0
+        while True:
+            found = self.within_radius(lat, lon, radius)
+            if len(found) >= k or radius >= max_radius:
+                return found[:k]
+            radius = min(radius * 2, max_radius)
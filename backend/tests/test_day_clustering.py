@@ -0,0 +1,79 @@
+"""
+Tests for capacitated geographic clustering of places into days.
+"""
+import numpy as np
+import pytest
+from app.services.day_clustering import balanced_kmeans, extend_clusters, order_clusters, project_km
+
+
+def test_project_km_distances():
+    points = project_km([15.0, 15.0, 16.0], [73.0, 74.0, 73.0])
+    
+    # One degree of latitude is ~111 km; a degree of longitude shrinks with cos(lat)
+    assert np.linalg.norm(points[2] - points[0]) == pytest.approx(111.2, abs=0.1)
+    assert np.linalg.norm(points[1] - points[0]) == pytest.approx(111.2 * np.cos(np.radians(15.333)), abs=0.1)
+
+
+def test_separates_distant_groups():
+    rng = np.random.default_rng(0)
+    points = np.vstack([rng.normal(center, 1.0, size=(6, 2)) for center in ([0, 0], [100, 0], [0, 100])])
+    
+    labels = balanced_kmeans(points, np.full(18, 60.0), 3)
+    
+    groups = [set(labels[i * 6:(i + 1) * 6]) for i in range(3)]
+    assert all(len(group) == 1 for group in groups)
+    assert set.union(*groups) == {0, 1, 2}
+
+
+def test_respects_capacity():
+    rng = np.random.default_rng(1)
+    points = rng.uniform(0, 50, size=(40, 2))
+    weights = rng.choice([60.0, 120.0, 180.0], 40)
+    capacity = weights.sum() / 4 * 1.15
+    
+    labels = balanced_kmeans(points, weights, 4, capacity=capacity)
+    
+    for c in range(4):
+        assert weights[labels == c].sum() <= max(capacity, weights.max())
+
+
+def test_is_repeatable():
+    points = np.random.default_rng(2).uniform(0, 50, size=(30, 2))
+    
+    first = balanced_kmeans(points, np.full(30, 90.0), 5)
+    second = balanced_kmeans(points, np.full(30, 90.0), 5)
+    
+    assert np.array_equal(first, second)
+
+
+def test_extend_keeps_fixed_labels_and_seeds_new_clusters():
+    rng = np.random.default_rng(3)
+    points = np.vstack([rng.normal(center, 1.0, size=(6, 2)) for center in ([0, 0], [50, 0], [0, 50])])
+    labels = np.repeat([0, 1, -1], 6)
+    
+    extended = extend_clusters(points, np.full(18, 60.0), labels, 3, capacity=6 * 60.0)
+    
+    assert np.array_equal(extended[:12], labels[:12])
+    assert set(extended[12:]) == {2}
+
+
+def test_extend_joins_nearest_cluster_with_room():
+    points = np.array([[0.0, 0], [1, 0], [40, 0], [41, 0], [2, 0], [3, 0]])
+    labels = np.array([0, 0, 1, 1, -1, -1])
+    
+    extended = extend_clusters(points, np.full(6, 60.0), labels, 2, capacity=180.0)
+    
+    # The first new point fits next to its neighbours, the second has to go elsewhere
+    assert list(extended) == [0, 0, 1, 1, 0, 1]
+
+
+def test_edge_sizes():
+    assert len(balanced_kmeans(np.empty((0, 2)), [], 3)) == 0
+    assert set(balanced_kmeans(np.zeros((2, 2)), [60.0, 60.0], 5)) <= {0, 1}
+
+
+def test_order_clusters_nearest_first():
+    points = np.array([[30.0, 0], [10.0, 0], [20.0, 0]])
+    labels = np.array([0, 1, 2])
+    
+    assert order_clusters(points, labels, 4, np.zeros(2)) == [1, 2, 0, 3]
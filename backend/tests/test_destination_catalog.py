@@ -0,0 +1,178 @@
+"""
+Tests for the in-memory destination catalog: refresh, version bumps and lookups.
+"""
+from types import SimpleNamespace
+import pytest
+from app.integrations import destination_catalog
+from app.integrations.destination_catalog import CatalogSnapshot, DestinationCatalog
+from app.integrations.supabase_service import row_to_place
+
+
+class FakeQuery:
+    """Chainable stand-in for the PostgREST queries the catalog sends."""
+    
+    def __init__(self, client):
+        self.client = client
+        self.count = None
+        self.key, self.desc = None, False
+        self.start, self.end = 0, None
+    
+    def select(self, columns, count=None):
+        self.count = count
+        return self
+    
+    def order(self, column, desc=False):
+        self.key, self.desc = column, desc
+        return self
+    
+    def limit(self, n):
+        self.end = n - 1
+        return self
+    
+    def range(self, start, end):
+        self.start, self.end = start, end
+        return self
+    
+    def execute(self):
+        self.client.calls.append(self.key)
+        rows = self.client.rows
+        if self.key == 'id':
+            # Postgres orders the TEXT id column by its collation, not by str()
+            rows = sorted(rows, key=self.client.id_order)
+        elif self.key is not None:
+            rows = sorted(rows, key=lambda row: row[self.key], reverse=self.desc)
+        end = len(rows) if self.end is None else self.end + 1
+        return SimpleNamespace(
+            data=rows[self.start:end],
+            count=len(self.client.rows) if self.count else None
+        )
+
+
+class FakeClient:
+    def __init__(self, rows, id_order=lambda row: row['id']):
+        self.rows = rows
+        self.id_order = id_order
+        self.calls = []
+    
+    def table(self, name):
+        assert name == 'destinations'
+        return FakeQuery(self)
+
+
+def row(dest_id, lat, lon, categories=('Beach',), updated_at='2024-01-01'):
+    return {
+        'id': dest_id, 'name': f'Place {dest_id}', 'categories': list(categories),
+        'latitude': lat, 'longitude': lon, 'rating': 4.0, 'cost_per_day': 500,
+        'updated_at': updated_at
+    }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = FakeClient([
+        row('goa_001', 15.50, 73.80, ('Beach', 'Food')),
+        row('goa_002', 15.52, 73.82, ('history', 'beach')),
+        row('goa_003', 15.60, 73.75, ('Nature',)),
+        row('del_001', 28.61, 77.21, ('history',)),
+    ])
+    monkeypatch.setattr(destination_catalog, "get_supabase_client", lambda: fake)
+    return fake
+
+
+def test_refresh_loads_once_until_version_changes(client):
+    catalog = DestinationCatalog()
+    assert catalog.fetch_places(['beach']) is None
+    
+    assert catalog.refresh() is True
+    first = catalog.snapshot
+    assert len(first) == 4
+    assert catalog.refresh() is False
+    assert catalog.snapshot is first
+    
+    client.rows.append(row('goa_004', 15.55, 73.78, ('beach',), updated_at='2024-02-01'))
+    assert catalog.refresh() is True
+    assert catalog.snapshot is not first
+    assert len(catalog.snapshot) == 5
+    assert catalog.snapshot.version == (5, '2024-02-01')
+
+
+def test_refresh_force_and_expired_snapshot_reload(client):
+    catalog = DestinationCatalog(ttl_seconds=0)
+    assert catalog.refresh() is True
+    assert catalog.refresh() is True  # Expired immediately
+    
+    catalog.ttl_seconds = 3600
+    assert catalog.refresh() is False
+    assert catalog.refresh(force=True) is True
+
+
+def test_refresh_without_client_keeps_snapshot(client, monkeypatch):
+    catalog = DestinationCatalog()
+    catalog.refresh()
+    snapshot = catalog.snapshot
+    monkeypatch.setattr(destination_catalog, "get_supabase_client", lambda: None)
+    assert catalog.refresh(force=True) is False
+    assert catalog.snapshot is snapshot
+
+
+def test_lookup_by_radius_and_category(client):
+    catalog = DestinationCatalog()
+    catalog.refresh()
+    
+    nearby = catalog.fetch_places(['beach'], 50, 15.5, 73.8, 10)
+    assert [p.id for p in nearby] == ['goa_001', 'goa_002']
+    
+    everywhere = catalog.fetch_places(['history'], 50, None, None, 10)
+    assert [p.id for p in everywhere] == ['del_001', 'goa_002']
+    
+    assert [p.id for p in catalog.fetch_places(None, 2, 15.5, 73.8, 50)] == ['goa_001', 'goa_002']
+    
+    # No nearby match for the preferences: nearby places of any category
+    fallback = catalog.fetch_places(['shopping'], 50, 15.5, 73.8, 50)
+    assert [p.id for p in fallback] == ['goa_001', 'goa_002', 'goa_003']
+
+
+def test_category_index_is_lowercase():
+    snapshot = CatalogSnapshot([row('a', 15.5, 73.8, ('Beach', 'BEACH', 'Food'))], (1, None))
+    assert snapshot._by_category == {'beach': [0], 'food': [0]}
+    assert [p.id for p in snapshot.query(['BEACH'], 10, None, None, 10)] == ['a']
+
+
+def test_places_keep_database_id_order():
+    rows = [row(dest_id, 15.5, 73.8) for dest_id in ('b_10', 'b_9', 'a_2')]
+    snapshot = CatalogSnapshot(rows, (3, None))
+    assert [p.id for p in snapshot.places] == ['b_10', 'b_9', 'a_2']
+    assert [p.id for p in snapshot.query(['beach'], 10, 15.5, 73.8, 10)] == ['b_10', 'b_9', 'a_2']
+
+
+def test_loaded_rows_follow_database_order(monkeypatch):
+    # Numeric-looking ids in a TEXT column: '10' < '9' as strings
+    fake = FakeClient([row(str(i), 15.5, 73.8) for i in (9, 10, 11)],
+                      id_order=lambda r: int(r['id']))
+    monkeypatch.setattr(destination_catalog, "get_supabase_client", lambda: fake)
+    catalog = DestinationCatalog()
+    catalog.refresh()
+    assert [p.id for p in catalog.fetch_places()] == ['9', '10', '11']
+
+
+def test_places_are_built_once_per_snapshot(client, monkeypatch):
+    catalog = DestinationCatalog()
+    catalog.refresh()
+    
+    def fail(*args, **kwargs):
+        raise AssertionError("rows converted per query")
+    
+    monkeypatch.setattr(destination_catalog, "row_to_place", fail)
+    first = catalog.fetch_places(['nature'], 50, 15.5, 73.8, 50)
+    assert first[0] in catalog.snapshot.places
+    assert catalog.fetch_places(['nature'], 50, 15.5, 73.8, 50)[0] is first[0]
+
+
+@pytest.mark.parametrize("preferences", [None, ['beach'], ['food'], ['history'], ['history', 'food']])
+def test_primary_category_matches_row_to_place(client, preferences):
+    catalog = DestinationCatalog()
+    catalog.refresh()
+    
+    by_id = {r['id']: r for r in client.rows}
+    for place in catalog.fetch_places(preferences, 50, 15.5, 73.8, 50):
+        assert place.dict() == row_to_place(by_id[place.id], preferences).dict()
@@ -0,0 +1,75 @@
+"""
+Tests for the precomputed catalog distance matrix.
+"""
+import numpy as np
+import pytest
+from app.models.schemas import PlaceModel, PreferenceEnum
+from app.services.route_optimizer import RouteOptimizer
+from app.utils import distance_matrix
+from app.utils.distance_matrix import DistanceMatrix, build_from_csv, offset_id, road_minutes
+from app.utils.geo import haversine_matrix
+
+IDS = ["goa_501", "goa_502", "goa_503", "kl_koc_501"]
+LATS = [15.55, 15.60, 15.28, 9.97]
+LONS = [73.75, 73.74, 73.92, 76.28]
+
+
+@pytest.fixture
+def matrix(tmp_path):
+    return DistanceMatrix.build(IDS, LATS, LONS, str(tmp_path / "matrix"))
+
+
+def test_matches_haversine(matrix):
+    expected = haversine_matrix(LATS, LONS)
+    
+    assert matrix.submatrix(IDS) == pytest.approx(expected, rel=1e-6, abs=1e-3)
+    assert matrix.submatrix(["goa_503", "goa_501"]) == pytest.approx(expected[np.ix_([2, 0], [2, 0])], rel=1e-6)
+    assert matrix.row("goa_501", ["kl_koc_501", "goa_502"]) == pytest.approx(expected[0, [3, 1]], rel=1e-6)
+    assert matrix.travel_submatrix(IDS) == pytest.approx(np.rint(road_minutes(expected)))
+
+
+def test_unknown_ids_miss(matrix):
+    assert matrix.submatrix(["goa_501", "goa_999"]) is None
+    assert matrix.row("goa_999", ["goa_501"]) is None
+    assert "goa_501" in matrix and "goa_999" not in matrix
+
+
+def test_moved_places_miss(matrix):
+    coords = list(zip(LATS, LONS))
+    assert matrix.submatrix(IDS, coords) is not None
+    
+    coords[1] = (15.61, 73.74)  # Moved ~1 km since the build
+    assert matrix.submatrix(IDS, coords) is None
+    assert matrix.travel_submatrix(IDS, coords) is None
+    assert matrix.row("goa_501", IDS[1:], coords) is None
+
+
+def test_route_optimizer_falls_back_for_moved_places(matrix, monkeypatch):
+    monkeypatch.setattr(distance_matrix, "_distance_matrix", matrix)
+    monkeypatch.setattr(distance_matrix, "_distance_matrix_loaded", True)
+    places = [
+        PlaceModel(id=dest_id, name=dest_id, category=PreferenceEnum.BEACH, latitude=lat, longitude=lon)
+        for dest_id, lat, lon in zip(IDS, LATS, LONS)
+    ]
+    stale = [place.copy(update={"latitude": place.latitude + 1}) for place in places]
+    
+    dist = RouteOptimizer.pairwise_distances(stale)
+    
+    assert dist == pytest.approx(haversine_matrix([p.latitude for p in stale], [p.longitude for p in stale]))
+    assert not np.allclose(dist, RouteOptimizer.pairwise_distances(places))
+
+
+def test_offset_id():
+    assert offset_id("kl_koc_001") == "kl_koc_501"
+    assert offset_id("goa_12", 500) == "goa_512"
+    assert offset_id("custom") == "custom"
+
+
+def test_build_from_csv_offsets_ids(tmp_path):
+    csv_path = tmp_path / "dataset.csv"
+    csv_path.write_text("id,name,latitude,longitude\nkl_koc_001,Fort,9.97,76.28\nkl_koc_002,Beach,9.96,76.24\n")
+    
+    matrix = build_from_csv(str(csv_path), str(tmp_path / "matrix"))
+    
+    assert matrix.ids == ["kl_koc_501", "kl_koc_502"]
+    assert DistanceMatrix.load(str(tmp_path / "matrix")).submatrix(matrix.ids).shape == (2, 2)
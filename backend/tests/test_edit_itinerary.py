@@ -0,0 +1,143 @@
+"""
+Tests for the /api/edit-itinerary endpoint.
+"""
+import json
+from datetime import date
+import numpy as np
+import pytest
+
+pytest.importorskip("app.config", reason="needs the deployment's app/config.py settings")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from app.models.schemas import ItineraryItemRequest, PlaceModel  # noqa: E402
+from app.routes import trip_planning  # noqa: E402
+from app.services.trip_planning_service import TripPlanningService  # noqa: E402
+
+CENTER = (15.3, 74.1)
+HOURS = ["9 AM - 6 PM", "10 AM - 5 PM", "6 AM - 12 PM, 4 PM - 9 PM", None]
+
+
+def make_places(n, seed=0):
+    rng = np.random.default_rng(seed)
+    categories = ["history", "food", "cultural"]
+    return [
+        PlaceModel(
+            id=f"p{i}", name=f"Place {i}", category=categories[i % len(categories)],
+            latitude=CENTER[0] + rng.uniform(-0.1, 0.1), longitude=CENTER[1] + rng.uniform(-0.1, 0.1),
+            estimated_cost=500, opening_hours=HOURS[i % len(HOURS)]
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Route module service over fixed candidates, without the shared itinerary cache"""
+    places = make_places(24)
+    service = TripPlanningService()
+    monkeypatch.setattr(service, "_catalog_version", lambda: None)
+    monkeypatch.setattr(
+        service.place_fetcher, "fetch_places_by_preferences", lambda *args, **kwargs: list(places)
+    )
+    monkeypatch.setattr(trip_planning, "trip_service", service)
+    return service
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(trip_planning.router)
+    return TestClient(app)
+
+
+def plan(service, routing_mode):
+    return service.plan_trip(ItineraryItemRequest(
+        start_date=date(2026, 2, 1), end_date=date(2026, 2, 3), budget=20000,
+        preferences=["history", "food", "cultural"], latitude=CENTER[0], longitude=CENTER[1],
+        routing_mode=routing_mode
+    ))
+
+
+def minutes(clock):
+    hours, minutes, _ = map(int, clock.split(":"))
+    return hours * 60 + minutes
+
+
+def assert_within_opening_hours(day):
+    assert [stop["place_id"] for stop in day["stops"]] == [place["id"] for place in day["places"]]
+    for place, stop in zip(day["places"], day["stops"]):
+        intervals = place["open_intervals"] or [(0, 24 * 60)]
+        start, end = minutes(stop["start_time"]), minutes(stop["departure_time"])
+        assert any(opening <= start and end <= close for opening, close in intervals)
+
+
+def test_remove_and_add_reschedule_time_window_days(service, client):
+    itinerary = plan(service, "time_windows")
+    first = itinerary.daily_itineraries[0]
+    removed = first.places[0].id
+    
+    response = client.post("/api/edit-itinerary", json={
+        "trip_id": itinerary.trip_id,
+        "operations": [
+            {"op": "remove", "place_id": removed},
+            {"op": "add", "place_id": "new", "day": 1, "place": {
+                "id": "new", "name": "New", "category": "food",
+                "latitude": CENTER[0], "longitude": CENTER[1], "opening_hours": "11 AM - 3 PM"
+            }}
+        ]
+    })
+    
+    assert response.status_code == 200
+    day = response.json()["daily_itineraries"][0]
+    ids = [place["id"] for place in day["places"]]
+    assert removed not in ids and "new" in ids
+    assert len(day["stops"]) == len(day["places"]) == len(first.places)
+    assert_within_opening_hours(day)
+
+
+def test_edit_that_misses_opening_hours_is_rejected(service, client):
+    itinerary = plan(service, "time_windows")
+    
+    response = client.post("/api/edit-itinerary", json={
+        "trip_id": itinerary.trip_id,
+        "operations": [{"op": "add", "place_id": "shut", "day": 1, "place": {
+            "id": "shut", "name": "Shut", "category": "history",
+            "latitude": CENTER[0], "longitude": CENTER[1], "opening_hours": "Closed"
+        }}]
+    })
+    
+    assert response.status_code == 400
+    assert "opening hours" in response.json()["detail"]
+
+
+def test_distance_itinerary_edits_only_touched_days(service, client):
+    itinerary = plan(service, "distance")
+    moved = itinerary.daily_itineraries[1].places[0].id
+    payload = json.loads(itinerary.json())
+    
+    response = client.post("/api/edit-itinerary", json={
+        "itinerary": payload,
+        "operations": [{"op": "pin", "place_id": moved, "day": 1}]
+    })
+    
+    assert response.status_code == 200
+    days = response.json()["daily_itineraries"]
+    assert moved in [place["id"] for place in days[0]["places"]]
+    assert days[0]["pinned_place_ids"] == [moved]
+    assert all(not day["stops"] for day in days)
+    assert days[2] == payload["daily_itineraries"][2]
+
+
+def test_unknown_trip_and_place(service, client):
+    itinerary = plan(service, "distance")
+    
+    unknown_trip = client.post("/api/edit-itinerary", json={
+        "trip_id": "nope", "operations": [{"op": "remove", "place_id": "p0"}]
+    })
+    unknown_place = client.post("/api/edit-itinerary", json={
+        "trip_id": itinerary.trip_id, "operations": [{"op": "remove", "place_id": "zzz"}]
+    })
+    
+    assert unknown_trip.status_code == 404
+    assert unknown_place.status_code == 400
@@ -0,0 +1,41 @@
+"""
+Tests for the Held-Karp exact route solver.
+"""
+from itertools import permutations
+import numpy as np
+import pytest
+from app.services.exact_tsp import MAX_EXACT_NODES, held_karp
+from app.services.local_search import route_length
+
+
+def random_matrix(n, seed=0):
+    points = np.random.default_rng(seed).uniform(0, 100, size=(n, 2))
+    return np.linalg.norm(points[:, None] - points[None], axis=2)
+
+
+def brute_force(dist, closed):
+    n = dist.shape[0]
+    return min(route_length([0, *rest], dist, closed) for rest in permutations(range(1, n)))
+
+
+@pytest.mark.parametrize("closed", [False, True])
+@pytest.mark.parametrize("n", [2, 3, 5, 7])
+def test_matches_brute_force(n, closed):
+    dist = random_matrix(n, seed=n)
+    
+    length, route = held_karp(dist, closed=closed)
+    
+    assert route[0] == 0
+    assert sorted(route) == list(range(n))
+    assert length == pytest.approx(route_length(route, dist, closed))
+    assert length == pytest.approx(brute_force(dist, closed))
+
+
+def test_trivial_matrices():
+    assert held_karp(np.zeros((0, 0))) == (0.0, [])
+    assert held_karp(np.zeros((1, 1))) == (0.0, [0])
+
+
+def test_rejects_too_many_nodes():
+    with pytest.raises(ValueError):
+        held_karp(random_matrix(MAX_EXACT_NODES + 1))
@@ -0,0 +1,80 @@
+"""
+Tests for the vectorized geodesic kernels against the scalar haversine.
+"""
+import numpy as np
+import pytest
+from app.utils.geo import bounding_box, haversine_distance, haversine_matrix, haversine_one_to_many
+
+
+@pytest.fixture
+def coords():
+    rng = np.random.default_rng(0)
+    lats = np.concatenate((rng.uniform(-89, 89, 40), [0.0, 0.0, 89.9, -89.9]))
+    lons = np.concatenate((rng.uniform(-180, 180, 40), [179.9, -179.9, 0.0, 180.0]))
+    return lats, lons
+
+
+def test_scalar_known_distances():
+    assert haversine_distance(15.5, 73.8, 15.5, 73.8) == 0
+    # Delhi to Mumbai, ~1150 km great circle
+    assert haversine_distance(28.6139, 77.2090, 19.0760, 72.8777) == pytest.approx(1153, abs=5)
+    # Antipodes: half the circumference
+    assert haversine_distance(0, 0, 0, 180) == pytest.approx(np.pi * 6371.0)
+
+
+def test_one_to_many_matches_scalar(coords):
+    lats, lons = coords
+    
+    for lat, lon in zip(lats[:5], lons[:5]):
+        expected = [haversine_distance(lat, lon, la, lo) for la, lo in zip(lats, lons)]
+        assert haversine_one_to_many(lat, lon, lats, lons) == pytest.approx(expected, abs=1e-6)
+
+
+def test_matrix_matches_scalar(coords):
+    lats, lons = coords
+    
+    square = haversine_matrix(lats, lons)
+    rect = haversine_matrix(lats[:7], lons[:7], lats, lons)
+    
+    assert square.shape == (len(lats), len(lats))
+    assert rect.shape == (7, len(lats))
+    for i in range(len(lats)):
+        for j in range(len(lats)):
+            assert square[i, j] == pytest.approx(haversine_distance(lats[i], lons[i], lats[j], lons[j]), abs=1e-6)
+    assert rect == pytest.approx(square[:7], abs=1e-9)
+    assert np.allclose(square, square.T)
+
+
+def test_empty_inputs():
+    assert haversine_one_to_many(15.5, 73.8, [], []).shape == (0,)
+    assert haversine_matrix([], []).shape == (0, 0)
+
+
+@pytest.mark.parametrize("lat, lon, radius_km", [
+    (15.5, 73.8, 50), (60.0, 10.0, 300), (-33.9, 151.2, 1000), (0.0, 179.5, 200), (85.0, 0.0, 800)
+])
+def test_bounding_box_contains_the_circle(lat, lon, radius_km):
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    
+    # Points on the circle (just inside) must fall within the box
+    bearings = np.radians(np.arange(0, 360, 2))
+    angular = radius_km * 0.999 / 6371.0
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lats = np.arcsin(np.sin(lat1) * np.cos(angular) + np.cos(lat1) * np.sin(angular) * np.cos(bearings))
+    lons = lon1 + np.arctan2(
+        np.sin(bearings) * np.sin(angular) * np.cos(lat1),
+        np.cos(angular) - np.sin(lat1) * np.sin(lats)
+    )
+    lats, lons = np.degrees(lats), np.degrees(lons)
+    
+    assert haversine_one_to_many(lat, lon, lats, lons) == pytest.approx(np.full(len(lats), radius_km * 0.999), rel=1e-6)
+    assert ((lats >= min_lat) & (lats <= max_lat)).all()
+    if (min_lon, max_lon) != (-180.0, 180.0):
+        assert ((lons >= min_lon) & (lons <= max_lon)).all()
+
+
+def test_bounding_box_is_tight_at_the_equator():
+    min_lat, max_lat, min_lon, max_lon = bounding_box(0.0, 0.0, 111.195)
+    
+    assert (min_lat, max_lat) == pytest.approx((-1.0, 1.0), abs=1e-3)
+    assert (min_lon, max_lon) == pytest.approx((-1.0, 1.0), abs=1e-3)
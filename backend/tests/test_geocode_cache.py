@@ -0,0 +1,124 @@
+"""
+Tests for the two-tier geocode cache and shared Nominatim lookups.
+"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.integrations import geocode_cache, geocoding_service
+from app.integrations.geocode_cache import NOT_CACHED, GeocodeCache, normalize_place_name
+from app.integrations.geocoding_service import GeocodingService
+
+HAMPI = (15.335, 76.46)
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+    
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(geocode_cache, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return GeocodeCache(path=str(tmp_path / "geocode.sqlite3"), ttl_seconds=100, negative_ttl_seconds=10)
+
+
+def test_normalize_place_name_folds_variants():
+    assert normalize_place_name(" Bengaluru,  Karnataka.") == "bangalore, karnataka"
+    assert normalize_place_name("BOMBAY") == normalize_place_name("mumbai")
+
+
+def test_hit_from_memory(cache, monkeypatch):
+    assert cache.get("Hampi") is NOT_CACHED
+    cache.put("Hampi", HAMPI)
+    
+    def no_disk():
+        raise AssertionError("memory hit read SQLite")
+    
+    monkeypatch.setattr(cache, "_connection", no_disk)
+    assert cache.get(" hampi ") == HAMPI
+
+
+def test_hit_from_disk_after_memory_miss(cache):
+    cache.put("Hampi", HAMPI)
+    cache.put("Atlantis", None)
+    
+    restarted = GeocodeCache(path=cache.path, ttl_seconds=100, negative_ttl_seconds=10)
+    assert restarted.get("HAMPI") == HAMPI
+    assert restarted.get("atlantis") is None
+    assert "hampi" in restarted._memory  # Promoted to memory
+
+
+def test_memory_evicts_least_recently_used(tmp_path, clock):
+    cache = GeocodeCache(path=str(tmp_path / "geocode.sqlite3"), memory_size=2)
+    cache.put("a", (1.0, 1.0))
+    cache.put("b", (2.0, 2.0))
+    cache.get("a")
+    cache.put("c", (3.0, 3.0))
+    assert list(cache._memory) == ["a", "c"]
+    assert cache.get("b") == (2.0, 2.0)  # Still on disk
+
+
+def test_entries_expire_after_ttl(cache, clock):
+    cache.put("Hampi", HAMPI)
+    cache.put("Atlantis", None)
+    
+    clock.now += 11
+    assert cache.get("Atlantis") is NOT_CACHED  # Negative TTL is shorter
+    assert cache.get("Hampi") == HAMPI
+    
+    clock.now += 90
+    assert cache.get("Hampi") is NOT_CACHED
+    assert GeocodeCache(path=cache.path).get("Hampi") is NOT_CACHED
+
+
+@pytest.mark.parametrize("name", ["file/geocode.sqlite3", "."])
+def test_broken_cache_file_is_a_miss(tmp_path, clock, name):
+    (tmp_path / "file").write_text("")
+    # A directory under a regular file, or a directory instead of a database
+    cache = GeocodeCache(path=str(tmp_path / name))
+    cache.put("Hampi", HAMPI)
+    assert GeocodeCache(path=cache.path).get("Hampi") is NOT_CACHED
+    assert cache.get("Hampi") == HAMPI  # Memory still works
+
+
+def test_concurrent_lookups_share_one_request(cache, monkeypatch):
+    calls = []
+    
+    async def query(city_name):
+        calls.append(city_name)
+        await asyncio.sleep(0.01)
+        return HAMPI
+    
+    monkeypatch.setattr(geocoding_service, "get_geocode_cache", lambda: cache)
+    monkeypatch.setattr(GeocodingService, "_query_nominatim", staticmethod(query))
+    
+    async def lookups():
+        names = ["Hampi", "hampi", " HAMPI.", "Hampi"]
+        return await asyncio.gather(*(GeocodingService._lookup_nominatim(name) for name in names))
+    
+    assert asyncio.run(lookups()) == [HAMPI] * 4
+    assert len(calls) == 1
+    assert GeocodingService._in_flight == {}
+    
+    assert asyncio.run(GeocodingService._lookup_nominatim("Hampi")) == HAMPI
+    assert len(calls) == 1  # Answered from the cache
+
+
+def test_failed_lookup_is_not_cached(cache, monkeypatch):
+    async def query(city_name):
+        raise asyncio.TimeoutError()
+    
+    monkeypatch.setattr(geocoding_service, "get_geocode_cache", lambda: cache)
+    monkeypatch.setattr(GeocodingService, "_query_nominatim", staticmethod(query))
+    
+    assert asyncio.run(GeocodingService._lookup_nominatim("Hampi")) is None
+    assert cache.get("Hampi") is NOT_CACHED
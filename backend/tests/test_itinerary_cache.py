@@ -0,0 +1,89 @@
+"""
+Tests for the two-tier itinerary response cache.
+"""
+from datetime import date
+import pytest
+from app.models.schemas import DayItinerary, PlaceModel, PreferenceEnum, TripItineraryResponse
+from app.services.itinerary_cache import ItineraryCache
+
+
+def make_plan(trip_id="trip-1"):
+    place = PlaceModel(
+        id="goa_001", name="Baga Beach", category=PreferenceEnum.BEACH,
+        latitude=15.55, longitude=73.75, estimated_cost=500, opening_hours="9 AM - 6 PM"
+    )
+    itinerary = TripItineraryResponse(
+        trip_id=trip_id,
+        start_date=date(2026, 2, 1),
+        end_date=date(2026, 2, 1),
+        total_days=1,
+        total_estimated_cost=500,
+        daily_itineraries=[DayItinerary(day=1, date=date(2026, 2, 1), places=[place])]
+    )
+    return itinerary, [place]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ItineraryCache(path=str(tmp_path / "itinerary.sqlite3"))
+
+
+def test_hit_from_memory(cache):
+    itinerary, candidates = make_plan()
+    cache.put("key", "v1", itinerary, candidates)
+    
+    cached = cache.get("key", "v1")
+    assert cached is not None
+    assert cached[0] is itinerary
+    assert cache.get("other", "v1") is None
+
+
+def test_hit_from_disk_after_restart(cache):
+    itinerary, candidates = make_plan()
+    cache.put("key", "v1", itinerary, candidates)
+    
+    restarted = ItineraryCache(path=cache.path)
+    cached = restarted.get("key", "v1")
+    assert cached is not None
+    assert cached[0] == itinerary
+    assert [place.id for place in cached[1]] == ["goa_001"]
+    assert cached[1][0].open_intervals == candidates[0].open_intervals
+
+
+def test_catalog_version_change_invalidates(cache):
+    itinerary, candidates = make_plan()
+    cache.put("key", "v1", itinerary, candidates)
+    
+    assert cache.get("key", "v2") is None
+    assert cache._memory == {}  # Memory tier cleared on the new version
+    
+    # Another worker still on the old version keeps reading its row
+    assert ItineraryCache(path=cache.path).get("key", "v1")[0] == itinerary
+
+
+def test_version_change_only_drops_expired_rows(tmp_path):
+    path = str(tmp_path / "itinerary.sqlite3")
+    ItineraryCache(path=path, ttl_seconds=-1).put("expired", "v1", *make_plan("trip-1"))
+    ItineraryCache(path=path).put("live", "v1", *make_plan("trip-2"))
+    
+    cache = ItineraryCache(path=path)
+    cache.get("other", "v2")
+    rows = cache._connection().execute("SELECT key, catalog_version FROM itinerary").fetchall()
+    assert rows == [("live", "v1")]
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = ItineraryCache(path=str(tmp_path / "itinerary.sqlite3"), ttl_seconds=-1)
+    itinerary, candidates = make_plan()
+    cache.put("key", "v1", itinerary, candidates)
+    
+    assert cache.get("key", "v1") is None
+
+
+def test_memory_tier_is_bounded(tmp_path):
+    cache = ItineraryCache(path=str(tmp_path / "itinerary.sqlite3"), memory_size=2)
+    for number in range(3):
+        cache.put(f"key-{number}", "v1", *make_plan(f"trip-{number}"))
+    
+    assert len(cache._memory) == 2
+    assert cache.get("key-0", "v1")[0].trip_id == "trip-0"  # Still on disk
@@ -0,0 +1,89 @@
+"""
+Tests for two-constraint (budget, visit minutes) knapsack place selection.
+"""
+from itertools import combinations
+import numpy as np
+import pytest
+from app.services.knapsack_selector import knapsack_branch_and_bound, knapsack_dp, select_knapsack
+
+
+def random_instance(n, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(1, 10, n)
+    costs = rng.integers(0, 30, n) * 100.0
+    times = rng.choice([60, 90, 120, 180, 240], n).astype(float)
+    return values, costs, times
+
+
+def brute_force(values, costs, times, budget, time_limit):
+    best = 0.0
+    for size in range(len(values) + 1):
+        for subset in combinations(range(len(values)), size):
+            subset = list(subset)
+            if costs[subset].sum() <= budget and times[subset].sum() <= time_limit:
+                best = max(best, values[subset].sum())
+    return best
+
+
+def feasible(selected, costs, times, budget, time_limit):
+    return costs[selected].sum() <= budget + 1e-9 and times[selected].sum() <= time_limit + 1e-9
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_dp_is_optimal_on_small_instances(seed):
+    values, costs, times = random_instance(10, seed)
+    budget, time_limit = 6000.0, 480.0
+    
+    selected = knapsack_dp(values, costs, times, budget, time_limit)
+    
+    assert feasible(selected, costs, times, budget, time_limit)
+    assert values[selected].sum() == pytest.approx(brute_force(values, costs, times, budget, time_limit))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_branch_and_bound_is_optimal_when_proven(seed):
+    values, costs, times = random_instance(12, seed)
+    budget, time_limit = 5000.0, 600.0
+    
+    selected, proven = knapsack_branch_and_bound(values, costs, times, budget, time_limit, time_cap_ms=1000)
+    
+    assert proven
+    assert feasible(selected, costs, times, budget, time_limit)
+    assert values[selected].sum() == pytest.approx(brute_force(values, costs, times, budget, time_limit))
+
+
+def test_dp_rounds_non_integer_weights_conservatively():
+    values = np.array([5.0, 4.0, 3.0])
+    costs = np.array([333.3, 333.3, 333.5])
+    times = np.array([60.0, 60.0, 60.0])
+    
+    selected = knapsack_dp(values, costs, times, 1000.0, 600.0)
+    
+    assert feasible(selected, costs, times, 1000.0, 600.0)
+
+
+def test_select_never_worse_than_warm_start():
+    values, costs, times = random_instance(30, seed=4)
+    budget, time_limit = 8000.0, 900.0
+    warm_start = [0]
+    
+    selected, method = select_knapsack(values, costs, times, budget, time_limit, warm_start=warm_start)
+    
+    assert method in ("dp", "branch_and_bound", "greedy")
+    assert selected == sorted(selected)
+    assert feasible(selected, costs, times, budget, time_limit)
+    assert values[selected].sum() >= values[warm_start].sum()
+
+
+def test_select_keeps_warm_start_when_nothing_better():
+    selected, method = select_knapsack([1.0, 1.0], [100.0, 100.0], [60.0, 60.0], 100.0, 600.0, warm_start=[1])
+    
+    assert (selected, method) == ([1], "greedy")
+
+
+@pytest.mark.parametrize("budget, time_limit", [(0.0, 600.0), (1000.0, 0.0), (-5.0, 600.0)])
+def test_no_capacity_selects_nothing(budget, time_limit):
+    values, costs, times = [3.0, 2.0], [10.5, 0.25], [60.0, 30.0]
+    
+    assert select_knapsack(values, costs, times, budget, time_limit) == ([], "greedy")
+    assert knapsack_dp(np.array(values), np.array(costs), np.array(times), budget, time_limit) == []
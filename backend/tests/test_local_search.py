@@ -0,0 +1,95 @@
+"""
+Tests for 2-opt / Or-opt route improvement and anytime multi-start search.
+"""
+import numpy as np
+import pytest
+from app.services.exact_tsp import held_karp
+from app.services.local_search import (
+    anytime_search, improve_route, nearest_neighbour_route, neighbour_lists, route_length
+)
+
+
+def random_matrix(n, seed=0):
+    points = np.random.default_rng(seed).uniform(0, 100, size=(n, 2))
+    return np.linalg.norm(points[:, None] - points[None], axis=2)
+
+
+def test_route_length():
+    dist = np.array([[0, 1, 4], [1, 0, 2], [4, 2, 0]], dtype=float)
+    
+    assert route_length([0, 1, 2], dist) == 3
+    assert route_length([0, 1, 2], dist, closed=True) == 7
+    assert route_length([0], dist) == 0
+
+
+def test_neighbour_lists_are_nearest_first():
+    dist = random_matrix(10)
+    
+    neighbours = neighbour_lists(dist, 3)
+    
+    assert neighbours.shape == (10, 3)
+    for node, row in enumerate(neighbours):
+        assert node not in row
+        expected = [j for j in np.argsort(dist[node]) if j != node][:3]
+        assert list(row) == expected
+
+
+def test_nearest_neighbour_visits_every_node_once():
+    route = nearest_neighbour_route(random_matrix(12))
+    
+    assert route[0] == 0
+    assert sorted(route) == list(range(12))
+
+
+@pytest.mark.parametrize("closed", [False, True])
+def test_improve_route_never_gets_longer(closed):
+    dist = random_matrix(40, seed=3)
+    start = list(range(40))  # Index order: many crossings
+    
+    improved, report = improve_route(start, dist, closed=closed)
+    
+    assert improved[0] == 0
+    assert sorted(improved) == start
+    assert report.initial_distance == pytest.approx(route_length(start, dist, closed))
+    assert report.final_distance == pytest.approx(route_length(improved, dist, closed))
+    assert report.final_distance < report.initial_distance
+    assert report.iterations == report.two_opt_moves + report.or_opt_moves
+
+
+def test_improve_route_respects_iteration_cap():
+    dist = random_matrix(40, seed=3)
+    
+    _, report = improve_route(list(range(40)), dist, max_iterations=2)
+    
+    assert report.iterations <= 2
+
+
+@pytest.mark.parametrize("closed", [False, True])
+def test_anytime_search_close_to_optimal(closed):
+    dist = random_matrix(11, seed=5)
+    optimal, _ = held_karp(dist, closed=closed)
+    
+    route, report = anytime_search(dist, closed=closed)
+    
+    assert sorted(route) == list(range(11))
+    assert report.final_distance == pytest.approx(route_length(route, dist, closed))
+    assert report.final_distance <= report.initial_distance
+    assert report.final_distance <= optimal * 1.05
+
+
+def test_anytime_search_is_repeatable():
+    dist = random_matrix(60, seed=7)
+    
+    first, _ = anytime_search(dist, max_starts=6)
+    second, _ = anytime_search(dist, max_starts=6)
+    
+    assert first == second
+
+
+def test_anytime_search_returns_a_route_past_its_deadline():
+    dist = random_matrix(30, seed=2)
+    
+    route, report = anytime_search(dist, deadline=0.0)
+    
+    assert sorted(route) == list(range(30))
+    assert report.restarts == 1
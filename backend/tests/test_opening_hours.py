@@ -0,0 +1,47 @@
+"""
+Tests for opening hours parsing and time-window scheduling.
+"""
+import numpy as np
+import pytest
+from app.utils.opening_hours import ALWAYS_OPEN, CLOSED, parse_opening_hours
+from app.services.time_windows import schedule_route, visit_start
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("9 AM - 6 PM", ((540, 1080),)),
+    ("09:00-18:00", ((540, 1080),)),
+    ("9 - 6 PM", ((540, 1080),)),
+    ("6 AM - 12 PM, 4 PM - 9 PM", ((360, 720), (960, 1260))),
+    ("9 AM - 1 PM, 12 PM - 5 PM", ((540, 1020),)),
+    ("10 PM - 2 AM", ((0, 120), (1320, 1440))),
+    ("sunrise to sunset", ((360, 1080),)),
+    ("Open 24 hours", ALWAYS_OPEN),
+    ("Closed", CLOSED),
+])
+def test_parse(text, expected):
+    assert parse_opening_hours(text) == expected
+
+
+@pytest.mark.parametrize("text", [None, "", "   ", "varies by season"])
+def test_unconstrained(text):
+    assert parse_opening_hours(text) is None
+
+
+def test_visit_start():
+    windows = ((540, 720), (960, 1260))
+    
+    assert visit_start(500, 60, windows) == 540  # Waits for opening
+    assert visit_start(600, 60, windows) == 600
+    assert visit_start(700, 60, windows) == 960  # Morning slot too short
+    assert visit_start(1230, 60, windows) is None
+    assert visit_start(100, 60, None) == 100
+    assert visit_start(100, 60, CLOSED) is None
+
+
+def test_schedule_route():
+    travel = np.array([[0, 30, 60], [30, 0, 30], [60, 30, 0]], dtype=float)
+    service = [0, 120, 60]
+    windows = [None, ((600, 1080),), None]
+    
+    assert schedule_route([1, 2], travel, service, windows, day_start=540) == [(570, 600), (750, 750)]
+    assert schedule_route([1, 2], travel, service, windows, day_start=540, day_end=780) is None
@@ -0,0 +1,84 @@
+"""
+Tests for combined selection and routing (team orienteering).
+"""
+import numpy as np
+import pytest
+from app.services.local_search import route_length
+from app.services.orienteering import plan_orienteering
+
+
+def make_instance(n, seed=0):
+    rng = np.random.default_rng(seed)
+    points = np.vstack(([[0.0, 0.0]], rng.uniform(-40, 40, size=(n, 2))))
+    travel = np.linalg.norm(points[:, None] - points[None], axis=2) * 1.5  # Minutes
+    scores = rng.uniform(10, 100, n)
+    costs = rng.integers(1, 20, n) * 100.0
+    visit = rng.choice([60.0, 90.0, 120.0, 180.0], n)
+    return scores, costs, visit, travel
+
+
+def day_minutes_used(day, visit, travel):
+    route = [0] + [i + 1 for i in day]
+    return route_length(route, travel) + sum(visit[i] for i in day)
+
+
+def greedy_baseline(scores, costs, visit, travel, budget, days, day_minutes):
+    """Best score first, appended at the end of the first day it fits"""
+    routes, spent = [[] for _ in range(days)], 0.0
+    for i in np.argsort(-scores, kind="stable"):
+        if spent + costs[i] > budget:
+            continue
+        for day in routes:
+            if day_minutes_used(day + [i], visit, travel) <= day_minutes:
+                day.append(int(i))
+                spent += costs[i]
+                break
+    return routes
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_respects_budgets(seed):
+    scores, costs, visit, travel = make_instance(40, seed)
+    budget, days, day_minutes = 6000.0, 3, 480.0
+    
+    plan = plan_orienteering(scores, costs, visit, travel, budget, days, day_minutes)
+    
+    chosen = [i for day in plan for i in day]
+    assert len(plan) == days
+    assert len(chosen) == len(set(chosen))
+    assert costs[chosen].sum() <= budget + 1e-6
+    for day in plan:
+        assert day_minutes_used(day, visit, travel) <= day_minutes + 1e-6
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_scores_at_least_greedy(seed):
+    scores, costs, visit, travel = make_instance(40, seed)
+    args = (scores, costs, visit, travel, 6000.0, 3, 480.0)
+    
+    plan = plan_orienteering(*args)
+    greedy = greedy_baseline(*args)
+    
+    assert scores[[i for day in plan for i in day]].sum() >= scores[[i for day in greedy for i in day]].sum()
+
+
+def test_no_candidates():
+    assert plan_orienteering([], [], [], np.zeros((1, 1)), 5000.0, 3, 480.0) == [[], [], []]
+
+
+@pytest.mark.parametrize("budget, day_minutes", [(0.0, 480.0), (5000.0, 0.0)])
+def test_zero_budget_selects_nothing(budget, day_minutes):
+    scores, costs, visit, travel = make_instance(10)
+    costs[0] = 0.0  # Even free places need day time
+    
+    assert plan_orienteering(scores, costs, visit, travel, budget, 2, day_minutes) == [[], []]
+
+
+def test_tight_day_time_keeps_only_short_visits():
+    scores, costs, visit, travel = make_instance(20, seed=5)
+    
+    plan = plan_orienteering(scores, costs, visit, travel, 1e9, 2, 100.0)
+    
+    for day in plan:
+        assert all(visit[i] < 100 for i in day)
+        assert day_minutes_used(day, visit, travel) <= 100 + 1e-6
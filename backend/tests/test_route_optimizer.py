@@ -0,0 +1,137 @@
+"""
+Tests for route optimization strategies and their deadlines.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from app.models.schemas import PlaceModel
+from app.services import route_optimizer
+from app.services.local_search import route_length
+from app.services.route_optimizer import RouteOptimizer, _optimize_day
+
+
+def make_places(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lats = 15.0 + rng.uniform(-0.5, 0.5, n)
+    lons = 74.0 + rng.uniform(-0.5, 0.5, n)
+    return [
+        PlaceModel(id=f"p{i}", name=f"Place {i}", category="beach", latitude=lat, longitude=lon)
+        for i, (lat, lon) in enumerate(zip(lats, lons))
+    ]
+
+
+def assert_valid_route(places, distance, ordered, start=(15.0, 74.0)):
+    assert sorted(place.id for place in ordered) == sorted(place.id for place in places)
+    dist, _ = RouteOptimizer.route_matrix(ordered, *start)
+    assert np.isclose(distance, route_length(list(range(len(dist))), dist), rtol=1e-4)
+
+
+def test_expired_deadline_still_returns_route():
+    places = make_places(40)
+    
+    distance, ordered, report = RouteOptimizer.optimize_route(
+        places, 15.0, 74.0, deadline=time.perf_counter() - 1
+    )
+    
+    assert_valid_route(places, distance, ordered)
+    assert report.method == "anytime"
+    assert report.restarts == 1
+    assert report.deadline_reached
+    assert report.final_distance <= report.initial_distance + 1e-9
+
+
+def test_no_deadline_runs_every_start():
+    places = make_places(40)
+    
+    _, _, report = RouteOptimizer.optimize_route(
+        places, 15.0, 74.0, deadline=time.perf_counter() + 60, max_starts=4
+    )
+    
+    assert report.restarts == 4
+    assert not report.deadline_reached
+
+
+def test_zero_day_budget_routes_every_day():
+    days = [make_places(30, seed) for seed in range(3)]
+    
+    results = RouteOptimizer.optimize_days(days, 15.0, 74.0, time_budget_ms=0)
+    
+    for places, (distance, ordered, report) in zip(days, results):
+        assert_valid_route(places, distance, ordered)
+        assert report.deadline_reached
+
+
+@pytest.fixture
+def fresh_pool(monkeypatch):
+    """Two-worker route pool created for this test and shut down after it"""
+    monkeypatch.setattr(route_optimizer, "ROUTE_WORKERS", 2)
+    monkeypatch.setattr(route_optimizer, "_route_pool", None)
+    yield
+    if route_optimizer._route_pool is not None:
+        route_optimizer._route_pool.shutdown(wait=True)
+
+
+def test_pooled_days_ignore_the_clock(fresh_pool):
+    days = [make_places(30, seed) for seed in range(RouteOptimizer.PARALLEL_MIN_DAYS)]
+    
+    pooled = RouteOptimizer.optimize_days(days, 15.0, 74.0, time_budget_ms=0)
+    unlimited = RouteOptimizer.optimize_days(days, 15.0, 74.0)
+    in_process = [_optimize_day(places, 15.0, 74.0, False) for places in days]
+    
+    assert route_optimizer._route_pool is not None  # Not replaced after a failure
+    for places, (distance, ordered, report), same, local in zip(days, pooled, unlimited, in_process):
+        assert_valid_route(places, distance, ordered)
+        assert not report.deadline_reached
+        assert report.restarts == RouteOptimizer.DAY_MAX_STARTS
+        assert [p.id for p in ordered] == [p.id for p in same[1]] == [places[j].id for j in local[1]]
+
+
+def test_repeated_place_objects_stay_distinct():
+    places = make_places(12)
+    places.append(places[3])
+    
+    _, order, _ = _optimize_day(places, 15.0, 74.0, False)
+    
+    assert sorted(order) == list(range(len(places)))
+    results = RouteOptimizer.optimize_days([places], 15.0, 74.0)
+    assert sum(place is places[3] for place in results[0][1]) == 2
+
+
+def test_pool_is_created_once_across_threads(fresh_pool):
+    with ThreadPoolExecutor(max_workers=8) as threads:
+        pools = list(threads.map(lambda _: route_optimizer._get_route_pool(), range(32)))
+    
+    assert pools[0] is not None
+    assert all(pool is pools[0] for pool in pools)
+    assert route_optimizer.ROUTE_POOL_START_METHOD in ("forkserver", "spawn")
+
+
+@pytest.mark.parametrize("start", [(15.0, 74.0), (None, None)])
+def test_indexed_nearest_neighbor_matches_matrix_scan(start):
+    places = make_places(600, seed=3)
+    
+    distance, order = RouteOptimizer._nearest_neighbor_route_indexed(places, *start)
+    
+    dist, offset = RouteOptimizer.route_matrix(places, *start)
+    route = RouteOptimizer._nearest_neighbor_route(dist)
+    assert order == [node - offset for node in route[offset:]]
+    assert np.isclose(distance, route_length(route, dist))
+
+
+def test_large_routes_start_from_indexed_nearest_neighbor(monkeypatch):
+    places = make_places(200, seed=4)
+    _, expected = RouteOptimizer.calculate_route_distance(places, 15.0, 74.0)
+    monkeypatch.setattr(RouteOptimizer, "IMPROVE_ROUTES", False)
+    monkeypatch.setattr(RouteOptimizer, "INDEXED_NN_MIN_PLACES", 100)
+    calls = []
+    indexed = RouteOptimizer._nearest_neighbor_route_indexed
+    monkeypatch.setattr(
+        RouteOptimizer, "_nearest_neighbor_route_indexed",
+        staticmethod(lambda *args: calls.append(args) or indexed(*args))
+    )
+    
+    _, ordered, _ = RouteOptimizer.optimize_route(places, 15.0, 74.0)
+    
+    assert calls
+    assert [place.id for place in ordered] == [place.id for place in expected]
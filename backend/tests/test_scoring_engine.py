@@ -0,0 +1,67 @@
+"""
+Tests for vectorized scoring and partial ranking.
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("app.config", reason="needs the deployment's app/config.py settings")
+
+from app.models.schemas import PlaceModel, PreferenceEnum  # noqa: E402
+from app.services.scoring_engine import ScoringEngine  # noqa: E402
+
+
+@pytest.fixture
+def engine():
+    return ScoringEngine()
+
+
+def scores_with_ties(n, seed=0):
+    # Few distinct values, so many scores tie
+    return np.random.default_rng(seed).integers(0, 8, n).astype(np.float64) * 12.5
+
+
+@pytest.mark.parametrize("n, k", [(0, 3), (1, 1), (10, 0), (10, 3), (50, 10), (50, 49), (50, 50), (50, 80)])
+def test_top_k_matches_full_stable_sort(n, k):
+    scores = scores_with_ties(n, seed=n + k)
+    
+    expected = np.argsort(-scores, kind="stable")[:max(k, 0)]
+    
+    assert ScoringEngine.top_k_indices(scores, k).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 32])
+@pytest.mark.parametrize("n", [0, 1, 7, 200])
+def test_iter_ranked_matches_full_stable_sort(engine, n, chunk_size):
+    scores = scores_with_ties(n, seed=n)
+    
+    ranked = list(engine.iter_ranked(scores, chunk_size))
+    
+    assert ranked == np.argsort(-scores, kind="stable").tolist()
+
+
+def test_iter_ranked_is_lazy(engine):
+    scores = scores_with_ties(1000)
+    ranked = engine.iter_ranked(scores, chunk_size=4)
+    
+    first = [next(ranked) for _ in range(4)]
+    
+    assert first == np.argsort(-scores, kind="stable")[:4].tolist()
+
+
+def test_score_places_matches_scalar_scores(engine):
+    rng = np.random.default_rng(1)
+    categories = list(PreferenceEnum)
+    places = [
+        PlaceModel(
+            id=str(i), name=f"Place {i}", category=categories[i % len(categories)],
+            latitude=15.5 + rng.uniform(-0.5, 0.5), longitude=73.8 + rng.uniform(-0.5, 0.5),
+            rating=float(rng.uniform(0, 5)), reviews=int(rng.integers(0, 3000))
+        )
+        for i in range(40)
+    ]
+    preferences = [PreferenceEnum.BEACH, PreferenceEnum.FOOD]
+    
+    scores = engine.score_places(places, preferences, 15.5, 73.8)
+    
+    expected = [engine.calculate_place_score(place, preferences, 15.5, 73.8) for place in places]
+    assert scores == pytest.approx(expected)
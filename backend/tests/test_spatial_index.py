@@ -0,0 +1,66 @@
+"""
+Tests for the grid spatial index against brute-force haversine scans.
+"""
+import numpy as np
+import pytest
+from app.utils.geo import haversine_one_to_many
+from app.utils.spatial_index import SpatialIndex
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(8, 30, 500)
+    lons = rng.uniform(68, 90, 500)
+    return list(zip(lats, lons))
+
+
+def brute_force(points, lat, lon):
+    distances = haversine_one_to_many(lat, lon, [p[0] for p in points], [p[1] for p in points])
+    return sorted((float(d), i) for i, d in enumerate(distances))
+
+
+@pytest.mark.parametrize("radius_km", [0, 25, 150, 600, 5000])
+def test_within_radius_matches_brute_force(points, radius_km):
+    index = SpatialIndex.from_items(list(range(len(points))), key=lambda i: points[i])
+    
+    for lat, lon in [(15.5, 73.8), (28.6, 77.2), (9.9, 76.3), (40.0, 60.0)]:
+        found = index.within_radius(lat, lon, radius_km)
+        expected = [(d, i) for d, i in brute_force(points, lat, lon) if d <= radius_km]
+        assert [i for _, i in found] == [i for _, i in expected]
+        assert [d for d, _ in found] == pytest.approx([d for d, _ in expected])
+
+
+@pytest.mark.parametrize("k", [1, 5, 40, 500, 600])
+def test_nearest_matches_brute_force(points, k):
+    index = SpatialIndex.from_items(list(range(len(points))), key=lambda i: points[i])
+    
+    for lat, lon in [(15.5, 73.8), (-30.0, 150.0)]:
+        found = index.nearest(lat, lon, k)
+        expected = brute_force(points, lat, lon)[:k]
+        assert [i for _, i in found] == [i for _, i in expected]
+
+
+def test_removed_points_are_not_returned(points):
+    index = SpatialIndex.from_items(list(range(len(points))), key=lambda i: points[i])
+    nearest = index.nearest(15.5, 73.8, 3)
+    
+    index.remove(nearest[0][1])
+    
+    assert len(index) == len(points) - 1
+    assert [i for _, i in index.nearest(15.5, 73.8, 2)] == [i for _, i in nearest[1:]]
+
+
+def test_wraps_across_the_antimeridian():
+    index = SpatialIndex()
+    index.insert(0.0, 179.9, "east")
+    index.insert(0.0, -179.9, "west")
+    
+    assert {item for _, item in index.within_radius(0.0, 179.95, 50)} == {"east", "west"}
+
+
+def test_empty_index():
+    index = SpatialIndex()
+    
+    assert index.within_radius(15.5, 73.8, 100) == []
+    assert index.nearest(15.5, 73.8, 3) == []
@@ -0,0 +1,140 @@
+"""
+Tests for the bounding-box pushdown and paging of Supabase destination fetches.
+"""
+from types import SimpleNamespace
+import pytest
+from app.integrations import supabase_service
+from app.integrations.supabase_service import _fetch_in_radius
+from app.utils.geo import haversine_distance
+
+
+class FakeQuery:
+    """Chainable stand-in for a PostgREST query over in-memory rows."""
+    
+    def __init__(self, client):
+        self.client = client
+        self.filters = []
+        self.start, self.end = 0, None
+    
+    def select(self, columns):
+        return self
+    
+    def gte(self, column, value):
+        self.filters.append(lambda row: row[column] >= value)
+        return self
+    
+    def lte(self, column, value):
+        self.filters.append(lambda row: row[column] <= value)
+        return self
+    
+    def overlaps(self, column, values):
+        self.filters.append(lambda row: bool(set(row[column]) & set(values)))
+        return self
+    
+    def order(self, column):
+        return self
+    
+    def range(self, start, end):
+        self.start, self.end = start, end
+        return self
+    
+    def execute(self):
+        self.client.calls.append((self.start, self.end, len(self.filters)))
+        rows = sorted(
+            (row for row in self.client.rows if all(f(row) for f in self.filters)),
+            key=lambda row: row['id']
+        )
+        return SimpleNamespace(data=rows[self.start:self.end + 1])
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+    
+    def table(self, name):
+        assert name == 'destinations'
+        return FakeQuery(self)
+
+
+def row(dest_id, lat, lon, categories=('beach',)):
+    return {
+        'id': dest_id, 'name': f'Place {dest_id}', 'categories': list(categories),
+        'latitude': lat, 'longitude': lon, 'rating': 4.0, 'cost_per_day': 500
+    }
+
+
+CENTER = (15.5, 73.8)
+
+
+@pytest.fixture
+def rows():
+    grid = []
+    for i in range(30):
+        for j in range(30):
+            # 0.05 degree grid around the center: ~5.5 km steps, ~165 km across
+            grid.append(row(len(grid) + 1, 14.75 + i * 0.05, 73.05 + j * 0.05,
+                            ('beach',) if (i + j) % 2 else ('history',)))
+    return grid
+
+
+def test_filters_box_corners_outside_the_radius(rows):
+    client = FakeClient(rows)
+    
+    _, places = _fetch_in_radius(client, None, 10_000, *CENTER, 40)
+    
+    expected = {r['id'] for r in rows if haversine_distance(*CENTER, r['latitude'], r['longitude']) <= 40}
+    assert {int(p.id) for p in places} == expected
+    # The box query returns its corners too; they are dropped after the fetch
+    assert client.calls[0][2] == 4
+
+
+def in_box_rows(rows, radius_km, preferences=None):
+    """Rows the bounding-box query matches, in id order (one unpaged query)"""
+    query = FakeQuery(FakeClient(rows))
+    min_lat, max_lat, min_lon, max_lon = supabase_service.bounding_box(*CENTER, radius_km)
+    query.gte('latitude', min_lat).lte('latitude', max_lat).gte('longitude', min_lon).lte('longitude', max_lon)
+    if preferences:
+        query.overlaps('categories', preferences)
+    return query.range(0, len(rows)).execute().data
+
+
+def test_pages_until_limit(rows, monkeypatch):
+    monkeypatch.setattr(supabase_service, 'PAGE_SIZE', 50)
+    client = FakeClient(rows)
+    
+    rows_fetched, places = _fetch_in_radius(client, None, 40, *CENTER, 80)
+    
+    # Pages of 50 in-box rows until 40 of them lie inside the radius
+    in_radius = [
+        haversine_distance(*CENTER, r['latitude'], r['longitude']) <= 80
+        for r in in_box_rows(rows, 80)
+    ]
+    pages = next(p for p in range(1, len(in_radius) // 50 + 2) if sum(in_radius[:p * 50]) >= 40)
+    assert pages > 1
+    assert [call[:2] for call in client.calls] == [(p * 50, p * 50 + 49) for p in range(pages)]
+    assert rows_fetched == pages * 50
+    assert len(places) == 40
+    assert [int(p.id) for p in places] == sorted(int(p.id) for p in places)
+
+
+def test_page_loop_stops_when_table_is_exhausted(rows, monkeypatch):
+    monkeypatch.setattr(supabase_service, 'PAGE_SIZE', 50)
+    client = FakeClient(rows)
+    
+    rows_fetched, places = _fetch_in_radius(client, ['beach'], 10_000, *CENTER, 20)
+    
+    in_box = in_box_rows(rows, 20, ['beach'])
+    assert rows_fetched == len(in_box) < len(rows)
+    assert len(client.calls) == len(in_box) // 50 + 1  # Stops after the first short page
+    assert places and all(p.category.value == 'beach' for p in places)
+
+
+def test_no_center_pages_the_whole_table(rows, monkeypatch):
+    monkeypatch.setattr(supabase_service, 'PAGE_SIZE', 400)
+    client = FakeClient(rows)
+    
+    rows_fetched, places = _fetch_in_radius(client, None, 10_000, None, None, 50)
+    
+    assert rows_fetched == len(rows) == len(places)
+    assert [call[:2] for call in client.calls] == [(0, 9_999)]
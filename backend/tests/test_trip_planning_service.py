@@ -0,0 +1,108 @@
+"""
+Tests for the trip planning orchestrator.
+"""
+from datetime import date
+import numpy as np
+import pytest
+
+pytest.importorskip("app.config", reason="needs the deployment's app/config.py settings")
+
+from app.models.schemas import ItineraryItemRequest, PlaceModel  # noqa: E402
+from app.services.trip_planning_service import TripPlanningService  # noqa: E402
+
+CENTER = (15.3, 74.1)
+
+
+def make_places(n, seed=0):
+    rng = np.random.default_rng(seed)
+    categories = ["beach", "food", "history", "nature"]
+    return [
+        PlaceModel(
+            id=f"p{i}", name=f"Place {i}", category=categories[i % len(categories)],
+            latitude=CENTER[0] + rng.uniform(-0.3, 0.3), longitude=CENTER[1] + rng.uniform(-0.3, 0.3),
+            rating=float(rng.uniform(3, 5)), estimated_cost=float(rng.integers(0, 20) * 100)
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Planner over fixed candidates, without the shared itinerary cache"""
+    places = make_places(60)
+    service = TripPlanningService()
+    monkeypatch.setattr(service, "_catalog_version", lambda: None)
+    monkeypatch.setattr(
+        service.place_fetcher, "fetch_places_by_preferences", lambda *args, **kwargs: list(places)
+    )
+    return service
+
+
+def make_request(**overrides):
+    fields = dict(
+        start_date=date(2026, 2, 1), end_date=date(2026, 2, 5), budget=20000,
+        preferences=["beach", "food", "history", "nature"],
+        latitude=CENTER[0], longitude=CENTER[1]
+    )
+    fields.update(overrides)
+    return ItineraryItemRequest(**fields)
+
+
+@pytest.mark.parametrize("engine", ["staged", "orienteering"])
+def test_tiny_latency_budget_still_plans(service, engine):
+    itinerary = service.plan_trip(make_request(latency_budget_ms=0.001, engine=engine))
+    
+    assert itinerary.planning_report.deadline_reached
+    assert len(itinerary.daily_itineraries) == 5
+    planned = [place.id for day in itinerary.daily_itineraries for place in day.places]
+    assert planned
+    assert len(planned) == len(set(planned))
+    assert itinerary.total_estimated_cost <= 20000
+
+
+def test_generous_latency_budget_is_not_reached(service):
+    itinerary = service.plan_trip(make_request(latency_budget_ms=60000))
+    
+    assert not itinerary.planning_report.deadline_reached
+
+
+def day_plans(itinerary):
+    return {day.day: [place.id for place in day.places] for day in itinerary.daily_itineraries}
+
+
+def test_one_day_extension_keeps_every_day(service):
+    prior = service.plan_trip(make_request())
+    
+    extended = service.plan_trip(make_request(end_date=date(2026, 2, 6)))
+    
+    before, after = day_plans(prior), day_plans(extended)
+    assert all(after[day] == places for day, places in before.items())
+    assert f"kept {len(before)} day(s)" in extended.algorithm_explanation
+
+
+def test_small_budget_bump_only_touches_days_that_gain_places(service):
+    prior = service.plan_trip(make_request())
+    
+    bumped = service.plan_trip(make_request(budget=21000))
+    
+    before, after = day_plans(prior), day_plans(bumped)
+    gained = {day for day, places in after.items() if set(places) - set(before.get(day, []))}
+    assert sum(len(places) for places in after.values()) > sum(len(places) for places in before.values())
+    assert len(gained) < len(before)
+    for day, places in before.items():
+        if day not in gained:
+            assert after[day] == places
+        else:
+            assert set(places) <= set(after[day])
+    assert bumped.total_estimated_cost <= 21000
+
+
+def test_smaller_budget_keeps_a_subset_of_the_plan(service):
+    prior = service.plan_trip(make_request())
+    
+    reduced = service.plan_trip(make_request(budget=15000))
+    
+    before = {place for places in day_plans(prior).values() for place in places}
+    after = {place for places in day_plans(reduced).values() for place in places}
+    assert after < before
+    assert reduced.total_estimated_cost <= 15000
@@ -0,0 +1,131 @@
+"""
+Tests for the grid-cell forecast cache of the weather service.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("app.config", reason="needs the deployment's app/config.py settings")
+
+import requests  # noqa: E402
+from app.services import weather_service  # noqa: E402
+from app.services.weather_service import WeatherService  # noqa: E402
+
+STEP = WeatherService.FORECAST_STEP_SECONDS
+
+
+class Clock:
+    def __init__(self, now=1000 * STEP + 60.0):
+        self.now = now
+    
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(weather_service, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def service(monkeypatch, clock):
+    # Fresh process-wide cache per test
+    monkeypatch.setattr(WeatherService, "_forecasts", OrderedDict())
+    monkeypatch.setattr(WeatherService, "_in_flight", {})
+    service = WeatherService(api_key="test-key")
+    service.calls = []
+    
+    def fetch(cell):
+        service.calls.append(cell)
+        return {"list": [{"cell": list(cell), "call": len(service.calls)}]}
+    
+    monkeypatch.setattr(service, "_fetch_forecast", fetch)
+    return service
+
+
+def test_cache_hit_within_cell(service):
+    first = service.get_weather_forecast(15.51, 73.76)
+    assert service.get_weather_forecast(15.60, 73.90) is first  # Same 0.25 degree cell
+    assert len(service.calls) == 1
+    
+    service.get_weather_forecast(15.80, 73.76)
+    assert len(service.calls) == 2
+
+
+def test_cache_is_shared_between_instances(service, monkeypatch):
+    service.get_weather_forecast(15.51, 73.76)
+    
+    other = WeatherService(api_key="test-key")
+    monkeypatch.setattr(other, "_fetch_forecast", lambda cell: pytest.fail("fetched again"))
+    assert other.get_weather_forecast(15.51, 73.76)["list"][0]["call"] == 1
+
+
+def test_entry_expires_at_next_forecast_step(service, clock):
+    service.get_weather_forecast(15.51, 73.76)
+    
+    clock.now = 1001 * STEP - 1
+    assert service.get_weather_forecast(15.51, 73.76)["list"][0]["call"] == 1
+    
+    clock.now = 1001 * STEP
+    assert service.get_weather_forecast(15.51, 73.76)["list"][0]["call"] == 2
+
+
+def test_least_recently_used_cell_is_evicted(service, monkeypatch):
+    monkeypatch.setattr(WeatherService, "FORECAST_CACHE_SIZE", 2)
+    service.get_weather_forecast(10.1, 70.1)
+    service.get_weather_forecast(20.1, 70.1)
+    service.get_weather_forecast(10.1, 70.1)
+    service.get_weather_forecast(30.1, 70.1)
+    assert list(WeatherService._forecasts) == [(40, 280), (120, 280)]
+
+
+def test_concurrent_requests_share_one_fetch(service, monkeypatch):
+    release = threading.Event()
+    waiting = threading.Semaphore(0)
+    fetch = service._fetch_forecast
+    
+    class CountingFuture(weather_service.Future):
+        def result(self, timeout=None):
+            if not self.done():
+                waiting.release()
+            return super().result(timeout)
+    
+    def slow_fetch(cell):
+        assert release.wait(5)
+        return fetch(cell)
+    
+    monkeypatch.setattr(weather_service, "Future", CountingFuture)
+    monkeypatch.setattr(service, "_fetch_forecast", slow_fetch)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(service.get_weather_forecast, 15.51, 73.76) for _ in range(4)]
+        # The owner fetches; the other three wait on its in-flight result
+        for _ in range(3):
+            assert waiting.acquire(timeout=5)
+        release.set()
+        results = [future.result(timeout=5) for future in futures]
+    
+    assert len(service.calls) == 1
+    assert all(result is results[0] for result in results)
+    assert WeatherService._in_flight == {}
+
+
+def test_failed_fetch_returns_mock_and_is_not_cached(service, monkeypatch):
+    def fail(cell):
+        service.calls.append(cell)
+        raise requests.ConnectionError("offline")
+    
+    monkeypatch.setattr(service, "_fetch_forecast", fail)
+    assert service.get_weather_forecast(15.51, 73.76) == WeatherService._get_mock_weather()
+    assert service.get_weather_forecast(15.51, 73.76) == WeatherService._get_mock_weather()
+    assert len(service.calls) == 2
+    assert WeatherService._forecasts == {}
+
+
+def test_without_api_key_returns_mock_without_fetching(service, monkeypatch):
+    monkeypatch.setattr(service, "api_key", None)
+    assert service.get_weather_forecast(15.51, 73.76) == WeatherService._get_mock_weather()
+    assert service.calls == []
@@ -7,12 +7,17 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional
-import math
 from datetime import datetime, timedelta
 
 # Import tourism API client for real data
 from tourism_apis import TourismAPIClient
 from destination_database import DESTINATIONS_DB, get_destinations_near
+from geo import haversine_distance, haversine_one_to_many
+from distance_matrix import distances_from
+from spatial_index import SpatialIndex
+from tour_planner import SKIP_PENALTY_KM, plan_closed_tour
+from day_templates import classify_visit_duration, get_day_templates
+from ttl_cache import TTLCache
 import hashlib
 import json
 
@@ -21,8 +26,18 @@ app = FastAPI(title="GoTrip API", version="2.0.0")
 # Initialize API client
 tourism_client = TourismAPIClient()
 
-# Simple in-memory cache for API results
-destination_cache = {}
+# Candidate destinations per (start cell, preferences): bounded, expiring, thread-safe
+DESTINATION_CACHE_GRID_DEG = 0.01  # ~1km; starts this close share candidates
+destination_cache = TTLCache(max_entries=512, max_bytes=64 * 1024 * 1024, ttl_seconds=6 * 60 * 60)
+
+
+def destination_cache_key(lat, lng, preferences):
+    """Cache key: start quantized to the grid, preferences de-duplicated and sorted"""
+    return (
+        round(lat / DESTINATION_CACHE_GRID_DEG),
+        round(lng / DESTINATION_CACHE_GRID_DEG),
+        tuple(sorted(set(preferences)))
+    )
 
 # CORS - Allow Flutter app to connect
 app.add_middleware(
@@ -33,6 +48,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.on_event("startup")
+def load_day_templates():
+    """Load the day templates (or build them if missing) before serving, not on the first trip"""
+    get_day_templates()
+
 # Request/Response Models
 class TripRequest(BaseModel):
     start_location: dict  # {name, lat, lng}
@@ -263,22 +284,6 @@ DESTINATIONS = [
 ]
 
 # Utility Functions
-def haversine_distance(lat1, lon1, lat2, lon2):
-    """Calculate distance between two GPS coordinates in kilometers"""
-    R = 6371  # Earth radius in km
-    
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lon = math.radians(lon2 - lon1)
-    
-    a = (math.sin(delta_lat/2)**2 + 
-         math.cos(lat1_rad) * math.cos(lat2_rad) * 
-         math.sin(delta_lon/2)**2)
-    c = 2 * math.asin(math.sqrt(a))
-    
-    return R * c
-
 def calculate_route_cost(distance_km):
     """Estimate travel cost in Indian Rupees (₹)"""
     cost_per_km = 8  # Average cost per km in India (taxi/bus)
@@ -289,6 +294,185 @@ def calculate_travel_time(distance_km):
     avg_speed = 50  # km/h (accounting for stops, traffic)
     return distance_km / avg_speed
 
+def build_days_greedy(start_loc, all_matching, num_days, preference_set):
+    """
+    Build days one at a time from the current location (one-way trips).
+    Each day starts at the best unvisited destination (unsatisfied preferences
+    first, then proximity) and adds nearby stops while the day has time.
+    
+    Unvisited destinations live in grid indexes that shrink as they are used:
+    one over all of them for the 50km same-day neighbours, and one per set of
+    matched preferences, since a destination's score only depends on that set
+    and its distance. The day's first stop is a best-first search over the
+    groups (highest possible score first, nearest neighbour within a group),
+    so no day re-sorts or re-measures the whole candidate list.
+    
+    A half-day or quick first stop takes the best precomputed day template
+    through it (day_templates) when one fits; the 50km scan is the fallback
+    for destinations outside the catalog.
+    
+    Returns:
+        (daily_plans, satisfied_prefs)
+    """
+    daily_plans = []
+    satisfied_prefs = set()
+    templates = get_day_templates()
+    
+    unvisited = SpatialIndex()
+    groups = {}  # Matched preferences -> index of unvisited destinations
+    positions = {}  # Destination id -> [(group key, group position, position)]
+    available = {}  # Destination id -> unvisited destination
+    for i, dest in enumerate(all_matching):
+        available.setdefault(dest['id'], dest)
+        prefs = frozenset(dest['categories']) & preference_set
+        group = groups.setdefault(prefs, SpatialIndex())
+        positions.setdefault(dest['id'], []).append((
+            prefs,
+            group.insert(dest['lat'], dest['lng'], i),
+            unvisited.insert(dest['lat'], dest['lng'], i)
+        ))
+    
+    def visit(dest):
+        for prefs, group_position, position in positions.pop(dest['id']):
+            groups[prefs].remove(group_position)
+            unvisited.remove(position)
+        del available[dest['id']]
+        satisfied_prefs.update(set(dest['categories']) & preference_set)
+    
+    current_loc = start_loc
+    
+    for day_num in range(num_days):
+        day_destinations = []
+        day_time_budget = 8  # 8 hours available per day
+        
+        # Try to satisfy unsatisfied preferences first
+        remaining_prefs = preference_set - satisfied_prefs
+        
+        # Best starting destination: unsatisfied preference match > proximity
+        # to current location (score = matches * 1000 - distance, ties go to
+        # the earlier candidate)
+        ranked_groups = sorted(
+            ((len(prefs & remaining_prefs), prefs) for prefs, group in groups.items() if len(group)),
+            key=lambda pair: pair[0],
+            reverse=True
+        )
+        best = None
+        for matches, prefs in ranked_groups:
+            if best is not None and matches * 1000 < best[0]:
+                break  # No destination left in this or later groups can win
+            distance, i = groups[prefs].nearest(current_loc['lat'], current_loc['lng'])[0]
+            candidate = (matches * 1000 - distance, -i)
+            if best is None or candidate > best:
+                best = candidate
+        if best is None:
+            break
+        
+        # Pick first destination
+        first_dest = all_matching[-best[1]]
+        visit(first_dest)
+        day_destinations.append(first_dest)
+        
+        if first_dest['visit_duration'] == 'full_day':
+            # Full day destination - takes entire day
+            current_loc = first_dest
+            print(f"   Day {day_num + 1}: {first_dest['name']} (full day)")
+        else:
+            # Half-day/quick - take the best ready-made day through this stop,
+            # otherwise add more nearby
+            template_day = templates.best_day(first_dest, available, remaining_prefs)
+            if template_day:
+                # Enter the template from the end nearer the current location
+                ends = distances_from(current_loc, [template_day[0], template_day[-1]])
+                if ends[1] < ends[0]:
+                    template_day.reverse()
+                for dest in template_day:
+                    if dest is not first_dest:
+                        visit(dest)
+                day_destinations = template_day
+            else:
+                time_used = 4 if first_dest['visit_duration'] == 'half_day' else 1.5
+                day_time_budget -= time_used
+                
+                # Nearby destinations (within 50km), in the same order as the day's start
+                neighbours = unvisited.within_radius(first_dest['lat'], first_dest['lng'], 50)
+                nearby = [all_matching[i] for _, i in neighbours]
+                current_distances = distances_from(current_loc, nearby)
+                order = sorted(
+                    range(len(nearby)),
+                    key=lambda j: (
+                        current_distances[j] - len(set(nearby[j]['categories']) & remaining_prefs) * 1000,
+                        neighbours[j][1]
+                    )
+                )
+                for j in order:
+                    dest, dest_distance = nearby[j], neighbours[j][0]
+                    if dest['id'] not in available:
+                        continue  # Same id already added today
+                    dest_time = 4 if dest['visit_duration'] == 'half_day' else 1.5
+                    travel_time = dest_distance / 40  # Assume 40km/h average
+                    
+                    if (dest_time + travel_time) <= day_time_budget:
+                        day_destinations.append(dest)
+                        visit(dest)
+                        day_time_budget -= (dest_time + travel_time)
+                        
+                        if len(day_destinations) >= 3:  # Max 3 destinations per day
+                            break
+            
+            current_loc = day_destinations[-1]
+            dest_names = [d['name'] for d in day_destinations]
+            print(f"   Day {day_num + 1}: {', '.join(dest_names)} ({len(day_destinations)} stops)")
+        
+        daily_plans.append(day_destinations)
+    
+    return daily_plans, satisfied_prefs
+
+def extend_days_with_templates(start_loc, daily_plans, all_matching, preference_set):
+    """
+    Grow closed-tour days into precomputed day templates (day_templates), in place.
+    
+    A day whose stops all belong to a larger template takes the template's
+    extra stops (in the template's shortest order, entered from the end that
+    fits the loop best) when they are still unused and the added loop
+    distance is below their skip penalty, the same trade-off the tour
+    planner uses for skipped stops.
+    """
+    templates = get_day_templates()
+    used = {dest['id'] for day in daily_plans for dest in day}
+    available = {}
+    for dest in all_matching:
+        if dest['id'] not in used:
+            available.setdefault(dest['id'], dest)
+    
+    def leg_km(a, b):
+        # start_loc has no catalog id, so measure from the side that has one
+        return float(distances_from(a, [b])[0] if 'id' in b else distances_from(b, [a])[0])
+    
+    def path_km(stops):
+        return sum(leg_km(a, b) for a, b in zip(stops, stops[1:]))
+    
+    for d, day in enumerate(daily_plans):
+        if not day or day[0]['visit_duration'] == 'full_day':
+            continue
+        template_day = templates.best_day(day[0], available, preference_set, keep=day)
+        if not template_day:
+            continue
+        
+        before = next((p[-1] for p in reversed(daily_plans[:d]) if p), start_loc)
+        after = next((p[0] for p in daily_plans[d + 1:] if p), start_loc)
+        template_day = min(
+            (template_day, template_day[::-1]),
+            key=lambda stops: path_km([before] + stops + [after])
+        )
+        added_km = path_km([before] + template_day + [after]) - path_km([before] + day + [after])
+        kept = {dest['id'] for dest in day}
+        extra = [dest for dest in template_day if dest['id'] not in kept]
+        if added_km < SKIP_PENALTY_KM * sum(dest['matching_preferences'] for dest in extra):
+            for dest in extra:
+                del available[dest['id']]
+            daily_plans[d] = template_day
+
+
 def optimize_destinations(start_loc, destinations, budget, num_days, preferences, return_to_start=True):
     """
     REALISTIC TRIP PLANNING OPTIMIZATION:
@@ -301,6 +485,10 @@ def optimize_destinations(start_loc, destinations, budget, num_days, preferences
     5. Each day = 1 full-day destination OR 2-3 half-day/quick destinations
     6. MUST satisfy ALL user preferences including food/shopping
     7. Include accommodation costs per night
+    
+    Round trips (return_to_start) are planned as one closed tour split into
+    days (tour_planner.plan_closed_tour) whose days then grow into day
+    templates; one-way trips build days greedily from templates.
     """
     if not destinations:
         return {
@@ -318,38 +506,29 @@ def optimize_destinations(start_loc, destinations, budget, num_days, preferences
     print(f"\n🎯 REALISTIC TRIP PLANNING from {start_loc['name']}")
     print(f"   User preferences: {preferences}")
     
-    # Define destination types by time required
-    FULL_DAY_KEYWORDS = ['resort', 'homestay', 'hotel', 'retreat', 'spa', 'park', 'sanctuary', 'national', 'wildlife']
-    QUICK_VISIT_KEYWORDS = ['restaurant', 'cafe', 'market', 'shop', 'street', 'viewpoint', 'museum']
-    
     preference_set = set(preferences)
     
+    # Distances from start for every candidate in one vectorized pass
+    start_distances = haversine_one_to_many(
+        start_loc['lat'], start_loc['lng'],
+        [d['lat'] for d in destinations],
+        [d['lng'] for d in destinations]
+    )
+    
     # Step 1: CLASSIFY all destinations
     all_matching = []
-    for dest in destinations:
+    for dest, distance_from_start in zip(destinations, start_distances):
         dest_categories = set(dest['categories'])
         matching = preference_set & dest_categories
         
         if not matching:
             continue
         
-        dest['distance_from_start'] = haversine_distance(
-            start_loc['lat'], start_loc['lng'],
-            dest['lat'], dest['lng']
-        )
+        dest['distance_from_start'] = float(distance_from_start)
         dest['matching_preferences'] = len(matching)
         
-        # Determine visit duration based on name/type
-        dest_name_lower = dest['name'].lower()
-        is_full_day = any(keyword in dest_name_lower for keyword in FULL_DAY_KEYWORDS)
-        is_quick = any(keyword in dest_name_lower for keyword in QUICK_VISIT_KEYWORDS)
-        
-        if is_full_day:
-            dest['visit_duration'] = 'full_day'  # 6-8 hours
-        elif is_quick:
-            dest['visit_duration'] = 'quick'  # 1-2 hours
-        else:
-            dest['visit_duration'] = 'half_day'  # 3-4 hours
+        # Visit duration: full day, half day or quick stop
+        dest['visit_duration'] = classify_visit_duration(dest)
         
         all_matching.append(dest)
     
@@ -385,74 +564,18 @@ def optimize_destinations(start_loc, destinations, budget, num_days, preferences
     
     # Step 5: SELECT DESTINATIONS AND BUILD MULTI-DEST DAYS
     # Strategy: Create balanced days with 1 full-day OR 2-3 quick/half-day attractions
-    daily_plans = []
-    used_destinations = set()
-    satisfied_prefs = set()
-    
-    current_loc = start_loc
-    
-    for day_num in range(num_days):
-        day_destinations = []
-        day_time_budget = 8  # 8 hours available per day
-        
-        # Try to satisfy unsatisfied preferences first
-        remaining_prefs = preference_set - satisfied_prefs
-        
-        # Find best starting destination for this day
-        available = [d for d in all_matching if d['id'] not in used_destinations]
-        if not available:
-            break
-        
-        # Sort by: unsatisfied preference match > proximity to current location
-        def score_dest(d):
-            unsatisfied_match = len(set(d['categories']) & remaining_prefs)
-            distance = haversine_distance(current_loc['lat'], current_loc['lng'], d['lat'], d['lng'])
-            return (unsatisfied_match * 1000) - distance
-        
-        available.sort(key=score_dest, reverse=True)
-        
-        # Pick first destination
-        first_dest = available[0]
-        
-        if first_dest['visit_duration'] == 'full_day':
-            # Full day destination - takes entire day
-            day_destinations.append(first_dest)
-            used_destinations.add(first_dest['id'])
-            satisfied_prefs.update(set(first_dest['categories']) & preference_set)
-            current_loc = first_dest
-            print(f"   Day {day_num + 1}: {first_dest['name']} (full day)")
-        else:
-            # Half-day/quick - try to add more nearby
-            day_destinations.append(first_dest)
-            used_destinations.add(first_dest['id'])
-            satisfied_prefs.update(set(first_dest['categories']) & preference_set)
-            
-            time_used = 4 if first_dest['visit_duration'] == 'half_day' else 1.5
-            day_time_budget -= time_used
-            
-            # Find nearby destinations to add to same day
-            nearby = [d for d in available[1:] if d['id'] not in used_destinations]
-            for dest in nearby:
-                dest_distance = haversine_distance(first_dest['lat'], first_dest['lng'], dest['lat'], dest['lng'])
-                
-                if dest_distance <= 50:  # Within 50km
-                    dest_time = 4 if dest['visit_duration'] == 'half_day' else 1.5
-                    travel_time = dest_distance / 40  # Assume 40km/h average
-                    
-                    if (dest_time + travel_time) <= day_time_budget:
-                        day_destinations.append(dest)
-                        used_destinations.add(dest['id'])
-                        satisfied_prefs.update(set(dest['categories']) & preference_set)
-                        day_time_budget -= (dest_time + travel_time)
-                        
-                        if len(day_destinations) >= 3:  # Max 3 destinations per day
-                            break
-            
-            current_loc = day_destinations[-1]
+    if return_to_start:
+        # Round trip: optimize the whole loop (back to start) and its day split together
+        daily_plans = plan_closed_tour(start_loc, all_matching, num_days, preference_set)
+        extend_days_with_templates(start_loc, daily_plans, all_matching, preference_set)
+        satisfied_prefs = set()
+        for day_num, day_destinations in enumerate(daily_plans):
+            for dest in day_destinations:
+                satisfied_prefs.update(set(dest['categories']) & preference_set)
             dest_names = [d['name'] for d in day_destinations]
-            print(f"   Day {day_num + 1}: {', '.join(dest_names)} ({len(day_destinations)} stops)")
-        
-        daily_plans.append(day_destinations)
+            print(f"   Day {day_num + 1}: {', '.join(dest_names)} ({len(day_destinations)} stops, closed tour)")
+    else:
+        daily_plans, satisfied_prefs = build_days_greedy(start_loc, all_matching, num_days, preference_set)
     
     # Step 6: BUILD ROUTE AND CALCULATE COSTS
     visited = []
@@ -467,10 +590,7 @@ def optimize_destinations(start_loc, destinations, budget, num_days, preferences
     
     for day_plan in daily_plans:
         for dest in day_plan:
-            distance = haversine_distance(
-                current_location['lat'], current_location['lng'],
-                dest['lat'], dest['lng']
-            )
+            distance = float(distances_from(current_location, [dest])[0])
             
             road_distance = distance * 1.3
             travel_cost = calculate_route_cost(road_distance)
@@ -576,7 +696,8 @@ def health_check():
     return {
         "status": "ok",
         "message": "Trip optimization backend running",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "destination_cache": destination_cache.stats()
     }
 
 @app.post("/api/plan-trip")
@@ -606,11 +727,15 @@ def plan_trip(request: TripRequest):
             raise HTTPException(status_code=400, detail="Invalid date range: end date must be after start date")
         
         # ===== CURATED-FIRST APPROACH: Quality over quantity =====
-        cache_key = f"{request.start_location['lat']}_{request.start_location['lng']}_{'_'.join(sorted(request.preferences))}"
+        cache_key = destination_cache_key(
+            request.start_location['lat'], request.start_location['lng'], request.preferences
+        )
+        cached_destinations = destination_cache.get(cache_key)
         
-        if cache_key in destination_cache:
+        if cached_destinations is not None:
             print(f"\n💾 CACHED: Instant response for {request.start_location['name']}")
-            filtered_destinations = destination_cache[cache_key]
+            # Copies: planning annotates the destination dicts
+            filtered_destinations = [dict(dest) for dest in cached_destinations]
         else:
             # STEP 1: Try curated database FIRST (high quality, real attractions)
             print(f"\n📚 Searching curated database for {request.start_location['name']}...")
@@ -660,16 +785,6 @@ def plan_trip(request: TripRequest):
                         is_famous = any(keyword in dest_name_lower for keyword in ['mall', 'palace', 'fort', 'beach', 'museum', 'temple', 'church'])
                         
                         # CRITICAL: Geographic validation - ensure destination is actually near start location
-                        import math
-                        def haversine(lat1, lon1, lat2, lon2):
-                            R = 6371
-                            lat1_rad, lat2_rad = math.radians(lat1), math.radians(lat2)
-                            delta_lat = math.radians(lat2 - lat1)
-                            delta_lon = math.radians(lon2 - lon1)
-                            a = math.sin(delta_lat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon/2)**2
-                            c = 2 * math.asin(math.sqrt(a))
-                            return R * c
-                        
                         # Handle both 'lon' and 'lng' field names from different APIs
                         dest_lng = dest.get('lon') or dest.get('lng')
                         dest_lat = dest.get('lat')
@@ -678,7 +793,7 @@ def plan_trip(request: TripRequest):
                             print(f"   ⚠️ Skipping {dest['name']} - missing coordinates")
                             continue
                         
-                        distance_km = haversine(request.start_location['lat'], request.start_location['lng'], dest_lat, dest_lng)
+                        distance_km = haversine_distance(request.start_location['lat'], request.start_location['lng'], dest_lat, dest_lng)
                         
                         # Reject if too far (prevents Mumbai beaches appearing in Bangalore searches)
                         if distance_km > 500:  # Max 500km radius
@@ -722,7 +837,7 @@ def plan_trip(request: TripRequest):
                     print(f"   Consider: Gokarna (350km), Mangalore (360km), Goa (570km) for beach trips")
             
             # Cache the results
-            destination_cache[cache_key] = filtered_destinations
+            destination_cache.put(cache_key, [dict(dest) for dest in filtered_destinations])
             print(f"💾 Cached {len(filtered_destinations)} destinations")
         
         if not filtered_destinations:
@@ -756,7 +871,7 @@ def plan_trip(request: TripRequest):
             "message": f"Optimized trip created with {len(optimized_plan['destinations'])} destinations, minimizing travel distance",
             "plan": optimized_plan
         }
-        
+    
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
     except Exception as e:
@@ -0,0 +1,254 @@
+"""
+Precomputed day templates: ready-made single-day clusters per region.
+
+Every catalog destination is classified as a full-day, half-day or quick
+visit. Per city, a full-day destination is a template on its own, and up to
+MAX_STOPS_PER_DAY shorter visits within TEMPLATE_RADIUS_KM of each other form
+a template when their visits plus the driving between them (in the shortest
+stop order) fit the day. Templates cover DESTINATIONS_DB and the CSV catalog
+and are built offline into a JSON file, or at startup when the file is
+missing, so the planner picks whole days instead of discovering nearby
+groupings on every request: one-way trips start days from them, round trips
+grow their closed-tour days into them.
+
+Build (from the gotrip-backend directory):
+    python day_templates.py [path/to/new_dataset.csv]
+"""
+import csv
+import json
+import os
+import sys
+from itertools import combinations, permutations
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from geo import haversine_matrix
+from tour_planner import DAY_HOURS, LOCAL_SPEED_KMH, MAX_STOPS_PER_DAY, VISIT_HOURS
+
+DAY_TEMPLATES_PATH = os.getenv(
+    "DAY_TEMPLATES_PATH",
+    os.path.normpath(os.path.join(os.path.dirname(__file__), "data", "day_templates.json"))
+)
+DEFAULT_CSV_PATH = os.path.normpath(
+    os.path.join(os.path.dirname(__file__), "..", "datasets", "new_dataset.csv")
+)
+
+TEMPLATE_RADIUS_KM = 50  # Max distance between two stops of one day
+
+# Destination types by time required
+FULL_DAY_KEYWORDS = ['resort', 'homestay', 'hotel', 'retreat', 'spa', 'park', 'sanctuary', 'national', 'wildlife']
+QUICK_VISIT_KEYWORDS = ['restaurant', 'cafe', 'market', 'shop', 'street', 'viewpoint', 'museum']
+
+
+def classify_visit_duration(dest: Dict) -> str:
+    """
+    'full_day' (6-8 hours), 'half_day' (3-4 hours) or 'quick' (1-2 hours).
+    Uses the catalog's visit_duration_hours when present, otherwise the name.
+    """
+    hours = dest.get('visit_duration_hours')
+    if hours:
+        hours = float(hours)
+        if hours >= 6:
+            return 'full_day'
+        return 'quick' if hours <= 2 else 'half_day'
+    
+    dest_name_lower = dest['name'].lower()
+    if any(keyword in dest_name_lower for keyword in FULL_DAY_KEYWORDS):
+        return 'full_day'
+    if any(keyword in dest_name_lower for keyword in QUICK_VISIT_KEYWORDS):
+        return 'quick'
+    return 'half_day'
+
+
+def _shortest_path(stops: Sequence[int], dist) -> Tuple[Tuple[int, ...], float]:
+    """Shortest visiting order of a few stops (open path) and its length in km"""
+    best = None
+    for order in permutations(stops):
+        if order[0] > order[-1]:
+            continue  # Same length as its reverse
+        length = float(sum(dist[a, b] for a, b in zip(order, order[1:])))
+        if best is None or length < best[1]:
+            best = (order, length)
+    return best
+
+
+def _region_templates(region: str, members: List[Dict]) -> List[Dict]:
+    """All day templates among the destinations of one region"""
+    dist = haversine_matrix([d['lat'] for d in members], [d['lng'] for d in members])
+    durations = [classify_visit_duration(d) for d in members]
+    hours = [VISIT_HOURS[duration] for duration in durations]
+    
+    # Stop sets: each full-day visit alone, and shorter visits that are
+    # pairwise within the radius (grown from each stop's nearby list)
+    stop_sets = [(i,) for i, duration in enumerate(durations) if duration == 'full_day']
+    short = [i for i, duration in enumerate(durations) if duration != 'full_day']
+    nearby = {
+        i: [j for j in short if j > i and dist[i, j] <= TEMPLATE_RADIUS_KM]
+        for i in short
+    }
+    for i in short:
+        stop_sets.append((i,))
+        for size in range(1, MAX_STOPS_PER_DAY):
+            for others in combinations(nearby[i], size):
+                if all(dist[a, b] <= TEMPLATE_RADIUS_KM for a, b in combinations(others, 2)):
+                    stop_sets.append((i,) + others)
+    
+    templates = []
+    for stops in stop_sets:
+        order, route_km = _shortest_path(stops, dist)
+        day_hours = sum(hours[i] for i in stops) + route_km / LOCAL_SPEED_KMH
+        if day_hours <= DAY_HOURS + 1e-9:
+            templates.append({
+                'region': region,
+                'stops': [members[i]['id'] for i in order],
+                'route_km': round(route_km, 2),
+                'hours': round(day_hours, 2)
+            })
+    return templates
+
+
+class DayTemplates:
+    """
+    Day templates with a lookup from destination id to the templates
+    containing it.
+    
+    Each template is a dict with 'region', 'stops' (destination ids in
+    visiting order), 'route_km' (driving between the stops) and 'hours'
+    (visits plus driving).
+    """
+    
+    def __init__(self, templates: List[Dict]):
+        """Index templates; use load() or build() instead of calling directly."""
+        self.templates = templates
+        self._by_destination: Dict[str, List[Dict]] = {}
+        for template in templates:
+            for dest_id in template['stops']:
+                self._by_destination.setdefault(dest_id, []).append(template)
+    
+    def __len__(self) -> int:
+        return len(self.templates)
+    
+    @classmethod
+    def load(cls, path: str) -> "DayTemplates":
+        """Read templates previously written by build()"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+    
+    @classmethod
+    def build(cls, destinations: List[Dict], path: Optional[str] = None) -> "DayTemplates":
+        """
+        Compute templates for a catalog, grouped by city.
+        
+        Args:
+            destinations: Catalog destinations (id, name, city, lat, lng)
+            path: JSON file to write the templates to (not written if None)
+        
+        Returns:
+            The built templates
+        """
+        regions: Dict[str, List[Dict]] = {}
+        for dest in destinations:
+            regions.setdefault(dest.get('city') or 'Unknown', []).append(dest)
+        
+        templates = []
+        for region, members in regions.items():
+            templates.extend(_region_templates(region, members))
+        
+        if path is not None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(templates, f)
+        return cls(templates)
+    
+    def best_day(
+        self,
+        first_dest: Dict,
+        unvisited: Dict[str, Dict],
+        remaining_prefs: Set[str],
+        keep: Sequence[Dict] = ()
+    ) -> Optional[List[Dict]]:
+        """
+        Best multi-stop template through first_dest whose other stops are all
+        still available: most remaining preferences covered, then most stops,
+        then shortest route.
+        
+        Args:
+            first_dest: Destination the day is built around
+            unvisited: Destinations that may still be added, by id
+            remaining_prefs: Preferences no earlier day satisfied
+            keep: Stops already planned for the day; the template must
+                contain all of them (and more)
+        
+        Returns:
+            Destinations in visiting order, or None if no template fits
+        """
+        kept = {dest['id']: dest for dest in keep}
+        kept[first_dest['id']] = first_dest
+        best, best_key = None, None
+        for template in self._by_destination.get(first_dest['id'], ()):
+            if len(template['stops']) <= len(kept) or not kept.keys() <= set(template['stops']):
+                continue
+            stops = []
+            for dest_id in template['stops']:
+                dest = kept.get(dest_id) or unvisited.get(dest_id)
+                if dest is None:
+                    break
+                stops.append(dest)
+            else:
+                covered = set().union(*(d['categories'] for d in stops)) & remaining_prefs
+                key = (len(covered), len(stops), -template['route_km'])
+                if best_key is None or key > best_key:
+                    best, best_key = stops, key
+        return best
+
+
+def load_csv_catalog(csv_path: str) -> List[Dict]:
+    """Destinations from the CSV catalog (datasets/new_dataset.csv) in DESTINATIONS_DB shape"""
+    destinations = []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            destinations.append({
+                'id': row['id'],
+                'name': row['name'],
+                'city': row['city'],
+                'lat': float(row['latitude']),
+                'lng': float(row['longitude']),
+                'categories': json.loads(row['categories'] or "[]"),
+                'visit_duration_hours': row['visit_duration_hours']
+            })
+    return destinations
+
+
+def catalog_destinations(csv_path: str = DEFAULT_CSV_PATH) -> List[Dict]:
+    """DESTINATIONS_DB plus the CSV catalog (when the file exists)"""
+    from destination_database import DESTINATIONS_DB
+    
+    destinations = list(DESTINATIONS_DB)
+    if os.path.exists(csv_path):
+        destinations += load_csv_catalog(csv_path)
+    return destinations
+
+
+_day_templates = None
+
+
+def get_day_templates() -> DayTemplates:
+    """Catalog day templates, loaded once (backend.py does it at startup; built from the catalogs if no file)"""
+    global _day_templates
+    if _day_templates is None:
+        try:
+            _day_templates = DayTemplates.load(DAY_TEMPLATES_PATH)
+            print(f"🗓️ Loaded {len(_day_templates)} day templates")
+        except FileNotFoundError:
+            _day_templates = DayTemplates.build(catalog_destinations())
+            print(
+                f"⚠️ No day templates at {DAY_TEMPLATES_PATH} - built {len(_day_templates)} at startup; "
+                f"run `python day_templates.py` at deploy time to skip this"
+            )
+    return _day_templates
+
+
+if __name__ == "__main__":
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CSV_PATH
+    destinations = catalog_destinations(csv_path)
+    
+    templates = DayTemplates.build(destinations, DAY_TEMPLATES_PATH)
+    print(f"✅ Wrote {len(templates)} day templates for {len(destinations)} destinations to {DAY_TEMPLATES_PATH}")
@@ -3,6 +3,8 @@ Curated Indian Tourism Destination Database
 150+ real destinations across major cities
 Organized by region with accurate coordinates
 """
+from spatial_index import SpatialIndex
+
 
 DESTINATIONS_DB = [
     # ========== GOA - BEACH DESTINATIONS ==========
@@ -902,6 +904,9 @@ DESTINATIONS_DB = [
 ]
 
 
+_DESTINATIONS_INDEX = None
+
+
 def get_destinations_by_city(city_name):
     """Get all destinations in a specific city"""
     return [d for d in DESTINATIONS_DB if d['city'].lower() == city_name.lower()]
@@ -914,23 +919,18 @@ def get_destinations_by_category(category):
 
 def get_destinations_near(lat, lng, max_distance_km=1000):
     """Get destinations within distance from coordinates"""
-    import math
-    
-    def haversine(lat1, lon1, lat2, lon2):
-        R = 6371
-        lat1_rad, lat2_rad = math.radians(lat1), math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
-        a = math.sin(delta_lat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        return R * c
-    
     nearby = []
-    for dest in DESTINATIONS_DB:
-        distance = haversine(lat, lng, dest['lat'], dest['lng'])
-        if distance <= max_distance_km:
-            dest_copy = dest.copy()
-            dest_copy['distance_from_start'] = round(distance, 2)
-            nearby.append(dest_copy)
+    for distance, dest in _get_destinations_index().within_radius(lat, lng, max_distance_km):
+        dest_copy = dest.copy()
+        dest_copy['distance_from_start'] = round(distance, 2)
+        nearby.append(dest_copy)
     
-    return sorted(nearby, key=lambda x: x['distance_from_start'])
+    return nearby
+
+
+def _get_destinations_index():
+    """Spatial index over DESTINATIONS_DB, built on first use"""
+    global _DESTINATIONS_INDEX
+    if _DESTINATIONS_INDEX is None:
+        _DESTINATIONS_INDEX = SpatialIndex.from_items(DESTINATIONS_DB, key=lambda d: (d['lat'], d['lng']))
+    return _DESTINATIONS_INDEX
@@ -0,0 +1,247 @@
+"""
+Precomputed pairwise distance matrix for the destination catalog.
+
+The catalog (DESTINATIONS_DB plus the CSV catalog) only changes between
+deploys, so distances are built offline into .npy files and memory-mapped at
+runtime. Every worker process maps the same files, so the operating system
+keeps a single shared copy in the page cache. The matrix stores the
+coordinates it was built from; a destination whose coordinates changed since
+misses the lookup and falls back to haversine until the matrix is rebuilt.
+
+Build (from the gotrip-backend directory):
+    python distance_matrix.py [path/to/new_dataset.csv]
+"""
+import json
+import os
+import sys
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from geo import haversine_matrix, haversine_one_to_many
+
+DISTANCE_MATRIX_DIR = os.getenv(
+    "DISTANCE_MATRIX_DIR",
+    os.path.normpath(os.path.join(os.path.dirname(__file__), "data", "distance_matrix"))
+)
+
+BUILD_BLOCK_ROWS = 1024  # Rows computed per block while building
+COORD_TOLERANCE_DEG = 1e-5  # ~1 m; larger moves mean the matrix is stale
+
+
+class DistanceMatrix:
+    """
+    Memory-mapped pairwise distances keyed by dense destination index.
+    
+    - coords: float64 (lat, lng) per destination the matrix was built from
+    - distance_km: float32 great circle distances in kilometers
+    """
+    
+    IDS_FILE = "ids.json"
+    COORDS_FILE = "coords.npy"
+    DISTANCE_FILE = "distance_km.npy"
+    
+    def __init__(self, ids: List[str], coords: np.ndarray, distance_km: np.ndarray):
+        """Wrap a loaded matrix; use load() or build() instead of calling directly."""
+        self.ids = ids
+        self.coords = coords
+        self.distance_km = distance_km
+        self._index = {dest_id: i for i, dest_id in enumerate(ids)}
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def __contains__(self, dest_id: str) -> bool:
+        return dest_id in self._index
+    
+    @classmethod
+    def load(cls, directory: str) -> "DistanceMatrix":
+        """
+        Memory-map a matrix previously written by build().
+        
+        Args:
+            directory: Directory containing the matrix files
+        
+        Returns:
+            DistanceMatrix backed by read-only memory maps
+        """
+        with open(os.path.join(directory, cls.IDS_FILE), encoding="utf-8") as f:
+            ids = json.load(f)
+        
+        coords = np.load(os.path.join(directory, cls.COORDS_FILE))
+        distance_km = np.load(os.path.join(directory, cls.DISTANCE_FILE), mmap_mode="r")
+        return cls(ids, coords, distance_km)
+    
+    @classmethod
+    def build(
+        cls,
+        ids: Sequence[str],
+        lats: Sequence[float],
+        lons: Sequence[float],
+        directory: str
+    ) -> "DistanceMatrix":
+        """
+        Compute and write the matrix for a catalog.
+        
+        Rows are computed in blocks so memory stays bounded for large catalogs.
+        
+        Args:
+            ids: Destination ids, defining the dense index order
+            lats, lons: Destination coordinates in degrees
+            directory: Output directory (created if missing)
+        
+        Returns:
+            The freshly written matrix, memory-mapped
+        """
+        os.makedirs(directory, exist_ok=True)
+        n = len(ids)
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        
+        distance_km = np.lib.format.open_memmap(
+            os.path.join(directory, cls.DISTANCE_FILE), mode="w+", dtype=np.float32, shape=(n, n)
+        )
+        for start in range(0, n, BUILD_BLOCK_ROWS):
+            stop = min(start + BUILD_BLOCK_ROWS, n)
+            distance_km[start:stop] = haversine_matrix(lats[start:stop], lons[start:stop], lats, lons)
+        
+        distance_km.flush()
+        del distance_km
+        np.save(os.path.join(directory, cls.COORDS_FILE), np.column_stack((lats, lons)))
+        
+        with open(os.path.join(directory, cls.IDS_FILE), "w", encoding="utf-8") as f:
+            json.dump(list(ids), f)
+        
+        return cls.load(directory)
+    
+    def indices(
+        self,
+        dest_ids: Sequence[str],
+        coords: Optional[Sequence[Tuple[float, float]]] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Dense indices for ids, or None if any id is not in the catalog or its
+        current (lat, lng) in coords differs from the one the matrix was built from.
+        """
+        try:
+            idx = np.fromiter((self._index[dest_id] for dest_id in dest_ids), dtype=np.intp)
+        except KeyError:
+            return None
+        if coords is not None and not np.allclose(
+            self.coords[idx], np.asarray(coords, dtype=np.float64).reshape(-1, 2),
+            rtol=0, atol=COORD_TOLERANCE_DEG
+        ):
+            return None
+        return idx
+    
+    def submatrix(
+        self,
+        dest_ids: Sequence[str],
+        coords: Optional[Sequence[Tuple[float, float]]] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Pairwise distances (km) among the given ids.
+        
+        Returns:
+            float64 array of shape (len(ids), len(ids)), or None if any id is
+            unknown or does not match coords
+        """
+        idx = self.indices(dest_ids, coords)
+        if idx is None:
+            return None
+        return np.asarray(self.distance_km[np.ix_(idx, idx)], dtype=np.float64)
+    
+    def row(
+        self,
+        from_id: str,
+        to_ids: Sequence[str],
+        coords: Optional[Sequence[Tuple[float, float]]] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Distances (km) from one id to many ids.
+        
+        coords, if given, holds the current (lat, lng) of the origin followed
+        by each target.
+        
+        Returns:
+            float64 array of length len(to_ids), or None if any id is unknown
+            or does not match coords
+        """
+        idx = self.indices([from_id, *to_ids], coords)
+        if idx is None:
+            return None
+        return np.asarray(self.distance_km[idx[0], idx[1:]], dtype=np.float64)
+
+
+_distance_matrix = None
+_distance_matrix_loaded = False
+
+
+def get_distance_matrix() -> Optional[DistanceMatrix]:
+    """Curated catalog matrix, loaded on first use (None if not built)"""
+    global _distance_matrix, _distance_matrix_loaded
+    if not _distance_matrix_loaded:
+        _distance_matrix_loaded = True
+        try:
+            _distance_matrix = DistanceMatrix.load(DISTANCE_MATRIX_DIR)
+            print(f"📐 Loaded {len(_distance_matrix)}-destination distance matrix")
+        except FileNotFoundError:
+            print(f"⚠️ No distance matrix (or one without coords - rebuild it) at {DISTANCE_MATRIX_DIR} - computing distances on the fly")
+    return _distance_matrix
+
+
+def distances_from(origin, destinations):
+    """
+    Distances in km from an origin dict to each destination dict.
+    Reads the precomputed matrix when all ids are in the catalog,
+    otherwise falls back to vectorized haversine.
+    """
+    matrix = get_distance_matrix()
+    if matrix is not None and 'id' in origin:
+        row = matrix.row(
+            origin['id'], [d['id'] for d in destinations],
+            [(d['lat'], d['lng']) for d in (origin, *destinations)]
+        )
+        if row is not None:
+            return row
+    
+    return haversine_one_to_many(
+        origin['lat'], origin['lng'],
+        [d['lat'] for d in destinations],
+        [d['lng'] for d in destinations]
+    )
+
+
+def distance_table(origin, destinations):
+    """
+    Pairwise distances in km over the origin (node 0) and destinations (node i + 1).
+    Reads the precomputed matrix when all destination ids are in the catalog,
+    otherwise falls back to vectorized haversine.
+    """
+    table = np.empty((len(destinations) + 1, len(destinations) + 1))
+    table[0, 0] = 0.0
+    table[0, 1:] = table[1:, 0] = distances_from(origin, destinations)
+    
+    matrix = get_distance_matrix()
+    block = None
+    if matrix is not None:
+        block = matrix.submatrix(
+            [d['id'] for d in destinations], [(d['lat'], d['lng']) for d in destinations]
+        )
+    if block is None:
+        lats = [d['lat'] for d in destinations]
+        lons = [d['lng'] for d in destinations]
+        block = haversine_matrix(lats, lons)
+    table[1:, 1:] = block
+    return table
+
+
+if __name__ == "__main__":
+    from day_templates import DEFAULT_CSV_PATH, catalog_destinations
+    
+    destinations = catalog_destinations(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CSV_PATH)
+    matrix = DistanceMatrix.build(
+        [d['id'] for d in destinations],
+        [d['lat'] for d in destinations],
+        [d['lng'] for d in destinations],
+        DISTANCE_MATRIX_DIR
+    )
+    print(f"✅ Wrote {len(matrix)}x{len(matrix)} distance matrix to {os.path.abspath(DISTANCE_MATRIX_DIR)}")
@@ -0,0 +1,7 @@
+"""
+Shared pytest setup: make the flat gotrip-backend modules importable from the tests.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
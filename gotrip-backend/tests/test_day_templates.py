@@ -0,0 +1,79 @@
+"""
+Tests for precomputed day templates.
+"""
+import pytest
+from day_templates import DayTemplates, classify_visit_duration
+from tour_planner import DAY_HOURS, MAX_STOPS_PER_DAY
+
+
+def place(dest_id, lat, lng, name='Old Fort', categories=('history',), city='Testpur'):
+    return {'id': dest_id, 'name': name, 'lat': lat, 'lng': lng, 'categories': list(categories), 'city': city}
+
+
+@pytest.fixture
+def catalog():
+    return [
+        place('a', 15.50, 73.80),
+        place('b', 15.52, 73.81, name='Spice Market', categories=('food',)),
+        place('c', 15.53, 73.83, name='Sunset Viewpoint', categories=('nature',)),
+        place('d', 15.51, 73.79, name='Wildlife Sanctuary', categories=('nature',)),
+        place('far', 17.50, 73.80),
+        place('other', 15.50, 73.80, city='Elsewhere'),
+    ]
+
+
+def test_classify_visit_duration():
+    assert classify_visit_duration({'name': 'Wildlife Sanctuary'}) == 'full_day'
+    assert classify_visit_duration({'name': 'Spice Market'}) == 'quick'
+    assert classify_visit_duration({'name': 'Old Fort'}) == 'half_day'
+    assert classify_visit_duration({'name': 'Old Fort', 'visit_duration_hours': '1.5'}) == 'quick'
+
+
+def test_build_respects_day_limits(catalog):
+    templates = DayTemplates.build(catalog)
+    
+    stop_sets = {frozenset(t['stops']) for t in templates.templates}
+    assert frozenset({'a', 'b', 'c'}) in stop_sets
+    assert frozenset({'d'}) in stop_sets
+    for template in templates.templates:
+        assert len(template['stops']) <= MAX_STOPS_PER_DAY
+        assert template['hours'] <= DAY_HOURS
+        assert 'd' not in template['stops'] or len(template['stops']) == 1  # Full day
+        assert 'far' not in template['stops'] or len(template['stops']) == 1  # Out of radius
+        assert 'other' not in template['stops'] or len(template['stops']) == 1  # Other city
+
+
+def test_best_day_uses_only_available_stops(catalog):
+    templates = DayTemplates.build(catalog)
+    by_id = {dest['id']: dest for dest in catalog}
+    
+    day = templates.best_day(by_id['a'], {'b': by_id['b'], 'c': by_id['c']}, {'food', 'nature'})
+    assert {dest['id'] for dest in day} == {'a', 'b', 'c'}
+    
+    day = templates.best_day(by_id['a'], {'b': by_id['b']}, {'food'})
+    assert {dest['id'] for dest in day} == {'a', 'b'}
+    
+    assert templates.best_day(by_id['a'], {}, {'food'}) is None
+
+
+def test_best_day_keeps_planned_stops(catalog):
+    templates = DayTemplates.build(catalog)
+    by_id = {dest['id']: dest for dest in catalog}
+    
+    day = templates.best_day(by_id['a'], {'c': by_id['c']}, set(), keep=[by_id['a'], by_id['b']])
+    assert {dest['id'] for dest in day} == {'a', 'b', 'c'}
+    
+    # Nothing larger than the planned day is left
+    assert templates.best_day(by_id['a'], {}, set(), keep=[by_id['a'], by_id['b']]) is None
+
+
+def test_backend_builds_missing_templates_at_startup(monkeypatch, tmp_path):
+    import day_templates
+    from fastapi.testclient import TestClient
+    from backend import app
+    
+    monkeypatch.setattr(day_templates, "_day_templates", None)
+    monkeypatch.setattr(day_templates, "DAY_TEMPLATES_PATH", str(tmp_path / "missing.json"))
+    
+    with TestClient(app):
+        assert len(day_templates._day_templates) > 0
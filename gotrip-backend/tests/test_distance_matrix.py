@@ -0,0 +1,63 @@
+"""
+Tests for the precomputed catalog distance matrix and its haversine fallback.
+"""
+import numpy as np
+import pytest
+import distance_matrix
+from distance_matrix import DistanceMatrix, distance_table, distances_from
+from geo import haversine_matrix
+
+DESTINATIONS = [
+    {'id': 'goa_1', 'lat': 15.55, 'lng': 73.75},
+    {'id': 'goa_2', 'lat': 15.60, 'lng': 73.74},
+    {'id': 'kl_koc_001', 'lat': 9.97, 'lng': 76.28},
+]
+START = {'lat': 15.5, 'lng': 73.8}
+
+
+@pytest.fixture
+def matrix(tmp_path, monkeypatch):
+    built = DistanceMatrix.build(
+        [d['id'] for d in DESTINATIONS], [d['lat'] for d in DESTINATIONS], [d['lng'] for d in DESTINATIONS],
+        str(tmp_path / "matrix")
+    )
+    monkeypatch.setattr(distance_matrix, '_distance_matrix', built)
+    monkeypatch.setattr(distance_matrix, '_distance_matrix_loaded', True)
+    return built
+
+
+def haversine_table(origin, destinations):
+    nodes = [origin] + destinations
+    return haversine_matrix([d['lat'] for d in nodes], [d['lng'] for d in nodes])
+
+
+def test_matrix_matches_haversine(matrix):
+    expected = haversine_matrix([d['lat'] for d in DESTINATIONS], [d['lng'] for d in DESTINATIONS])
+    
+    assert matrix.submatrix(['goa_1', 'goa_2', 'kl_koc_001']) == pytest.approx(expected, rel=1e-6, abs=1e-3)
+    assert matrix.row('goa_2', ['kl_koc_001', 'goa_1']) == pytest.approx(expected[1, [2, 0]], rel=1e-6)
+    assert matrix.submatrix(['goa_1', 'unknown']) is None
+
+
+def test_distance_table(matrix):
+    table = distance_table(START, DESTINATIONS)
+    
+    assert table == pytest.approx(haversine_table(START, DESTINATIONS), rel=1e-6, abs=1e-3)
+    assert distances_from(DESTINATIONS[0], DESTINATIONS[1:]) == pytest.approx(table[1, 2:], rel=1e-6)
+
+
+def test_moved_destinations_fall_back_to_haversine(matrix):
+    moved = [dict(d) for d in DESTINATIONS]
+    moved[1]['lat'] += 0.5
+    
+    assert matrix.submatrix([d['id'] for d in moved], [(d['lat'], d['lng']) for d in moved]) is None
+    assert distance_table(START, moved) == pytest.approx(haversine_table(START, moved))
+    assert distances_from(moved[0], moved[1:]) == pytest.approx(haversine_table(moved[0], moved[1:])[0, 1:])
+
+
+def test_without_matrix(monkeypatch):
+    monkeypatch.setattr(distance_matrix, '_distance_matrix', None)
+    monkeypatch.setattr(distance_matrix, '_distance_matrix_loaded', True)
+    
+    assert distance_table(START, DESTINATIONS) == pytest.approx(haversine_table(START, DESTINATIONS))
+    assert np.allclose(distance_table(START, DESTINATIONS), distance_table(START, DESTINATIONS).T)
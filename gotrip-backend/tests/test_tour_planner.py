@@ -0,0 +1,90 @@
+"""
+Tests for closed-tour round-trip planning.
+"""
+import numpy as np
+import pytest
+from geo import haversine_distance
+from tour_planner import DAY_HOURS, LOCAL_SPEED_KMH, MAX_STOPS_PER_DAY, VISIT_HOURS, plan_closed_tour
+
+START = {'lat': 15.5, 'lng': 73.8}
+
+
+def make_destinations(n, seed=0, durations=('quick', 'half_day')):
+    rng = np.random.default_rng(seed)
+    destinations = []
+    for i in range(n):
+        lat, lng = START['lat'] + rng.uniform(-0.4, 0.4), START['lng'] + rng.uniform(-0.4, 0.4)
+        destinations.append({
+            'id': f'test_{i}',
+            'name': f'Place {i}',
+            'lat': lat,
+            'lng': lng,
+            'categories': ['beach'] if i % 2 else ['history'],
+            'visit_duration': durations[i % len(durations)],
+            'matching_preferences': 1,
+            'distance_from_start': haversine_distance(START['lat'], START['lng'], lat, lng)
+        })
+    return destinations
+
+
+def day_hours(day):
+    local_km = sum(haversine_distance(a['lat'], a['lng'], b['lat'], b['lng']) for a, b in zip(day, day[1:]))
+    return sum(VISIT_HOURS[d['visit_duration']] for d in day) + local_km / LOCAL_SPEED_KMH
+
+
+@pytest.mark.parametrize("num_days", [1, 2, 4, 7])
+def test_returns_exactly_num_days(num_days):
+    days = plan_closed_tour(START, make_destinations(12), num_days, {'beach', 'history'})
+    
+    assert len(days) == num_days
+
+
+def test_days_fit_their_hours_and_stop_cap():
+    days = plan_closed_tour(START, make_destinations(20, seed=1), 3, {'beach', 'history'})
+    
+    visited = [d['id'] for day in days for d in day]
+    assert len(visited) == len(set(visited))
+    for day in days:
+        assert len(day) <= MAX_STOPS_PER_DAY
+        assert day_hours(day) <= DAY_HOURS + 1e-6
+
+
+def test_full_day_stops_stand_alone():
+    destinations = make_destinations(8, seed=2, durations=('full_day', 'quick'))
+    
+    days = plan_closed_tour(START, destinations, 4, {'beach', 'history'})
+    
+    for day in days:
+        if any(d['visit_duration'] == 'full_day' for d in day):
+            assert len(day) == 1
+
+
+def test_every_preference_is_covered():
+    days = plan_closed_tour(START, make_destinations(20, seed=3), 2, {'beach', 'history'})
+    
+    covered = {category for day in days for d in day for category in d['categories']}
+    assert covered >= {'beach', 'history'}
+
+
+def test_more_days_than_stops_leaves_free_days():
+    days = plan_closed_tour(START, make_destinations(2, durations=('full_day',)), 4, {'history'})
+    
+    assert len(days) == 4
+    assert sum(len(day) for day in days) == 2
+
+
+def test_edge_cases():
+    assert plan_closed_tour(START, make_destinations(3), 0, {'beach'}) == []
+    assert plan_closed_tour(START, [], 3, {'beach'}) == [[], [], []]
+
+
+def test_duplicate_ids_are_visited_once():
+    destinations = make_destinations(12)
+    duplicated = destinations + [dict(dest) for dest in destinations[:6]]
+    
+    days = plan_closed_tour(START, duplicated, 3, {'beach', 'history'})
+    
+    ids = [[dest['id'] for dest in day] for day in days]
+    flat = [dest_id for day in ids for dest_id in day]
+    assert len(flat) == len(set(flat))
+    assert ids == [[dest['id'] for dest in day] for day in plan_closed_tour(START, destinations, 3, {'beach', 'history'})]
@@ -0,0 +1,64 @@
+"""
+Tests for the bounded TTL/LRU response cache.
+"""
+import time
+from ttl_cache import TTLCache, approx_size
+
+
+def test_hit_and_miss():
+    cache = TTLCache()
+    cache.put("a", {"plan": [1, 2, 3]})
+    
+    assert cache.get("a") == {"plan": [1, 2, 3]}
+    assert cache.get("b", "default") == "default"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_entries_expire():
+    cache = TTLCache(ttl_seconds=0.01)
+    cache.put("a", 1)
+    time.sleep(0.02)
+    
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_memory_cap():
+    cache = TTLCache(max_bytes=100, sizeof=lambda value: value)
+    
+    assert cache.put("a", 60)
+    assert cache.put("b", 30)
+    assert cache.put("c", 50)  # Evicts "a" to stay under 100 bytes
+    assert not cache.put("d", 101)  # Larger than the whole cache
+    
+    assert cache.get("a") is None
+    assert cache.get("d") is None
+    assert cache.stats()["bytes"] == 80
+
+
+def test_replacing_a_key_updates_size():
+    cache = TTLCache(sizeof=lambda value: value)
+    cache.put("a", 10)
+    cache.put("a", 25)
+    
+    assert len(cache) == 1
+    assert cache.stats()["bytes"] == 25
+
+
+def test_approx_size_grows_with_content():
+    assert approx_size({"a": [1, 2, 3]}) > approx_size({"a": []}) > approx_size({})
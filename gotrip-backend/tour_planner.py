@@ -0,0 +1,234 @@
+"""
+Multi-day closed-tour planning for round trips (return_to_start).
+
+Route first, cluster second:
+1. Route: one closed tour from the start (depot) through every candidate,
+   built by Nearest Neighbor and shortened with 2-opt
+2. Split: dynamic programming cuts the tour into consecutive day segments
+   (1 full-day stop, or up to MAX_STOPS_PER_DAY shorter stops that fit the
+   day's hours) and may skip stops; skipping costs a penalty per matching
+   preference, so stops are only left out when the days cannot hold them
+   or the detour is not worth it
+3. Fill: skipped stops are inserted into days with spare hours when the
+   detour costs less than skipping them
+
+The whole loop, including the drive back to the start, is minimized
+together with the day split instead of returning from wherever the last
+day happens to end.
+"""
+from typing import Dict, List, Sequence, Set
+import numpy as np
+from distance_matrix import distance_table
+
+DAY_HOURS = 8  # Visit and local travel hours per day
+MAX_STOPS_PER_DAY = 3
+CANDIDATES_PER_DAY = 6  # Ranked candidates routed per trip day (the split skips the rest)
+MIN_CANDIDATES = 24
+VISIT_HOURS = {'full_day': 8, 'half_day': 4, 'quick': 1.5}
+LOCAL_SPEED_KMH = 40  # Between stops of the same day
+SKIP_PENALTY_KM = 200  # Per matching preference of a skipped stop
+COVERAGE_PENALTY_KM = 10000  # Skipping the only chosen stop for a preference
+
+
+def _closed_tour(dist: np.ndarray) -> List[int]:
+    """Nearest Neighbor tour from node 0, improved with 2-opt (node 0 first, return implicit)"""
+    n = dist.shape[0]
+    tour = [0]
+    unvisited = np.ones(n, dtype=bool)
+    unvisited[0] = False
+    for _ in range(n - 1):
+        row = np.where(unvisited, dist[tour[-1]], np.inf)
+        nxt = int(np.argmin(row))
+        tour.append(nxt)
+        unvisited[nxt] = False
+    
+    tour = np.array(tour)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 2):
+            # Replace edges (i, i+1) and (k, k+1) with (i, k) and (i+1, k+1)
+            a, b = tour[i], tour[i + 1]
+            k = np.arange(i + 2, n)
+            c, d = tour[k], tour[(k + 1) % n]
+            delta = dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d]
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                tour[i + 1:k[best] + 1] = tour[i + 1:k[best] + 1][::-1].copy()
+                improved = True
+    return tour.tolist()
+
+
+def _split_tour(
+    tour: List[int],
+    dist: np.ndarray,
+    visit_hours: Sequence[float],
+    full_day: Sequence[bool],
+    penalty: Sequence[float],
+    num_days: int
+) -> List[List[int]]:
+    """
+    Optimal day segments of a closed tour (with skips) by dynamic programming.
+    
+    dp[d, j]: cheapest cost of the first d days ending at tour position j
+    (position 0 is the depot), counting travel into each day's first stop,
+    travel within days and penalties of skipped stops. The split uses all
+    num_days days, or as many as the tour has stops for.
+    
+    Returns:
+        Node lists, one per day (fewer than num_days only if the tour is too short)
+    """
+    n = len(tour) - 1
+    skipped = np.concatenate(([0.0], np.cumsum([penalty[node] for node in tour[1:]])))
+    dp = np.full((num_days + 1, n + 1), np.inf)
+    dp[0, 0] = 0.0
+    parent = np.zeros((num_days + 1, n + 1), dtype=np.intp)  # Position before the day's first stop
+    first = np.zeros((num_days + 1, n + 1), dtype=np.intp)  # Day's first stop position
+    
+    for a in range(1, n + 1):
+        # Travel into position a from every earlier position j, plus skips in between
+        enter = dist[[tour[j] for j in range(a)], tour[a]] + (skipped[a - 1] - skipped[:a])
+        hours, local_km = 0.0, 0.0
+        for b in range(a, min(a + MAX_STOPS_PER_DAY, n + 1)):
+            node = tour[b]
+            if b > a:
+                if full_day[node] or full_day[tour[a]]:
+                    break
+                local_km += dist[tour[b - 1], node]
+            hours += visit_hours[node]
+            if hours + local_km / LOCAL_SPEED_KMH > DAY_HOURS + 1e-9:
+                break
+            costs = dp[:-1, :a] + enter + local_km
+            best = np.argmin(costs, axis=1)
+            values = costs[np.arange(num_days), best]
+            better = values < dp[1:, b]
+            dp[1:, b] = np.where(better, values, dp[1:, b])
+            parent[1:, b] = np.where(better, best, parent[1:, b])
+            first[1:, b] = np.where(better, a, first[1:, b])
+    
+    # Close the loop: back to the depot, skipping whatever follows the last day
+    closing = dist[tour[1:], 0] + (skipped[n] - skipped[1:])
+    totals = dp[1:, 1:] + closing
+    feasible = np.flatnonzero(np.isfinite(totals).any(axis=1))
+    if not len(feasible):
+        return []
+    days = int(feasible[-1]) + 1  # Every booked day if possible
+    end = int(np.argmin(totals[days - 1])) + 1
+    
+    plan = []
+    while days > 0:
+        start = first[days, end]
+        plan.append(tour[start:end + 1])
+        end = parent[days, end]
+        days -= 1
+    plan.reverse()
+    return plan
+
+
+def _day_hours(day: List[int], dist: np.ndarray, visit_hours: Sequence[float]) -> float:
+    """Visit plus local travel hours of one day"""
+    local_km = sum(dist[a, b] for a, b in zip(day, day[1:]))
+    return sum(visit_hours[node] for node in day) + local_km / LOCAL_SPEED_KMH
+
+
+def _fill_days(
+    days: List[List[int]],
+    dist: np.ndarray,
+    visit_hours: Sequence[float],
+    full_day: Sequence[bool],
+    penalty: Sequence[float]
+):
+    """
+    Insert skipped stops into days that still have room, in place.
+    
+    The split keeps each day a consecutive run of the tour, so a stop the
+    tour placed elsewhere can be missing from a day with spare hours. Each
+    skipped stop (highest penalty first) goes to its cheapest feasible
+    position when the added loop distance is below its skip penalty.
+    """
+    visited = {node for day in days for node in day}
+    skipped = sorted(
+        (node for node in range(1, dist.shape[0]) if node not in visited and not full_day[node]),
+        key=lambda node: -penalty[node]
+    )
+    for node in skipped:
+        best = None
+        path = [0] + [stop for day in days for stop in day] + [0]
+        offset = 1
+        for d, day in enumerate(days):
+            if len(day) < MAX_STOPS_PER_DAY and not full_day[day[0]]:
+                for i in range(len(day) + 1):
+                    candidate = day[:i] + [node] + day[i:]
+                    if _day_hours(candidate, dist, visit_hours) > DAY_HOURS + 1e-9:
+                        continue
+                    before, after = path[offset + i - 1], path[offset + i]
+                    added = dist[before, node] + dist[node, after] - dist[before, after]
+                    if best is None or added < best[0]:
+                        best = (added, d, i)
+            offset += len(day)
+        if best is not None and best[0] < penalty[node]:
+            _, d, i = best
+            days[d].insert(i, node)
+
+
+def plan_closed_tour(
+    start_loc: Dict,
+    destinations: List[Dict],
+    num_days: int,
+    preferences: Set[str]
+) -> List[List[Dict]]:
+    """
+    Plan days for a round trip that starts and ends at start_loc.
+    
+    Candidates are deduplicated by id, ranked like the day-by-day planner
+    (matching preferences, then proximity to the start) and capped at CANDIDATES_PER_DAY per day
+    (at least MIN_CANDIDATES); the best candidate for each preference is
+    made (nearly) mandatory.
+    
+    Args:
+        start_loc: Start location dict with lat/lng
+        destinations: Candidates with 'visit_duration', 'matching_preferences'
+            and 'distance_from_start' set
+        num_days: Number of trip days
+        preferences: User preferences
+    
+    Returns:
+        Destination lists, exactly num_days of them, in travel order (empty
+        lists are free days when there are too few candidates to fill them)
+    """
+    if num_days < 1:
+        return []
+    if not destinations:
+        return [[] for _ in range(num_days)]
+    
+    ranked, seen = [], set()
+    for dest in sorted(
+        destinations,
+        key=lambda d: d['matching_preferences'] * 1000 - d['distance_from_start'],
+        reverse=True
+    ):
+        if dest['id'] not in seen:  # A place listed twice is still visited once
+            seen.add(dest['id'])
+            ranked.append(dest)
+    ranked = ranked[:max(CANDIDATES_PER_DAY * num_days, MIN_CANDIDATES)]
+    
+    covering = set()
+    for preference in preferences:
+        for i, dest in enumerate(ranked):
+            if preference in dest['categories']:
+                covering.add(i)
+                break
+    
+    dist = distance_table(start_loc, ranked)
+    visit_hours = [0.0] + [VISIT_HOURS[d['visit_duration']] for d in ranked]
+    full_day = [False] + [d['visit_duration'] == 'full_day' for d in ranked]
+    penalty = [0.0] + [
+        COVERAGE_PENALTY_KM if i in covering else SKIP_PENALTY_KM * d['matching_preferences']
+        for i, d in enumerate(ranked)
+    ]
+    
+    tour = _closed_tour(dist)
+    days = _split_tour(tour, dist, visit_hours, full_day, penalty, num_days)
+    _fill_days(days, dist, visit_hours, full_day, penalty)
+    days += [[] for _ in range(num_days - len(days))]
+    return [[ranked[node - 1] for node in day] for day in days]
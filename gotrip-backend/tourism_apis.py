@@ -5,7 +5,7 @@ Fetches real POI data from multiple free APIs
 import requests
 import time
 from typing import List, Dict, Any, Optional
-from math import radians, sin, cos, sqrt, atan2
+from geo import haversine_distance
 
 class TourismAPIClient:
     """
@@ -18,18 +18,6 @@ class TourismAPIClient:
             'User-Agent': 'GoTrip/1.0 (Trip Planning App)'
         })
     
-    @staticmethod
-    def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calculate distance in kilometers between two coordinates"""
-        R = 6371  # Earth radius in km
-        lat1_rad, lat2_rad = radians(lat1), radians(lat2)
-        delta_lat = radians(lat2 - lat1)
-        delta_lon = radians(lon2 - lon1)
-        
-        a = sin(delta_lat/2)**2 + cos(lat1_rad) * cos(lat2_rad) * sin(delta_lon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
-        return R * c
-    
     def fetch_opentripmap_places(self, lat: float, lon: float, radius_km: int, kinds: str, limit: int = 50) -> List[Dict]:
         """
         Fetch places from OpenTripMap API (FREE)
@@ -73,7 +61,7 @@ class TourismAPIClient:
                         'kinds': item.get('kinds', '').split(','),
                         'source': 'opentripmap',
                         'xid': item.get('xid'),
-                        'distance_km': round(self.haversine_distance(
+                        'distance_km': round(haversine_distance(
                             lat, lon, 
                             item['point']['lat'], 
                             item['point']['lon']
@@ -147,7 +135,7 @@ class TourismAPIClient:
                     'lng': elem_lon,
                     'tags': tags_dict,
                     'source': 'osm',
-                    'distance_km': round(self.haversine_distance(lat, lon, elem_lat, elem_lon), 2)
+                    'distance_km': round(haversine_distance(lat, lon, elem_lat, elem_lon), 2)
                 })
             
             return places
@@ -293,7 +281,7 @@ class TourismAPIClient:
         # Step 2: Filter cities within max_distance from start
         nearby_cities = []
         for city in unique_cities:
-            distance = self.haversine_distance(start_lat, start_lng, city['lat'], city['lng'])
+            distance = haversine_distance(start_lat, start_lng, city['lat'], city['lng'])
             if distance <= max_distance_km:
                 city['distance_from_start'] = round(distance, 2)
                 nearby_cities.append(city)
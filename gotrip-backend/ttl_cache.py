@@ -0,0 +1,130 @@
+"""
+Thread-safe in-memory cache with LRU eviction, a TTL and entry/memory caps.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+def approx_size(value: Any) -> int:
+    """Rough deep size in bytes of JSON-like data (dicts, lists, tuples, sets, scalars)"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approx_size(key) + approx_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approx_size(item) for item in value)
+    return size
+
+
+class TTLCache:
+    """
+    Bounded key-value cache safe to share between request threads.
+    
+    Entries expire ttl_seconds after they were stored. When adding an entry
+    would exceed max_entries or max_bytes (as measured by `sizeof` when the
+    entry is stored), least recently used entries are evicted first; a single
+    value larger than max_bytes is not cached at all. Hits, misses,
+    evictions and expirations are counted for monitoring.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 3600,
+        sizeof: Callable[[Any], int] = approx_size
+    ):
+        """Create an empty cache with the given caps."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _drop(self, key: Hashable):
+        """Remove an entry (lock held)."""
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Cached value for key, or default if missing or expired.
+        
+        Args:
+            key: Cache key
+            default: Returned on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+    
+    def put(self, key: Hashable, value: Any) -> bool:
+        """
+        Store a value, evicting least recently used entries to stay within the caps.
+        
+        Args:
+            key: Cache key
+            value: Value to cache (callers must not mutate it afterwards)
+        
+        Returns:
+            False if the value alone exceeds max_bytes and was not cached
+        """
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return False
+            
+            while self._entries and (
+                len(self._entries) >= self.max_entries or self._bytes + size > self.max_bytes
+            ):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+            
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, size, value)
+            self._bytes += size
+            return True
+    
+    def clear(self):
+        """Remove every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, memory estimate and counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }